@@ -0,0 +1,46 @@
+"""
+Hotkey registration and dispatch benchmarks against the in-memory hotkey backend.
+"""
+
+from harness import parametrize
+
+from min2tray.hotkey import HotkeyHub, HotkeyManager
+
+COMBINATIONS = [f"<ctrl>+<alt>+{chr(ord('a') + index % 26)}" if index < 26 else f"<ctrl>+<shift>+<f{index - 25}>"
+                for index in range(50)]
+
+
+def noop():
+    pass
+
+
+def bench_register_50(benchmark):
+    def register():
+        manager = HotkeyManager(backend="memory")
+        for combination in COMBINATIONS:
+            manager.register(combination, noop)
+        manager.stop()
+
+    benchmark(register)
+
+
+def bench_register_many_50(benchmark):
+    def register():
+        manager = HotkeyManager(backend="memory")
+        manager.register_many({combination: noop for combination in COMBINATIONS})
+        manager.stop()
+
+    benchmark(register)
+
+
+@parametrize("owners", (1, 10, 100))
+def bench_dispatch(benchmark, owners):
+    managers = [HotkeyManager(backend="memory") for _ in range(owners)]
+    for manager in managers:
+        manager.register_many({combination: noop for combination in COMBINATIONS})
+
+    backend = HotkeyHub.get("memory").backend
+    assert benchmark(backend.press, "<alt>+<ctrl>+q")
+
+    for manager in managers:
+        manager.stop()
@@ -0,0 +1,48 @@
+"""
+Process launch, exit dispatch and resource sampling benchmarks against real child processes.
+"""
+
+import subprocess
+import sys
+import threading
+
+from harness import parametrize
+
+from min2tray.process import ProcessEvent, ProcessManager
+from min2tray.reaper import ProcessReaper
+from min2tray.sampler import ResourceSampler
+
+COMMAND = [sys.executable, "-S", "-c", "import time; time.sleep(0.05)"]
+
+
+@parametrize("children", (1, 10, 100))
+def bench_reap_children(benchmark, children):
+    manager = ProcessManager()
+    exited = []
+    manager.add_hook(ProcessEvent.EXITED, exited.append)
+
+    def launch_and_reap():
+        for _ in range(children):
+            manager.run_command(COMMAND, wait_time=0)
+        manager.wait()
+
+    benchmark.pedantic(launch_and_reap, rounds=3)
+    benchmark.extra_info["monitor_threads"] = sum(thread.name == "min2tray-reaper" for thread in threading.enumerate())
+    benchmark.extra_info["reaped"] = ProcessReaper.get().reaped
+    assert len(exited) == 3 * children
+
+
+@parametrize("apps", (1, 10, 50))
+def bench_sampler_tick(benchmark, apps):
+    children = [subprocess.Popen(["sleep", "60"]) for _ in range(apps)]
+    sampler = ResourceSampler(interval=3600)
+    for child in children:
+        sampler.watch(child.pid, lambda pid=child.pid: pid)
+
+    try:
+        assert len(benchmark(sampler.tick)) == apps
+    finally:
+        for child in children:
+            sampler.unwatch(child.pid)
+            child.kill()
+            child.wait()
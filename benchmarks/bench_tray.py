@@ -0,0 +1,60 @@
+"""
+Tray icon loading benchmarks.
+"""
+
+import os
+import tempfile
+import types
+
+from harness import parametrize
+
+from min2tray.core import TrayHub
+from min2tray.icon_cache import IconCache, icon_cache, render_state_frames
+from min2tray.tray import TrayIcon
+
+# Temporary icons would otherwise leave entries in the user's cache directory
+icon_cache.cache_dir = None
+
+
+def bench_load_icon_default(benchmark):
+    benchmark(TrayIcon().load_icon)
+
+
+@parametrize("size", (16, 64, 256))
+def bench_load_icon_png(benchmark, size):
+    tray = TrayIcon()
+    with tempfile.TemporaryDirectory(prefix="min2tray-bench-") as directory:
+        path = os.path.join(directory, "icon.png")
+        tray.create_default_image(size, size).save(path)
+        benchmark(lambda: tray.load_icon(path).load())
+
+
+@parametrize("source", ("memory", "disk", "decode"))
+def bench_icon_cache_1024(benchmark, source):
+    with tempfile.TemporaryDirectory(prefix="min2tray-bench-") as directory:
+        path = os.path.join(directory, "icon.png")
+        TrayIcon().create_default_image(1024, 1024).save(path)
+        cache = IconCache(cache_dir=os.path.join(directory, "cache") if source == "disk" else None)
+        cache.get(path, 24)
+        setup = None if source == "memory" else cache.clear
+        benchmark.pedantic(cache.get, args=(path, 24), setup=setup, rounds=50)
+
+
+@parametrize("size", (24, 64))
+def bench_render_state_frames(benchmark, size):
+    base = TrayIcon().create_default_image(size, size)
+    benchmark(render_state_frames, base)
+
+
+# Stands in for pystray so menu construction can be measured without a tray backend
+MENU_BACKEND = types.SimpleNamespace(MenuItem=lambda *args, **kwargs: args, Menu=lambda *items: items)
+
+
+@parametrize("windows", (10, 200, 1000))
+def bench_menu_items(benchmark, windows):
+    hub = TrayHub(backend="memory", hotkey_backend="memory", control_socket=None)
+    for index in range(windows):
+        hub.add_window(f"Window {index}", window_title=f"Window {index}")
+    hub._build_menu()
+    list(hub.tray_icon.menu_items(MENU_BACKEND))
+    benchmark(lambda: list(hub.tray_icon.menu_items(MENU_BACKEND)))
@@ -0,0 +1,126 @@
+"""
+Window backend benchmarks, run against the in-memory backend and the fake xdotool shim.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+
+from harness import parametrize, skip
+
+from min2tray.window import FlexibleWindowManager
+from min2tray.executor import WindowAction, WindowActionExecutor
+from min2tray.utils import PLATFORM
+from min2tray.window_manager import (MemoryDesktop, MemoryWindowManager, WindowIdentifier, by_title,
+                                     create_window_manager)
+from min2tray.window_manager.matcher import WindowInfo, WindowSnapshot
+
+WINDOW_COUNTS = (1, 10, 100, 1000, 10000)
+
+
+def populate(count: int) -> MemoryDesktop:
+    desktop = MemoryDesktop()
+    for index in range(count):
+        desktop.add_window(f"Window {index} - Editor", pid=1000 + index, wm_class=f"App{index % 50}")
+    return desktop
+
+
+def bench_create_window_manager(benchmark):
+    identifier = by_title("Window 0 - Editor")
+    benchmark(create_window_manager, identifier, "memory")
+
+
+@parametrize("windows", WINDOW_COUNTS)
+def bench_snapshot_build(benchmark, windows):
+    infos = [WindowInfo(0x1000001 + index, name=f"Window {index} - Editor", wm_class=f"App{index % 50}",
+                        pid=1000 + index, order=index) for index in range(windows)]
+    benchmark(WindowSnapshot, infos)
+
+
+@parametrize("windows", WINDOW_COUNTS)
+def bench_find_window_exact(benchmark, windows):
+    desktop = populate(windows)
+    manager = MemoryWindowManager(WindowIdentifier(title=f"Window {windows - 1} - Editor", title_match="exact"),
+                                  desktop)
+    assert benchmark(manager.find_window)
+
+
+@parametrize("windows", WINDOW_COUNTS)
+def bench_find_window_regex(benchmark, windows):
+    desktop = populate(windows)
+    manager = MemoryWindowManager(by_title(f"^Window {windows - 1} "), desktop)
+    assert benchmark(manager.find_window)
+
+
+@parametrize("windows", WINDOW_COUNTS)
+def bench_find_window_pid(benchmark, windows):
+    desktop = populate(windows)
+    manager = MemoryWindowManager(WindowIdentifier(process_id=os.getpid()), desktop)
+    desktop.add_window("Benchmark", pid=os.getpid())
+    assert benchmark(manager.find_window)
+
+
+@parametrize("windows", WINDOW_COUNTS)
+def bench_resolve_many(benchmark, windows):
+    desktop = populate(windows)
+    snapshot = desktop.snapshot()
+    identifiers = [WindowIdentifier(title=f"Window {index} - Editor", title_match="exact")
+                   for index in range(0, windows, max(windows // 20, 1))]
+    benchmark.extra_info["identifiers"] = len(identifiers)
+    benchmark(snapshot.resolve_many, identifiers)
+
+
+def bench_toggle_memory(benchmark):
+    desktop = populate(1)
+    manager = MemoryWindowManager(by_title("Window 0"), desktop)
+    manager.find_window()
+    benchmark(manager.toggle)
+
+
+def bench_toggle_registry(benchmark):
+    MemoryDesktop.default().add_window("Registry Benchmark")
+    manager = FlexibleWindowManager(WindowIdentifier(title="Registry Benchmark", title_match="exact"),
+                                    backend="memory")
+    benchmark(manager.toggle)
+
+
+def bench_toggle_executor_1000(benchmark):
+    desktop = populate(1)
+    manager = MemoryWindowManager(by_title("Window 0"), desktop)
+    manager.find_window()
+    actions = {WindowAction.TOGGLE: manager.toggle, WindowAction.SHOW: manager.show, WindowAction.HIDE: manager.hide}
+    executor = WindowActionExecutor(lambda action: actions[action](), name="benchmark")
+
+    def burst():
+        for index in range(1000):
+            executor.submit(WindowAction.SHOW if index % 100 == 0 else WindowAction.TOGGLE)
+            if index % 10 == 0:
+                executor.drain()
+        executor.drain()
+
+    benchmark(burst)
+    executor.shutdown()
+
+
+def bench_toggle_xdotool_shim(benchmark):
+    if PLATFORM != "linux":
+        skip("the xdotool backend is Linux only")
+
+    import fake_xdotool
+
+    directory = tempfile.mkdtemp(prefix="min2tray-bench-")
+    saved_path = os.environ.get("PATH", "")
+    try:
+        state = os.path.join(directory, "state.json")
+        with open(state, "w") as f:
+            json.dump({"windows": [{"id": 4194305, "name": "Shim Window", "pid": 1, "class": "Shim",
+                                    "mapped": True}]}, f)
+        fake_xdotool.install(directory, state)
+
+        manager = create_window_manager(by_title("Shim Window"), "xdotool")
+        assert manager.find_window()
+        benchmark.pedantic(manager.toggle, rounds=20, warmup_rounds=2)
+    finally:
+        os.environ["PATH"] = saved_path
+        shutil.rmtree(directory, ignore_errors=True)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Minimal stand-in for the ``xdotool`` commands used by the xdotool backend.
+
+Window state lives in the JSON file named by ``$FAKE_XDOTOOL_STATE``:
+
+    {"windows": [{"id": 1, "name": "...", "pid": 42, "class": "...", "mapped": true}]}
+
+``install(directory)`` writes an ``xdotool`` wrapper into ``directory`` so that
+prepending it to ``$PATH`` routes the backend's subprocess calls here. The
+numbers it produces measure process spawn overhead, not a real X server.
+"""
+
+import json
+import os
+import re
+import stat
+import sys
+from typing import Dict, List
+
+STATE_ENV = "FAKE_XDOTOOL_STATE"
+
+
+def load_state(path: str) -> Dict[str, List[dict]]:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(path: str, state: Dict[str, List[dict]]):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(state, f)
+    os.replace(temporary, path)
+
+
+def install(directory: str, state_path: str) -> str:
+    wrapper = os.path.join(directory, "xdotool")
+    with open(wrapper, "w") as f:
+        f.write(f"#!/bin/sh\nexec {sys.executable} {os.path.abspath(__file__)} \"$@\"\n")
+    os.chmod(wrapper, os.stat(wrapper).st_mode | stat.S_IXUSR)
+    os.environ[STATE_ENV] = state_path
+    os.environ["PATH"] = directory + os.pathsep + os.environ.get("PATH", "")
+    return wrapper
+
+
+def search(windows: List[dict], args: List[str]) -> List[int]:
+    require_all = False
+    criteria = []
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg in ("--sync", "--onlyvisible"):
+            pass
+        elif arg == "--all":
+            require_all = True
+        elif arg == "--any":
+            require_all = False
+        elif arg in ("--name", "--class", "--pid"):
+            criteria.append((arg[2:], args[index + 1]))
+            index += 1
+        else:
+            criteria.append(("name", arg))
+        index += 1
+
+    def matches(window: dict, field: str, value: str) -> bool:
+        if field == "pid":
+            return window.get("pid") == int(value)
+        return re.search(value, window.get(field) or "", re.IGNORECASE) is not None
+
+    combine = all if require_all else any
+    return [window["id"] for window in windows
+            if combine(matches(window, field, value) for field, value in criteria)]
+
+
+def main(argv: List[str]) -> int:
+    path = os.environ.get(STATE_ENV)
+    if not path or not argv:
+        print("usage: fake_xdotool.py COMMAND [ARGS]", file=sys.stderr)
+        return 1
+
+    state = load_state(path)
+    command, args = argv[0], argv[1:]
+
+    if command == "search":
+        found = search(state["windows"], args)
+        for window_id in found:
+            print(window_id)
+        return 0 if found else 1
+
+    if command in ("windowmap", "windowunmap", "windowactivate"):
+        window_id = int(args[0])
+        for window in state["windows"]:
+            if window["id"] == window_id:
+                if command != "windowactivate":
+                    window["mapped"] = command == "windowmap"
+                    save_state(path, state)
+                return 0
+        print(f"X Error: BadWindow {window_id}", file=sys.stderr)
+        return 1
+
+    print(f"Unsupported command: {command}", file=sys.stderr)
+    return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,113 @@
+"""
+A small benchmark runner used by ``benchmarks/run.py``.
+
+Benchmark functions are named ``bench_*`` and take a ``Benchmark`` as their
+first argument, calling it with the code to time (``benchmark(func, *args)``).
+``parametrize`` records the values ``run.py`` runs a function with. The modules
+are not pytest-benchmark tests and are not collected by pytest.
+"""
+
+import gc
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+def parametrize(name: str, values: Sequence[Any]) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        func.params = (name, tuple(values))
+        return func
+    return decorator
+
+
+class Benchmark:
+
+    def __init__(self, name: str, min_time: float = 0.25, max_time: float = 2.0,
+                 min_rounds: int = 5, round_time: float = 0.005):
+        self.name = name
+        self.min_time = min_time
+        self.max_time = max_time
+        self.min_rounds = min_rounds
+        self.round_time = round_time
+        self.extra_info: Dict[str, Any] = {}
+        self.stats: Optional[Dict[str, Any]] = None
+
+    def __call__(self, func: Callable, *args, **kwargs) -> Any:
+        result = func(*args, **kwargs)
+        iterations = self._calibrate(func, args, kwargs)
+        self._measure(lambda: func(*args, **kwargs), iterations)
+        return result
+
+    def pedantic(self, target: Callable, args: Tuple = (), kwargs: Optional[Dict[str, Any]] = None,
+                 setup: Optional[Callable] = None, rounds: int = 1, iterations: int = 1,
+                 warmup_rounds: int = 0) -> Any:
+        kwargs = kwargs or {}
+        result = None
+        for _ in range(warmup_rounds):
+            if setup:
+                setup()
+            target(*args, **kwargs)
+
+        samples = []
+        for _ in range(rounds):
+            if setup:
+                setup()
+            start = time.perf_counter()
+            for _ in range(iterations):
+                result = target(*args, **kwargs)
+            samples.append((time.perf_counter() - start) / iterations)
+        self._record(samples, iterations)
+        return result
+
+    def _calibrate(self, func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> int:
+        iterations = 1
+        while True:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                func(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+            if elapsed >= self.round_time or iterations >= 1 << 20:
+                return iterations
+            iterations *= 2 if elapsed <= 0 else max(2, min(int(self.round_time / elapsed) + 1, 10))
+
+    def _measure(self, call: Callable, iterations: int):
+        samples: List[float] = []
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            while True:
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    call()
+                samples.append((time.perf_counter() - start) / iterations)
+
+                spent = time.perf_counter() - started
+                if spent >= self.max_time or (spent >= self.min_time and len(samples) >= self.min_rounds):
+                    break
+        finally:
+            if gc_enabled:
+                gc.enable()
+        self._record(samples, iterations)
+
+    def _record(self, samples: List[float], iterations: int):
+        self.stats = {
+            "min": min(samples),
+            "max": max(samples),
+            "mean": statistics.mean(samples),
+            "median": statistics.median(samples),
+            "stddev": statistics.stdev(samples) if len(samples) > 1 else 0.0,
+            "rounds": len(samples),
+            "iterations": iterations,
+            "ops": 1 / statistics.median(samples) if statistics.median(samples) > 0 else 0.0,
+        }
+        if self.extra_info:
+            self.stats["extra_info"] = dict(self.extra_info)
+
+
+class SkipBenchmark(Exception):
+    pass
+
+
+def skip(reason: str):
+    raise SkipBenchmark(reason)
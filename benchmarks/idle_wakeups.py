@@ -0,0 +1,132 @@
+"""
+Count how often an idle min2tray process wakes up, and check it shuts down on a signal.
+
+Starts ``WindowToTray`` in a child process against the in-memory window
+backend with a tray stub that blocks forever (the tray backend's own GUI
+loop is not min2tray's to tune), lets it settle, then counts the context
+switches of all its threads over a fixed window from
+``/proc/<pid>/task/*/status``. Afterwards it sends SIGTERM (or SIGINT) and
+expects a clean exit. Linux only:
+
+    python benchmarks/idle_wakeups.py --window 10 --max-wakeups 2
+"""
+
+import argparse
+import glob
+import os
+import signal
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+WINDOW_TITLE = "min2tray-idle-benchmark"
+
+
+def run_child(control_socket: str, command: bool):
+    import threading
+
+    from min2tray.core import WindowToTray
+    from min2tray.tray import TrayIcon
+    from min2tray.window_manager import MemoryDesktop
+
+    def blocking_tray(self, icon_path=None):
+        self._stop_requested = threading.Event()
+        self._stop_requested.wait()
+
+    def stop_tray(self):
+        getattr(self, "_stop_requested", threading.Event()).set()
+
+    TrayIcon.start = blocking_tray
+    TrayIcon.stop = stop_tray
+    MemoryDesktop.default().add_window(WINDOW_TITLE)
+
+    app = WindowToTray(window_title=WINDOW_TITLE, backend="memory", control_socket=control_socket or None)
+    if command:
+        app.process_manager.run_command(["sleep", "3600"], wait_time=0)
+    app.setup_window()
+    print("ready", flush=True)
+    app.start()
+    print("stopped", flush=True)
+
+
+def context_switches(pid: int) -> dict:
+    counts = {}
+    for path in glob.glob(f"/proc/{pid}/task/*/status"):
+        fields = {}
+        try:
+            with open(path) as f:
+                for line in f:
+                    key, _, value = line.partition(":")
+                    fields[key] = value.strip()
+        except OSError:
+            continue
+        counts[(path.split("/")[4], fields.get("Name", "?"))] = (
+            int(fields.get("voluntary_ctxt_switches", 0)) + int(fields.get("nonvoluntary_ctxt_switches", 0))
+        )
+    return counts
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--settle", type=float, default=2.0, help="Seconds to wait before counting (default: 2)")
+    parser.add_argument("--window", type=float, default=10.0, help="Seconds to count wakeups over (default: 10)")
+    parser.add_argument("--max-wakeups", type=int, default=2, help="Fail above this many wakeups (default: 2)")
+    parser.add_argument("--signal", choices=["SIGTERM", "SIGINT"], default="SIGTERM",
+                        help="Signal sent to stop the process afterwards (default: SIGTERM)")
+    parser.add_argument("--command", action="store_true", help="Let min2tray launch a command and wait on it")
+    parser.add_argument("--no-control", action="store_true", help="Do not open the control socket")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--control-socket", default="", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.control_socket, args.command)
+        return 0
+
+    if not sys.platform.startswith("linux"):
+        print("Counting wakeups needs /proc, Linux only")
+        return 0
+
+    control_socket = "" if args.no_control else os.path.join("/tmp", f"min2tray-idle-{os.getpid()}.sock")
+    argv = [sys.executable, os.path.abspath(__file__), "--child", "--control-socket", control_socket]
+    if args.command:
+        argv.append("--command")
+    child = subprocess.Popen(argv, stdout=subprocess.PIPE, text=True)
+    try:
+        if child.stdout.readline().strip() != "ready":
+            print("min2tray failed to start")
+            return 1
+        time.sleep(args.settle)
+
+        before = context_switches(child.pid)
+        time.sleep(args.window)
+        after = context_switches(child.pid)
+
+        total = 0
+        for key, count in sorted(after.items()):
+            wakeups = count - before.get(key, 0)
+            total += wakeups
+            print(f"  thread {key[0]:>8} {key[1]:<16} {wakeups:>5} wakeups")
+        print(f"{total} wakeups in {args.window:.0f}s ({total / args.window:.2f}/s), budget {args.max_wakeups}")
+
+        start = time.perf_counter()
+        child.send_signal(getattr(signal, args.signal))
+        try:
+            output, _ = child.communicate(timeout=10)
+        except subprocess.TimeoutExpired:
+            print(f"min2tray did not exit within 10s of {args.signal}")
+            return 1
+        clean = child.returncode == 0 and "stopped" in output
+        print(f"{args.signal}: exited with {child.returncode} in {(time.perf_counter() - start) * 1000:.0f} ms"
+              f"{'' if clean else ' (not clean)'}")
+        return 0 if total <= args.max_wakeups and clean else 1
+    finally:
+        if child.poll() is None:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
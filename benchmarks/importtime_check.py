@@ -0,0 +1,99 @@
+"""
+Check the cold-start import cost of min2tray with ``python -X importtime``.
+
+    python benchmarks/importtime_check.py
+    python benchmarks/importtime_check.py --package-budget 30 --cli-budget 80
+
+``import min2tray`` and ``min2tray --help`` each run in a fresh interpreter.
+The check fails when their cumulative import time exceeds the budget (in
+milliseconds, best of ``--repeat`` runs) or when they load a GUI, input or
+other-platform module that should only be imported on first use.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import Dict, List, Optional, Tuple
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+FORBIDDEN = (
+    "pystray",
+    "PIL",
+    "pynput",
+    "Xlib",
+    "psutil",
+    "min2tray.core",
+    "min2tray.tray",
+    "min2tray.window_manager.window_windows",
+    "min2tray.window_manager.window_macos",
+    "min2tray.window_manager.window_xlib",
+)
+
+TARGETS = {
+    "import min2tray": ["-c", "import min2tray"],
+    "min2tray --help": ["-m", "min2tray.cli", "--help"],
+}
+
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def measure(arguments: List[str]) -> Tuple[float, Dict[str, int]]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [SRC, os.environ.get("PYTHONPATH")])))
+    env.pop("PYTHONIMPORTTIME", None)
+    result = subprocess.run([sys.executable, "-X", "importtime", *arguments], env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"{' '.join(arguments)} failed:\n{result.stderr}")
+
+    total = 0
+    modules: Dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match is None:
+            continue
+        cumulative = int(match.group(2))
+        modules[match.group(4)] = cumulative
+        if len(match.group(3)) == 1:
+            total += cumulative
+    return total / 1000, modules
+
+
+def check(name: str, arguments: List[str], budget: float, repeat: int) -> List[str]:
+    runs = [measure(arguments) for _ in range(repeat)]
+    best, modules = min(runs, key=lambda run: run[0])
+    print(f"{name:<20}{best:>10.1f} ms  (budget {budget:.0f} ms, min2tray {modules.get('min2tray', 0) / 1000:.1f} ms)")
+
+    failures = []
+    if best > budget:
+        failures.append(f"{name}: {best:.1f} ms exceeds the {budget:.0f} ms budget")
+    loaded = sorted(module for module in modules
+                    if any(module == forbidden or module.startswith(forbidden + ".") for forbidden in FORBIDDEN))
+    if loaded:
+        failures.append(f"{name}: loads {', '.join(loaded)}")
+    return failures
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--package-budget", type=float, default=40.0,
+                        help="Budget in milliseconds for 'import min2tray' (default: 40).")
+    parser.add_argument("--cli-budget", type=float, default=100.0,
+                        help="Budget in milliseconds for 'min2tray --help' (default: 100).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per target, the fastest is used (default: 5).")
+    args = parser.parse_args(argv)
+
+    budgets = {"import min2tray": args.package_budget, "min2tray --help": args.cli_budget}
+    failures = []
+    for name, arguments in TARGETS.items():
+        failures.extend(check(name, arguments, budgets[name], max(args.repeat, 1)))
+
+    for failure in failures:
+        print(failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""
+Run the min2tray benchmark suite and optionally compare against a previous run.
+
+    python benchmarks/run.py --output baseline.json
+    python benchmarks/run.py --compare baseline.json --threshold 0.2
+
+Each ``bench_*.py`` module in this directory is collected. Results are keyed by
+benchmark name, so JSON files from different commits can be compared directly.
+"""
+
+import argparse
+import glob
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+
+from harness import Benchmark, SkipBenchmark  # noqa: E402
+
+
+def collect(name_filter: Optional[str]) -> List[tuple]:
+    cases = []
+    for path in sorted(glob.glob(os.path.join(HERE, "bench_*.py"))):
+        module = importlib.import_module(os.path.splitext(os.path.basename(path))[0])
+        for attribute in sorted(vars(module)):
+            func = getattr(module, attribute)
+            if not attribute.startswith("bench_") or not callable(func):
+                continue
+            base = f"{module.__name__[len('bench_'):]}.{attribute[len('bench_'):]}"
+            params = getattr(func, "params", None)
+            variants = [(f"{base}[{value}]", {params[0]: value}) for value in params[1]] if params else [(base, {})]
+            for name, kwargs in variants:
+                if not name_filter or name_filter in name:
+                    cases.append((name, func, kwargs))
+    return cases
+
+
+def git_revision() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run(cases: List[tuple], min_time: float) -> Dict[str, dict]:
+    results = {}
+    for name, func, kwargs in cases:
+        benchmark = Benchmark(name, min_time=min_time)
+        try:
+            func(benchmark, **kwargs)
+        except SkipBenchmark as e:
+            print(f"{name:<45} skipped: {e}")
+            continue
+        except Exception:
+            print(f"{name:<45} failed")
+            traceback.print_exc()
+            continue
+
+        if benchmark.stats is None:
+            print(f"{name:<45} did not call the benchmark fixture")
+            continue
+        results[name] = benchmark.stats
+        print(f"{name:<45}{format_time(benchmark.stats['median']):>12}{format_time(benchmark.stats['stddev']):>12}"
+              f"{benchmark.stats['ops']:>14.1f}")
+    return results
+
+
+def compare(results: Dict[str, dict], baseline: Dict[str, dict], threshold: float) -> List[str]:
+    regressions = []
+    print(f"\n{'benchmark':<45}{'baseline':>12}{'current':>12}{'change':>10}")
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        change = stats["median"] / previous["median"] - 1 if previous["median"] else 0.0
+        marker = ""
+        if change > threshold:
+            marker = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:<45}{format_time(previous['median']):>12}{format_time(stats['median']):>12}"
+              f"{change:>+10.1%}{marker}")
+    return regressions
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("-k", "--filter", help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("-o", "--output", metavar="PATH", help="Write the results as JSON.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a previous JSON result.")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Relative median slowdown reported as a regression (default: 0.25).")
+    parser.add_argument("--min-time", type=float, default=0.25, help="Minimum seconds spent per benchmark.")
+    args = parser.parse_args(argv)
+
+    print(f"{'benchmark':<45}{'median':>12}{'stddev':>12}{'ops/s':>14}")
+    results = run(collect(args.filter), args.min_time)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({
+                "revision": git_revision(),
+                "time": time.time(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "benchmarks": results,
+            }, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)["benchmarks"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
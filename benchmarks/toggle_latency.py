@@ -0,0 +1,132 @@
+"""
+Compare hotkey-toggle latency of the xdotool and xlib Linux backends.
+
+Runs against the current $DISPLAY, or starts a private Xvfb server when
+``--xvfb`` is given (or no display is available):
+
+    python benchmarks/toggle_latency.py --xvfb --iterations 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+WINDOW_TITLE = "min2tray-toggle-benchmark"
+
+
+def start_xvfb() -> subprocess.Popen:
+    if not shutil.which("Xvfb"):
+        raise SystemExit("Xvfb is not installed")
+
+    read_fd, write_fd = os.pipe()
+    server = subprocess.Popen(
+        ["Xvfb", "-displayfd", str(write_fd), "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd) as reader:
+        display_number = reader.readline().strip()
+    if not display_number:
+        server.kill()
+        raise SystemExit("Xvfb failed to start")
+    os.environ["DISPLAY"] = f":{display_number}"
+    return server
+
+
+def create_test_window():
+    from Xlib import X, display
+
+    client = display.Display()
+    screen = client.screen()
+    window = screen.root.create_window(
+        10, 10, 200, 100, 0, screen.root_depth, X.InputOutput, X.CopyFromParent,
+        background_pixel=screen.white_pixel
+    )
+    window.set_wm_name(WINDOW_TITLE)
+    window.change_property(
+        client.intern_atom("_NET_WM_PID"), client.intern_atom("CARDINAL"), 32, [os.getpid()]
+    )
+    window.map()
+    client.sync()
+    return client, window
+
+
+def measure(backend: str, iterations: int) -> Dict[str, float]:
+    from min2tray.window_manager import by_title, create_window_manager
+
+    manager = create_window_manager(by_title(WINDOW_TITLE), backend)
+
+    start = time.perf_counter()
+    if not manager.find_window():
+        raise SystemExit(f"{backend}: benchmark window not found")
+    find_ms = (time.perf_counter() - start) * 1000
+
+    samples: List[float] = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        manager.toggle()
+        samples.append((time.perf_counter() - start) * 1000)
+
+    if not manager.is_visible:
+        manager.show()
+
+    samples.sort()
+    return {
+        "find_ms": find_ms,
+        "toggle_mean_ms": statistics.mean(samples),
+        "toggle_median_ms": statistics.median(samples),
+        "toggle_p95_ms": samples[int(len(samples) * 0.95) - 1],
+        "toggle_max_ms": samples[-1],
+    }
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--xvfb", action="store_true", help="Run against a private Xvfb server.")
+    parser.add_argument("--iterations", type=int, default=100, help="Toggles per backend.")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON.")
+    args = parser.parse_args(argv)
+
+    server = start_xvfb() if args.xvfb or not os.environ.get("DISPLAY") else None
+    try:
+        client, window = create_test_window()
+
+        backends = ["xlib"]
+        if shutil.which("xdotool"):
+            backends.insert(0, "xdotool")
+        else:
+            print("xdotool not found, measuring the xlib backend only")
+
+        results = {backend: measure(backend, args.iterations) for backend in backends}
+
+        print(f"{'backend':<10}{'find':>10}{'mean':>10}{'median':>10}{'p95':>10}{'max':>10}  (ms)")
+        for backend, row in results.items():
+            print(f"{backend:<10}{row['find_ms']:>10.3f}{row['toggle_mean_ms']:>10.3f}"
+                  f"{row['toggle_median_ms']:>10.3f}{row['toggle_p95_ms']:>10.3f}{row['toggle_max_ms']:>10.3f}")
+
+        if "xdotool" in results:
+            speedup = results["xdotool"]["toggle_median_ms"] / results["xlib"]["toggle_median_ms"]
+            print(f"xlib median toggle is {speedup:.1f}x faster than xdotool")
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=2)
+
+        window.destroy()
+        client.close()
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 import webview
 import threading
-import time
 import sys
 import os
 from pathlib import Path
@@ -329,8 +328,6 @@ class MultiWindowTrayManager:
 
     def setup_tray_integration(self):
         def setup_multi_tray():
-            time.sleep(3)
-
             try:
                 window_configs = [
                     ("Main Control Panel", "<ctrl>+<alt>+1"),
@@ -349,7 +346,7 @@ class MultiWindowTrayManager:
                         tray_title=window_title
                     )
 
-                    window_to_tray.setup_window()
+                    window_to_tray.setup_window(timeout=10.0)
 
                     window_to_tray.register_hotkey(hotkey)
 
@@ -1,6 +1,5 @@
 import webview
 import threading
-import time
 import sys
 import os
 from pathlib import Path
@@ -157,8 +156,6 @@ class WebViewTrayApp:
 
     def setup_tray_integration(self):
         def setup_tray():
-            time.sleep(2)
-
             try:
                 window_identifier = WindowIdentifier(title="Min2Tray PyWebView Demo")
 
@@ -168,7 +165,7 @@ class WebViewTrayApp:
                     tray_title="Min2Tray PyWebView Demo"
                 )
 
-                self.tray_app.setup_window()
+                self.tray_app.setup_window(timeout=10.0)
 
                 self.tray_app.register_hotkey("<ctrl>+<alt>+h")
 
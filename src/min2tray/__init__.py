@@ -1,25 +1,87 @@
-from .core import WindowToTray, minimize_to_tray, minimize_to_tray_flexible
-from .tray import TrayIcon
-from .window import WindowManager, FlexibleWindowManager
-from .hotkey import HotkeyManager
-from .process import ProcessManager, ProcessEvent
-from .window_manager import WindowIdentifier, create_window_manager, by_title, by_process_id, by_window_id, by_handle
-from .utils import PLATFORM
-from .utils import WindowNotFoundError, TrayError, IconLoadError, HotkeyRegistrationError
-from .cli import main
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "0.2.0"
 __author__ = "gzj"
 __email__ = "gzj00@outlook.com"
 
+_LAZY_ATTRIBUTES = {
+    "WindowToTray": ".core",
+    "ManagedWindow": ".core",
+    "TrayHub": ".core",
+    "minimize_to_tray": ".core",
+    "minimize_to_tray_flexible": ".core",
+    "TrayIcon": ".tray",
+    "WindowManager": ".window",
+    "FlexibleWindowManager": ".window",
+    "HotkeyManager": ".hotkey",
+    "HotkeyHub": ".hotkey",
+    "ProcessManager": ".process",
+    "ProcessEvent": ".process",
+    "RestartPolicy": ".process",
+    "OutputCapture": ".output",
+    "ResourceSampler": ".sampler",
+    "ProcessFreezer": ".freezer",
+    "ThrottlePolicy": ".throttle",
+    "WindowIdentifier": ".window_manager",
+    "create_window_manager": ".window_manager",
+    "by_title": ".window_manager",
+    "by_process_id": ".window_manager",
+    "by_window_id": ".window_manager",
+    "by_handle": ".window_manager",
+    "PLATFORM": ".utils",
+    "WindowNotFoundError": ".utils",
+    "TrayError": ".utils",
+    "IconLoadError": ".utils",
+    "HotkeyRegistrationError": ".utils",
+    "main": ".cli",
+}
+
+if TYPE_CHECKING:
+    from .core import WindowToTray, ManagedWindow, TrayHub, minimize_to_tray, minimize_to_tray_flexible
+    from .tray import TrayIcon
+    from .window import WindowManager, FlexibleWindowManager
+    from .hotkey import HotkeyManager, HotkeyHub
+    from .process import ProcessManager, ProcessEvent, RestartPolicy
+    from .output import OutputCapture
+    from .sampler import ResourceSampler
+    from .freezer import ProcessFreezer
+    from .throttle import ThrottlePolicy
+    from .window_manager import WindowIdentifier, create_window_manager, by_title, by_process_id, by_window_id, by_handle
+    from .utils import PLATFORM
+    from .utils import WindowNotFoundError, TrayError, IconLoadError, HotkeyRegistrationError
+    from .cli import main
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
 __all__ = [
     "WindowToTray",
+    "ManagedWindow",
+    "TrayHub",
     "TrayIcon",
     "WindowManager",
     "FlexibleWindowManager",
     "HotkeyManager",
+    "HotkeyHub",
     "ProcessManager",
     "ProcessEvent",
+    "RestartPolicy",
+    "OutputCapture",
+    "ResourceSampler",
+    "ProcessFreezer",
+    "ThrottlePolicy",
     "minimize_to_tray",
     "minimize_to_tray_flexible",
     "WindowIdentifier",
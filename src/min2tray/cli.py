@@ -1,8 +1,313 @@
 import argparse
+import json
+import os
 import sys
-from .core import minimize_to_tray
+from typing import Callable, List, Optional
+
+from .control import COMMANDS, InstanceLock, default_socket_path, forward_windows, send_command
+from .utils import ControlError, MetricsDumper
+
+
+class _NewWindow(argparse.Action):
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        windows = list(getattr(namespace, self.dest, None) or [])
+        windows.append({"window_title": values})
+        setattr(namespace, self.dest, windows)
+
+
+class _WindowOption(argparse.Action):
+
+    def __call__(self, parser, namespace, values, option_string=None):
+        windows = getattr(namespace, "windows", None)
+        if not windows:
+            parser.error(f"{option_string} must follow -w/--window_title")
+        windows[-1][self.dest] = self.const if self.nargs == 0 else values
+
+
+def _add_common_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "-b",
+        "--backend",
+        metavar="",
+        choices=["xlib", "xdotool"],
+        help="Linux window backend: xlib (persistent X connection) or xdotool.",
+    )
+    parser.add_argument(
+        "--hotkey-backend",
+        metavar="",
+        choices=["xgrab", "pynput"],
+        help="Hotkey backend: xgrab (X11 passive key grabs) or pynput (keyboard listener).",
+    )
+
+    parser.add_argument(
+        "--freeze-hidden",
+        dest="freeze_after",
+        metavar="",
+        type=float,
+        help="Suspend an app's processes once its window has been hidden for this many seconds.",
+    )
+
+    parser.add_argument(
+        "--throttle-hidden",
+        action="store_true",
+        help="Lower the CPU and IO priority of an app while its window is hidden.",
+    )
+    parser.add_argument(
+        "--memory-high",
+        metavar="",
+        help="With --throttle-hidden, also limit a hidden app's cgroup memory to this size (e.g. 512M).",
+    )
+    parser.add_argument(
+        "--scope",
+        metavar="",
+        choices=["systemd", "cgroup"],
+        help="Start commands in their own systemd user scope or cgroup, so they can be throttled or frozen.",
+    )
+
+    parser.add_argument(
+        "--restart",
+        metavar="",
+        choices=["never", "on-failure", "always"],
+        default="never",
+        help="Restart a command when it exits: never, on-failure or always, with exponential backoff "
+             "(default: never).",
+    )
+
+    parser.add_argument(
+        "--capture-output",
+        action="store_true",
+        help="Keep the last lines a command prints in memory instead of passing them to this terminal.",
+    )
+    parser.add_argument(
+        "--output-log-dir",
+        metavar="",
+        help="With --capture-output, also append each app's output to <dir>/<name>.log, rotated at 1 MiB.",
+    )
+
+    parser.add_argument(
+        "--sample-resources",
+        dest="sample_interval",
+        metavar="",
+        type=float,
+        help="Every this many seconds, show each app's CPU, memory and thread count in the tray tooltip.",
+    )
+
+    parser.add_argument(
+        "--metrics-file",
+        metavar="",
+        help="Enable instrumentation and periodically write metrics to this file.",
+    )
+    parser.add_argument(
+        "--metrics-format",
+        metavar="",
+        choices=list(MetricsDumper.FORMATS),
+        default="jsonl",
+        help="Metrics file format: jsonl (append one record per dump) or prometheus (textfile).",
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        metavar="",
+        type=float,
+        default=60.0,
+        help="Seconds between metrics dumps (default: 60).",
+    )
+    parser.add_argument(
+        "--control-socket",
+        metavar="",
+        default=default_socket_path(),
+        help="Unix socket accepting toggle/show/hide/list/stats requests (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-control",
+        dest="control_socket",
+        action="store_const",
+        const=None,
+        help="Do not open the control socket.",
+    )
+    parser.add_argument(
+        "--single-instance",
+        action="store_true",
+        help="Hand the windows to an already running instance (which adds or toggles them) and exit.",
+    )
+
+
+def _manifest_conflicts(args: argparse.Namespace) -> List[str]:
+    """Return the options given on the command line that a --config manifest run would not apply."""
+    given = {
+        "--freeze-hidden": args.freeze_after is not None,
+        "--throttle-hidden": args.throttle_hidden,
+        "--memory-high": args.memory_high is not None,
+        "--scope": args.scope is not None,
+        "--restart": args.restart != "never",
+        "--capture-output": args.capture_output,
+        "--output-log-dir": args.output_log_dir is not None,
+        "--single-instance": args.single_instance,
+    }
+    return [option for option, present in given.items() if present]
+
+
+def _throttle_policy(args: argparse.Namespace):
+    if not args.throttle_hidden and not args.memory_high:
+        return None
+    from .throttle import ThrottlePolicy
+
+    return ThrottlePolicy(memory_high=args.memory_high)
+
+
+def _restart_policy(args: argparse.Namespace):
+    if args.restart == "never":
+        return None
+    from .process import RestartPolicy
+
+    return RestartPolicy(args.restart)
+
+
+def _output_capture(args: argparse.Namespace, name: str):
+    if not args.capture_output and not args.output_log_dir:
+        return None
+    from .output import OutputCapture
+
+    log_file = None
+    if args.output_log_dir:
+        log_file = os.path.join(args.output_log_dir, "".join(c if c.isalnum() or c in "-_." else "_" for c in name)
+                                + ".log")
+    return OutputCapture(log_file=log_file)
+
+
+def _start_dumper(args: argparse.Namespace) -> Optional[MetricsDumper]:
+    if not args.metrics_file:
+        return None
+    dumper = MetricsDumper(args.metrics_file, args.metrics_interval, args.metrics_format)
+    dumper.start()
+    return dumper
+
+
+def daemon(argv: List[str]):
+    parser = argparse.ArgumentParser(
+        prog="min2tray daemon",
+        description="Manage several windows from one process with a single tray icon.",
+        epilog="Options after -w apply to that window, e.g. "
+               "min2tray daemon -w Firefox -k '<ctrl>+<alt>+f' -w Slack -c slack -m",
+    )
+    parser.add_argument(
+        "-w", "--window_title", dest="windows", metavar="", action=_NewWindow,
+        help="Title of a window to manage. Repeat for each window.",
+    )
+    parser.add_argument("-n", "--name", metavar="", action=_WindowOption,
+                        help="Menu label for the preceding window (default: its title).")
+    parser.add_argument("-c", "--command", metavar="", action=_WindowOption,
+                        help="Command that starts the preceding window.")
+    parser.add_argument("-k", "--hotkey", metavar="", action=_WindowOption,
+                        help="Hotkey toggling the preceding window.")
+    parser.add_argument("-m", "--start_minimized", nargs=0, const=True, action=_WindowOption,
+                        help="Start the preceding window minimised.")
+    parser.add_argument("-i", "--icon_image", metavar="", help="The path to the tray icon image.")
+    _add_common_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if not args.windows:
+        print("Error: At least one window (-w) is required")
+        sys.exit(1)
+
+    windows = [
+        {
+            "name": window.get("name") or window["window_title"],
+            "window_title": window["window_title"],
+            "command": window.get("command"),
+            "hotkey": window.get("hotkey"),
+            "start_hidden": window.get("start_minimized", False),
+        }
+        for window in args.windows
+    ]
+    _run_windows(args, windows)
+
+
+def _run_windows(args: argparse.Namespace, windows: List[dict]):
+    if not args.single_instance:
+        _run(args, _run_hub, args, windows)
+        return
+
+    if not args.control_socket:
+        print("Error: --single-instance needs the control socket")
+        sys.exit(1)
+
+    lock = InstanceLock(args.control_socket)
+    if not lock.acquire():
+        try:
+            results = forward_windows(windows, args.control_socket)
+        except ControlError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        for window, result in zip(windows, results):
+            print(f"{window['name']}: {result} in the running instance")
+        return
+
+    try:
+        _run(args, _run_hub, args, windows)
+    finally:
+        lock.release()
+
+
+def _run_hub(args: argparse.Namespace, windows: List[dict]):
+    from .core import TrayHub
+
+    hub = TrayHub(backend=args.backend, hotkey_backend=args.hotkey_backend, control_socket=args.control_socket,
+                  sample_interval=args.sample_interval)
+    for window in windows:
+        name = window.pop("name")
+        hub.add_window(name, freeze_after=args.freeze_after, throttle=_throttle_policy(args),
+                       scope=args.scope, restart=_restart_policy(args), capture=_output_capture(args, name),
+                       launch=False, **window)
+    hub.start(args.icon_image)
+
+
+def _run(args: argparse.Namespace, func: Callable, *func_args, **func_kwargs):
+    dumper = _start_dumper(args)
+    try:
+        func(*func_args, **func_kwargs)
+    except KeyboardInterrupt:
+        print("\nApplication stopped by user")
+        sys.exit(0)
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+        sys.exit(1)
+    finally:
+        if dumper:
+            dumper.stop()
+
+
+def ctl(argv: List[str]):
+    parser = argparse.ArgumentParser(prog="min2tray ctl", description="Send a request to a running min2tray.")
+    parser.add_argument("cmd", choices=COMMANDS, help="Request to send.")
+    parser.add_argument("window", nargs="?", help="Managed window name (optional with a single window).")
+    parser.add_argument("--socket", metavar="", default=default_socket_path(),
+                        help="Control socket path (default: %(default)s).")
+    args = parser.parse_args(argv)
+
+    try:
+        response = send_command(args.cmd, args.window, args.socket)
+    except ControlError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    if not response.get("ok"):
+        print(f"Error: {response.get('error')}")
+        sys.exit(1)
+    if response.get("result") is not None:
+        print(json.dumps(response["result"], indent=2))
+
+
+def main(argv: Optional[List[str]] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv[:1] == ["daemon"]:
+        return daemon(argv[1:])
+    if argv[:1] == ["ctl"]:
+        return ctl(argv[1:])
 
-def main():
     parser = argparse.ArgumentParser(description="Minimize window to system tray.")
     parser.add_argument("-c", "--command", metavar="", help="The process command.")
     parser.add_argument(
@@ -26,29 +331,61 @@ def main():
         action="store_true",
         help="Starts the application in a minimised state.",
     )
+    parser.add_argument(
+        "--config",
+        metavar="",
+        help="TOML manifest declaring several apps to start and manage from one tray icon.",
+    )
+    _add_common_arguments(parser)
+
+    args = parser.parse_args(argv)
+
+    if args.config:
+        conflicts = _manifest_conflicts(args)
+        if conflicts:
+            print(f"Error: {', '.join(conflicts)} cannot be combined with --config; "
+                  f"set the per-app options in the manifest instead")
+            sys.exit(1)
+        from .config import run_manifest
 
-    args = parser.parse_args()
+        _run(args, run_manifest, args.config, args.icon_image, args.backend, args.hotkey_backend,
+             args.control_socket, args.sample_interval)
+        return
 
     if not args.window_title:
         print("Error: Window title is required")
         sys.exit(1)
 
-    try:
-        minimize_to_tray(
-            window_title=args.window_title,
-            command=args.command,
-            icon_path=args.icon_image,
-            hotkey=args.hotkey,
-            start_hidden=args.start_minimized
-        )
-    except KeyboardInterrupt:
-        print("\nApplication stopped by user")
-        sys.exit(0)
-    except Exception as e:
-        print(f"Error: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    if args.single_instance:
+        _run_windows(args, [{
+            "name": args.window_title,
+            "window_title": args.window_title,
+            "command": args.command,
+            "hotkey": args.hotkey,
+            "start_hidden": args.start_minimized,
+        }])
+        return
+
+    from .core import minimize_to_tray
+
+    _run(
+        args,
+        minimize_to_tray,
+        window_title=args.window_title,
+        command=args.command,
+        icon_path=args.icon_image,
+        hotkey=args.hotkey,
+        start_hidden=args.start_minimized,
+        backend=args.backend,
+        hotkey_backend=args.hotkey_backend,
+        control_socket=args.control_socket,
+        freeze_after=args.freeze_after,
+        throttle=_throttle_policy(args),
+        scope=args.scope,
+        restart=_restart_policy(args),
+        capture=_output_capture(args, args.window_title),
+        sample_interval=args.sample_interval
+    )
 
 
 if __name__ == "__main__":
@@ -0,0 +1,316 @@
+"""
+Declarative TOML manifests describing several applications to manage
+"""
+
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Dict, List, Optional, Union
+
+from .core import TrayHub
+from .hotkey import normalize_combination
+from .output import OutputCapture
+from .process import RESTART_POLICIES, RestartPolicy
+from .throttle import ThrottlePolicy
+from .window_manager import WindowIdentifier
+from .window_manager.matcher import MATCH_MODES
+from .utils import ConfigError
+from .utils.cgroup import SCOPES
+
+if sys.version_info >= (3, 11):
+    import tomllib
+else:
+    import tomli as tomllib
+
+APP_KEYS = {"command", "title", "title_match", "wm_class", "process_id", "window_id", "hotkey", "icon",
+            "start_minimized", "depends_on", "wait", "freeze_after", "throttle", "scope", "restart",
+            "output"}
+THROTTLE_KEYS = {"cpu_weight", "io_weight", "nice", "ionice_idle", "memory_high", "reclaim"}
+RESTART_KEYS = {"policy", "backoff", "max_backoff", "reset_after", "max_restarts", "window"}
+OUTPUT_KEYS = {"max_bytes", "log_file", "log_max_bytes", "log_backups"}
+TRAY_KEYS = {"name", "title", "icon", "backend", "hotkey_backend", "sample_interval"}
+
+INTEGER = (int,)
+NUMBER = (int, float)
+BOOLEAN = (bool,)
+STRING = (str,)
+SIZE = (int, str)
+TYPE_NAMES = {INTEGER: "an integer", NUMBER: "a number", BOOLEAN: "true or false", STRING: "a string",
+              SIZE: "a size such as 512M"}
+APP_TYPES = {"hotkey": STRING, "icon": STRING, "start_minimized": BOOLEAN, "wait": NUMBER, "freeze_after": NUMBER}
+THROTTLE_TYPES = {"cpu_weight": INTEGER, "io_weight": INTEGER, "nice": INTEGER, "ionice_idle": BOOLEAN,
+                  "memory_high": SIZE, "reclaim": BOOLEAN}
+RESTART_TYPES = {"policy": STRING, "backoff": NUMBER, "max_backoff": NUMBER, "reset_after": NUMBER,
+                 "max_restarts": INTEGER, "window": NUMBER}
+OUTPUT_TYPES = {"max_bytes": INTEGER, "log_file": STRING, "log_max_bytes": INTEGER, "log_backups": INTEGER}
+
+
+class AppConfig:
+
+    def __init__(self, name: str, command: Optional[Union[str, list]] = None,
+                 identifier: Optional[WindowIdentifier] = None, hotkey: Optional[str] = None,
+                 icon: Optional[str] = None, start_minimized: bool = False,
+                 depends_on: Optional[List[str]] = None, wait: float = 10.0,
+                 freeze_after: Optional[float] = None, throttle: Optional[ThrottlePolicy] = None,
+                 scope: Optional[str] = None, restart: Optional[RestartPolicy] = None,
+                 output: Optional[OutputCapture] = None):
+        self.name = name
+        self.command = command
+        self.identifier = identifier
+        self.hotkey = hotkey
+        self.icon = icon
+        self.start_minimized = start_minimized
+        self.depends_on = depends_on or []
+        self.wait = wait
+        self.freeze_after = freeze_after
+        self.throttle = throttle
+        self.scope = scope
+        self.restart = restart
+        self.output = output
+
+    def __repr__(self):
+        return f"AppConfig(name={self.name}, command={self.command}, identifier={self.identifier})"
+
+
+class Manifest:
+
+    def __init__(self, apps: Dict[str, AppConfig], tray_name: str = "Min2Tray", tray_title: str = "Min2Tray",
+                 icon: Optional[str] = None, backend: Optional[str] = None,
+                 hotkey_backend: Optional[str] = None, sample_interval: Optional[float] = None):
+        self.apps = apps
+        self.tray_name = tray_name
+        self.tray_title = tray_title
+        self.icon = icon
+        self.backend = backend
+        self.hotkey_backend = hotkey_backend
+        self.sample_interval = sample_interval
+
+    @property
+    def tray_icon(self) -> Optional[str]:
+        if self.icon:
+            return self.icon
+        return next((app.icon for app in self.apps.values() if app.icon), None)
+
+    def stages(self) -> List[List[str]]:
+        remaining = {name: set(app.depends_on) for name, app in self.apps.items()}
+        stages = []
+        while remaining:
+            ready = [name for name, dependencies in remaining.items() if not dependencies]
+            if not ready:
+                raise ConfigError(f"Dependency cycle between apps: {', '.join(sorted(remaining))}")
+            stages.append(ready)
+            for name in ready:
+                del remaining[name]
+            for dependencies in remaining.values():
+                dependencies.difference_update(ready)
+        return stages
+
+
+def load_manifest(path: str) -> Manifest:
+    try:
+        with open(path, "rb") as f:
+            data = tomllib.load(f)
+    except (OSError, tomllib.TOMLDecodeError) as e:
+        raise ConfigError(f"Failed to read manifest {path}: {e}")
+    return parse_manifest(data)
+
+
+def parse_manifest(data: dict) -> Manifest:
+    tray = data.get("tray", {})
+    unknown = set(tray) - TRAY_KEYS
+    if unknown:
+        raise ConfigError(f"Unknown keys in [tray]: {', '.join(sorted(unknown))}")
+    _check_types("tray", tray, {"sample_interval": NUMBER})
+
+    apps_data = data.get("apps")
+    if not isinstance(apps_data, dict) or not apps_data:
+        raise ConfigError("Manifest must declare at least one [apps.<name>] table")
+
+    apps = {name: _parse_app(name, values) for name, values in apps_data.items()}
+    hotkeys: Dict[str, str] = {}
+    for app in apps.values():
+        if app.hotkey:
+            other = hotkeys.setdefault(normalize_combination(app.hotkey), app.name)
+            if other != app.name:
+                raise ConfigError(f"[apps.{app.name}] hotkey '{app.hotkey}' is already used by '{other}'")
+    for app in apps.values():
+        for dependency in app.depends_on:
+            if dependency not in apps:
+                raise ConfigError(f"App '{app.name}' depends on unknown app '{dependency}'")
+
+    manifest = Manifest(
+        apps,
+        tray_name=tray.get("name", "Min2Tray"),
+        tray_title=tray.get("title", "Min2Tray"),
+        icon=tray.get("icon"),
+        backend=tray.get("backend"),
+        hotkey_backend=tray.get("hotkey_backend"),
+        sample_interval=float(tray["sample_interval"]) if "sample_interval" in tray else None,
+    )
+    manifest.stages()
+    return manifest
+
+
+def _parse_app(name: str, values: dict) -> AppConfig:
+    if not isinstance(values, dict):
+        raise ConfigError(f"[apps.{name}] must be a table")
+    unknown = set(values) - APP_KEYS
+    if unknown:
+        raise ConfigError(f"Unknown keys in [apps.{name}]: {', '.join(sorted(unknown))}")
+    _check_types(f"apps.{name}", values, APP_TYPES)
+
+    title_match = values.get("title_match", "regex")
+    if title_match not in MATCH_MODES:
+        raise ConfigError(f"[apps.{name}] title_match must be one of {MATCH_MODES}")
+
+    try:
+        identifier = WindowIdentifier(
+            title=values.get("title"),
+            window_id=values.get("window_id"),
+            process_id=values.get("process_id"),
+            wm_class=values.get("wm_class"),
+            title_match=title_match,
+        )
+    except ValueError as e:
+        raise ConfigError(f"[apps.{name}] {e}")
+    if not (identifier.title or identifier.window_id or identifier.process_id or identifier.wm_class):
+        raise ConfigError(f"[apps.{name}] needs one of title, wm_class, process_id or window_id")
+
+    scope = values.get("scope")
+    if scope is not None and scope not in SCOPES:
+        raise ConfigError(f"[apps.{name}] scope must be one of {SCOPES}")
+
+    depends_on = values.get("depends_on", [])
+    if isinstance(depends_on, str):
+        depends_on = [depends_on]
+    if not isinstance(depends_on, list) or not all(isinstance(item, str) for item in depends_on):
+        raise ConfigError(f"[apps.{name}] depends_on must be an app name or a list of app names")
+
+    return AppConfig(
+        name,
+        command=values.get("command"),
+        identifier=identifier,
+        hotkey=values.get("hotkey"),
+        icon=values.get("icon"),
+        start_minimized=values.get("start_minimized", False),
+        depends_on=list(depends_on),
+        wait=float(values.get("wait", 10.0)),
+        freeze_after=float(values["freeze_after"]) if "freeze_after" in values else None,
+        throttle=_parse_throttle(name, values.get("throttle", False)),
+        scope=scope,
+        restart=_parse_restart(name, values.get("restart", "never")),
+        output=_parse_output(name, values.get("output", False)),
+    )
+
+
+def _parse_throttle(name: str, value: Union[bool, dict]) -> Optional[ThrottlePolicy]:
+    if value is True:
+        return ThrottlePolicy()
+    if value is False:
+        return None
+    if not isinstance(value, dict):
+        raise ConfigError(f"[apps.{name}] throttle must be true, false or a table")
+    unknown = set(value) - THROTTLE_KEYS
+    if unknown:
+        raise ConfigError(f"Unknown keys in [apps.{name}.throttle]: {', '.join(sorted(unknown))}")
+    _check_types(f"apps.{name}.throttle", value, THROTTLE_TYPES)
+    try:
+        return ThrottlePolicy(**value)
+    except ConfigError as e:
+        raise ConfigError(f"[apps.{name}.throttle] {e}")
+
+
+def _parse_restart(name: str, value: Union[str, dict]) -> Optional[RestartPolicy]:
+    if isinstance(value, str):
+        value = {"policy": value}
+    if not isinstance(value, dict):
+        raise ConfigError(f"[apps.{name}] restart must be one of {RESTART_POLICIES} or a table")
+    unknown = set(value) - RESTART_KEYS
+    if unknown:
+        raise ConfigError(f"Unknown keys in [apps.{name}.restart]: {', '.join(sorted(unknown))}")
+    _check_types(f"apps.{name}.restart", value, RESTART_TYPES)
+    if value.get("policy", "on-failure") not in RESTART_POLICIES:
+        raise ConfigError(f"[apps.{name}] restart policy must be one of {RESTART_POLICIES}")
+    if value.get("policy") == "never":
+        return None
+    return RestartPolicy(**value)
+
+
+def _parse_output(name: str, value: Union[bool, dict]) -> Optional[OutputCapture]:
+    if value is True:
+        return OutputCapture()
+    if value is False:
+        return None
+    if not isinstance(value, dict):
+        raise ConfigError(f"[apps.{name}] output must be true, false or a table")
+    unknown = set(value) - OUTPUT_KEYS
+    if unknown:
+        raise ConfigError(f"Unknown keys in [apps.{name}.output]: {', '.join(sorted(unknown))}")
+    _check_types(f"apps.{name}.output", value, OUTPUT_TYPES)
+    return OutputCapture(**value)
+
+
+def _check_types(section: str, values: dict, types: Dict[str, tuple]):
+    for key, expected in types.items():
+        if key not in values:
+            continue
+        value = values[key]
+        # bool is an int subclass, so TOML true/false must not pass for a number or vice versa
+        if isinstance(value, bool) != (expected is BOOLEAN) or not isinstance(value, expected):
+            raise ConfigError(f"[{section}] {key} must be {TYPE_NAMES[expected]}, got {value!r}")
+
+
+def build_hub(manifest: Manifest, control_socket: Optional[str] = None) -> TrayHub:
+    hub = TrayHub(manifest.tray_name, manifest.tray_title, manifest.backend, manifest.hotkey_backend,
+                  control_socket, sample_interval=manifest.sample_interval)
+    for app in manifest.apps.values():
+        hub.add_window(app.name, window_identifier=app.identifier, command=app.command, hotkey=app.hotkey,
+                       start_hidden=app.start_minimized, wait_time=app.wait, launch=False,
+                       freeze_after=app.freeze_after, throttle=app.throttle, scope=app.scope,
+                       restart=app.restart, capture=app.output)
+    return hub
+
+
+def launch_apps(hub: TrayHub, manifest: Manifest, max_workers: Optional[int] = None) -> Dict[str, float]:
+    start = time.perf_counter()
+    ready_at: Dict[str, float] = {}
+    waiting = {name: set(app.depends_on) for name, app in manifest.apps.items()}
+    running: Dict[Future, str] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or min(len(waiting), 16) or 1,
+                            thread_name_prefix="min2tray-launch") as pool:
+        while waiting or running:
+            for name in [name for name, dependencies in waiting.items() if not dependencies]:
+                del waiting[name]
+                running[pool.submit(hub.launch, name)] = name
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Failed to launch '{name}': {e}")
+                ready_at[name] = time.perf_counter() - start
+                for dependencies in waiting.values():
+                    dependencies.discard(name)
+
+    return ready_at
+
+
+def run_manifest(path: str, icon_path: Optional[str] = None, backend: Optional[str] = None,
+                 hotkey_backend: Optional[str] = None, control_socket: Optional[str] = None,
+                 sample_interval: Optional[float] = None):
+    manifest = load_manifest(path)
+    manifest.backend = backend or manifest.backend
+    manifest.hotkey_backend = hotkey_backend or manifest.hotkey_backend
+    manifest.sample_interval = sample_interval or manifest.sample_interval
+    hub = build_hub(manifest, control_socket)
+    hub.start_control()
+
+    ready_at = launch_apps(hub, manifest)
+    if ready_at:
+        slowest = max(ready_at, key=ready_at.get)
+        print(f"Started {len(ready_at)} app(s) in {ready_at[slowest]:.2f}s (last ready: {slowest})")
+
+    hub.start(icon_path or manifest.tray_icon)
@@ -0,0 +1,331 @@
+"""
+Local control socket for driving a running min2tray instance
+
+Requests are JSON lines such as ``{"cmd": "toggle", "window": "Firefox"}``; a
+plain ``toggle Firefox`` line is accepted too, so shell tools can use e.g.
+``echo toggle Firefox | socat - UNIX-CONNECT:$XDG_RUNTIME_DIR/min2tray.sock``.
+Every request gets one JSON line back: ``{"ok": true, "result": ...}`` or
+``{"ok": false, "error": "..."}``.
+"""
+
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from typing import Callable, Dict, List, Optional
+
+from .utils import ControlError, metrics
+
+COMMANDS = ("toggle", "show", "hide", "list", "stats", "open")
+MAX_REQUEST = 64 * 1024
+OPEN_KEYS = ("name", "window_title", "command", "hotkey", "start_hidden")
+
+
+def default_socket_path() -> Optional[str]:
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    path = os.environ.get("MIN2TRAY_SOCKET")
+    if path:
+        return path
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "min2tray.sock")
+    return os.path.join(os.environ.get("TMPDIR", "/tmp"), f"min2tray-{os.getuid()}.sock")
+
+
+class _Connection:
+
+    __slots__ = ("sock", "inbuf", "outbuf", "eof")
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.inbuf = bytearray()
+        self.outbuf = bytearray()
+        self.eof = False
+
+
+class ControlServer:
+
+    def __init__(self, target, path: Optional[str] = None):
+        self.target = target
+        self.path = path or default_socket_path()
+        self.handlers: Dict[str, Callable[[dict], object]] = {
+            "toggle": lambda request: self._window(request).toggle_window(),
+            "show": lambda request: self._window(request).show_window(),
+            "hide": lambda request: self._window(request).hide_window(),
+            "list": lambda request: self._list(),
+            "stats": lambda request: (self._window(request).window_stats() if request.get("window")
+                                      else self.target.stats()),
+            "open": self._open,
+        }
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._listener: Optional[socket.socket] = None
+        self._wake_r: Optional[socket.socket] = None
+        self._wake_w: Optional[socket.socket] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    def start(self):
+        if _is_listening(self.path):
+            raise ControlError(f"Another instance is already listening on {self.path}")
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(self.path)
+            os.chmod(self.path, 0o600)
+            listener.listen(16)
+            listener.setblocking(False)
+        except OSError as e:
+            listener.close()
+            raise ControlError(f"Failed to listen on {self.path}: {e}")
+
+        self._listener = listener
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(listener, selectors.EVENT_READ, None)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+        self._thread = threading.Thread(target=self._run, name="min2tray-control", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stopping = True
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        self._thread.join(timeout=2.0)
+        self._thread = None
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                for key, events in self._selector.select():
+                    if key.fileobj is self._listener:
+                        self._accept()
+                    elif key.fileobj is self._wake_r:
+                        self._stopping = True
+                    else:
+                        self._service(key.data, events)
+        finally:
+            self._close()
+
+    def _close(self):
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        self._wake_w.close()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+    def _accept(self):
+        while True:
+            try:
+                sock, _ = self._listener.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            sock.setblocking(False)
+            self._selector.register(sock, selectors.EVENT_READ, _Connection(sock))
+
+    def _service(self, connection: _Connection, events: int):
+        if events & selectors.EVENT_READ and not connection.eof:
+            try:
+                data = connection.sock.recv(4096)
+            except (BlockingIOError, InterruptedError):
+                data = None
+            except OSError:
+                data = b""
+
+            if data == b"":
+                # The client is done sending; answer what is left, then close once the replies are out
+                connection.eof = True
+                if connection.inbuf.strip():
+                    connection.outbuf += self.handle(bytes(connection.inbuf)) + b"\n"
+                connection.inbuf.clear()
+            elif data:
+                connection.inbuf += data
+                while b"\n" in connection.inbuf:
+                    line, _, rest = bytes(connection.inbuf).partition(b"\n")
+                    connection.inbuf = bytearray(rest)
+                    connection.outbuf += self.handle(line) + b"\n"
+                if len(connection.inbuf) > MAX_REQUEST:
+                    connection.outbuf += _encode({"ok": False, "error": "request too large"}) + b"\n"
+                    connection.inbuf.clear()
+
+        if connection.outbuf:
+            try:
+                sent = connection.sock.send(connection.outbuf)
+                del connection.outbuf[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(connection)
+                return
+
+        if connection.eof and not connection.outbuf:
+            self._drop(connection)
+            return
+        mask = (0 if connection.eof else selectors.EVENT_READ) | (selectors.EVENT_WRITE if connection.outbuf else 0)
+        self._selector.modify(connection.sock, mask, connection)
+
+    def _drop(self, connection: _Connection):
+        self._selector.unregister(connection.sock)
+        connection.sock.close()
+
+    def handle(self, line: bytes) -> bytes:
+        start = time.perf_counter()
+        try:
+            request = _parse(line)
+            handler = self.handlers.get(request.get("cmd"))
+            if handler is None:
+                raise ControlError(f"Unknown command '{request.get('cmd')}', expected one of {COMMANDS}")
+            response = {"ok": True, "result": handler(request)}
+        except ControlError as e:
+            response = {"ok": False, "error": str(e)}
+        except Exception as e:
+            response = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+
+        if metrics.enabled:
+            metrics.observe("control.request", time.perf_counter() - start)
+        return _encode(response)
+
+    def _window(self, request: dict):
+        windows = self.target.windows
+        name = request.get("window")
+        if name is None:
+            if len(windows) != 1:
+                raise ControlError(f"'window' is required, managed windows: {', '.join(windows)}")
+            return next(iter(windows.values()))
+        window = windows.get(name)
+        if window is None:
+            raise ControlError(f"Unknown window '{name}', managed windows: {', '.join(windows)}")
+        return window
+
+    def _open(self, request: dict) -> list:
+        open_window = getattr(self.target, "open_window", None)
+        if open_window is None:
+            raise ControlError("This instance cannot open windows, start it with --single-instance")
+        specs = request.get("windows")
+        if not isinstance(specs, list) or not all(isinstance(spec, dict) for spec in specs):
+            raise ControlError("'windows' must be a list of window specifications")
+        return [open_window(**{key: spec[key] for key in OPEN_KEYS if key in spec}) for spec in specs]
+
+    def _list(self) -> list:
+        return [
+            {
+                "name": name,
+                "bound": window.window_manager is not None,
+                "visible": window.window_manager.is_visible if window.window_manager else None,
+                "pid": window.process_manager.pid,
+                "running": window.process_manager.is_running(),
+            }
+            for name, window in self.target.windows.items()
+        ]
+
+
+def send_command(cmd: str, window: Optional[str] = None, path: Optional[str] = None,
+                 timeout: float = 2.0, **arguments) -> dict:
+    request = {"cmd": cmd, **arguments}
+    if window is not None:
+        request["window"] = window
+
+    path = path or default_socket_path()
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.settimeout(timeout)
+            client.connect(path)
+            client.sendall(_encode(request) + b"\n")
+            response = bytearray()
+            while not response.endswith(b"\n"):
+                chunk = client.recv(65536)
+                if not chunk:
+                    break
+                response += chunk
+    except OSError as e:
+        raise ControlError(f"Failed to reach min2tray at {path}: {e}")
+
+    if not response:
+        raise ControlError(f"No response from min2tray at {path}")
+    return json.loads(response)
+
+
+class InstanceLock:
+
+    def __init__(self, socket_path: str):
+        self.path = f"{socket_path}.lock"
+        self._fd: Optional[int] = None
+
+    def acquire(self) -> bool:
+        import fcntl
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+
+def forward_windows(windows: List[dict], path: str, timeout: float = 10.0) -> list:
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            response = send_command("open", path=path, windows=windows)
+            break
+        except ControlError:
+            if time.monotonic() >= deadline:
+                raise
+            time.sleep(0.05)
+
+    if not response.get("ok"):
+        raise ControlError(response.get("error"))
+    return response["result"]
+
+
+def _parse(line: bytes) -> dict:
+    line = line.strip()
+    if line.startswith(b"{"):
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            raise ControlError(f"Invalid JSON: {e}")
+        if not isinstance(request, dict):
+            raise ControlError("Request must be a JSON object")
+        return request
+
+    cmd, _, window = line.decode("utf-8", "replace").partition(" ")
+    request = {"cmd": cmd}
+    if window.strip():
+        request["window"] = window.strip()
+    return request
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":"), default=str).encode()
+
+
+def _is_listening(path: str) -> bool:
+    if not os.path.exists(path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+            return True
+        except OSError:
+            return False
@@ -1,92 +1,323 @@
+import functools
+import re
 import threading
-from typing import Optional, Union
-
-from .window_manager import WindowIdentifier
-from .tray import TrayIcon
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .control import ControlServer
+from .executor import WindowAction, WindowActionExecutor
+from .freezer import ProcessFreezer
+from .throttle import ProcessThrottle, ThrottlePolicy
+from .window_manager import WindowIdentifier, WindowRegistry
+from .tray import MenuEntry, TrayIcon, menu_action
 from .window import FlexibleWindowManager
-from .hotkey import HotkeyManager
-from .process import ProcessManager, ProcessEvent
+from .hotkey import HotkeyManager, normalize_combination
+from .output import OutputCapture
+from .sampler import ResourceSample, ResourceSampler
+from .process import ProcessManager, ProcessEvent, RestartPolicy
+from .utils import ControlError, WindowNotFoundError, metrics
+from .utils.shutdown import ShutdownEvent
 
 
-class WindowToTray:
+TOOLTIP_APPS = 5
 
-    def __init__(self, window_title: Optional[str] = None,
-                 window_identifier: Optional[WindowIdentifier] = None,
-                 tray_name: str = "Min2Tray", tray_title: str = "Application"):
-        if window_identifier:
-            self.window_identifier = window_identifier
-        elif window_title:
-            self.window_identifier = WindowIdentifier(title=window_title)
-        else:
-            raise ValueError("Either window_title or window_identifier must be provided")
 
+class ManagedWindow:
+
+    def __init__(self, window_identifier: WindowIdentifier, name: str = "Application",
+                 backend: Optional[str] = None,
+                 on_state_change: Optional[Callable[["ManagedWindow"], None]] = None,
+                 freeze_after: Optional[float] = None, throttle: Optional[ThrottlePolicy] = None,
+                 scope: Optional[str] = None, restart: Optional[RestartPolicy] = None,
+                 capture: Optional[OutputCapture] = None, stop_on_exit: bool = True):
+        self.window_identifier = window_identifier
+        self.name = name
+        self.backend = backend
         self.window_manager = None
-        self.tray_icon = TrayIcon(tray_name, tray_title)
-        self.hotkey_manager = HotkeyManager()
-        self.process_manager = ProcessManager()
+        self.process_manager = ProcessManager(scope, name, restart=restart, capture=capture)
+        for event, hook in ((ProcessEvent.STARTED, self._on_process_started),
+                            (ProcessEvent.EXITED, self._on_process_exited),
+                            (ProcessEvent.ERROR, self._on_process_error),
+                            (ProcessEvent.RESTARTING, self._on_process_restarting),
+                            (ProcessEvent.RESTARTED, self._on_process_restarted)):
+            self.process_manager.add_hook(event, hook)
+        self.executor = WindowActionExecutor(self._perform_action, name=name)
+        # A hub keeps exited windows around to be launched again, so they must keep a working executor
+        self.stop_on_exit = stop_on_exit
+        self.on_state_change = on_state_change
+        self.freezer = ProcessFreezer(freeze_after) if freeze_after is not None else None
+        self.throttle = ProcessThrottle(throttle) if throttle is not None else None
+        self._launching = False
+        self._hidden_before_restart = False
+        self.last_recovery_seconds: Optional[float] = None
+        self.sampler: Optional[ResourceSampler] = None
+
+    def tray_state(self) -> str:
+        if self._launching:
+            return "busy"
+        if self.process_manager.process is not None and not self.process_manager.is_running():
+            return "exited"
+        if self.window_manager is not None and not self.window_manager.is_visible:
+            return "hidden"
+        return "visible"
+
+    def tracked_pid(self) -> Optional[int]:
+        """Root of the app's process tree: the command min2tray started, or the identifier's ``process_id``."""
+        return self.process_manager.pid or self.window_identifier.process_id
+
+    def watch_resources(self, sampler: ResourceSampler,
+                        callback: Optional[Callable[[ResourceSample], None]] = None):
+        self.sampler = sampler
+        sampler.watch(self, self.tracked_pid, callback)
+
+    def resource_sample(self) -> Optional[ResourceSample]:
+        return self.sampler.sample(self) if self.sampler else None
+
+    def _state_changed(self):
+        if self.freezer is not None or self.throttle is not None:
+            pid = self.tracked_pid()
+            if self.tray_state() == "hidden":
+                if self.throttle is not None:
+                    self.throttle.apply(pid)
+                if self.freezer is not None:
+                    self.freezer.schedule(pid)
+            else:
+                self._release_resources()
+        if self.on_state_change:
+            self.on_state_change(self)
 
-        self.tray_icon.add_menu_item("Toggle Window", self._toggle_window, default=True)
+    def output_entries(self, lines: int = 15) -> List[MenuEntry]:
+        """Menu labels for the last ``lines`` lines the app printed."""
+        capture = self.process_manager.capture
+        tail = capture.tail(lines) if capture else []
+        return [MenuEntry(_menu_label(line)) for line in tail] or [MenuEntry("(no output)")]
+
+    def _release_resources(self):
+        if self.freezer is not None:
+            self.freezer.thaw()
+        if self.throttle is not None:
+            self.throttle.restore()
+
+    def toggle_window(self):
+        self.executor.submit(WindowAction.TOGGLE)
+
+    _toggle_window = toggle_window
+
+    def show_window(self):
+        self.executor.submit(WindowAction.SHOW)
+
+    def hide_window(self):
+        self.executor.submit(WindowAction.HIDE)
+
+    def _perform_action(self, action: WindowAction):
+        if self.window_manager is None:
+            try:
+                self.setup_window()
+            except WindowNotFoundError as e:
+                print(f"Window '{self.name}' is not available: {e}")
+                return
 
-    def _toggle_window(self):
         try:
-            if self.window_manager:
-                self.window_manager.toggle()
+            self._apply(action)
         except Exception as e:
-            print(f"Error toggling window: {e}")
+            print(f"Error performing '{action.value}' on window: {e}")
+            if metrics.enabled:
+                metrics.incr("window.recoveries")
             try:
                 self.setup_window()
                 if self.window_manager:
-                    self.window_manager.toggle()
+                    self._apply(action)
             except Exception as e2:
                 print(f"Failed to recover window manager: {e2}")
+        self._state_changed()
 
-    def setup_window(self, window_identifier: Optional[WindowIdentifier] = None):
-        identifier = window_identifier or self.window_identifier
-        self.window_manager = FlexibleWindowManager(identifier)
-
-    def register_hotkey(self, key_combination: str):
-        self.hotkey_manager.register(key_combination, self._toggle_window)
+    def _apply(self, action: WindowAction):
+        if action is WindowAction.SHOW or action is WindowAction.TOGGLE and not self.window_manager.is_visible:
+            self._release_resources()
 
-    def run_command(self, command: Union[str, list], wait_time: float = 1.0):
-        self.process_manager.add_hook(ProcessEvent.STARTED, self._on_process_started)
-        self.process_manager.add_hook(ProcessEvent.EXITED, self._on_process_exited)
-        self.process_manager.add_hook(ProcessEvent.ERROR, self._on_process_error)
+        if action is WindowAction.TOGGLE:
+            self.window_manager.toggle()
+        elif action is WindowAction.SHOW:
+            self.window_manager.show()
+        else:
+            self.window_manager.hide()
 
-        success = self.process_manager.run_command(command, wait_time)
+    def setup_window(self, window_identifier: Optional[WindowIdentifier] = None, timeout: float = 0):
+        identifier = window_identifier or self.window_identifier
+        self.window_manager = FlexibleWindowManager(identifier, self.backend, timeout)
+
+    def window_stats(self) -> dict:
+        sample = self.resource_sample()
+        return {
+            "window": {
+                "identifier": repr(self.window_identifier),
+                "bound": self.window_manager is not None,
+                "visible": self.window_manager.is_visible if self.window_manager else None,
+                "state": self.tray_state(),
+            },
+            "process": {
+                **self.process_manager.stats(),
+                "last_recovery_ms": (self.last_recovery_seconds * 1000
+                                     if self.last_recovery_seconds is not None else None),
+            },
+            "actions": self.executor.stats(),
+            "resources": sample.as_dict() if sample else None,
+            "freeze": self.freezer.stats() if self.freezer else None,
+            "throttle": self.throttle.stats() if self.throttle else None,
+        }
+
+    def run_command(self, command: Union[str, list], wait_time: float = 10.0):
+        self._launching = True
+        self._state_changed()
+        try:
+            success = self.process_manager.run_command(command, wait_time, ready_check=self._wait_for_window)
+        finally:
+            self._launching = False
+            self._state_changed()
         if not success:
             print("Failed to start process")
 
+    def _wait_for_window(self, process, timeout: float) -> bool:
+        registry = WindowRegistry.get()
+        manager = registry.acquire(self.window_identifier, self.backend)
+        # The reaper wakes the wait as soon as the process exits, so it never has to poll for that
+        exited = threading.Event()
+        reaper = self.process_manager.reaper
+        reaper.watch(process, lambda _: exited.set())
+        try:
+            return registry.bind(manager, timeout, cancelled=lambda: process.poll() is not None, owner=process.pid,
+                                 wakeup=exited)
+        finally:
+            reaper.unwatch(process)
+
     def _on_process_started(self, process):
         print(f"Process started with PID: {process.pid}")
 
     def _on_process_exited(self, return_code):
         print(f"Process exited with return code: {return_code}")
-        self.stop()
+        self._launching = False
+        self._state_changed()
+        self._exited()
 
     def _on_process_error(self, exception):
         print(f"Process error: {exception}")
-        self.stop()
+        self._launching = False
+        self._state_changed()
+        self._exited()
+
+    def _exited(self):
+        if self.stop_on_exit:
+            self.stop()
+        else:
+            self._release_resources()
+
+    def _on_process_restarting(self, return_code, delay):
+        self._hidden_before_restart = self.window_manager is not None and not self.window_manager.is_visible
+        # Backends that cannot watch for destroyed windows would keep the dead app's handle as valid
+        registry = WindowRegistry.get()
+        registry.invalidate(registry.acquire(self.window_identifier, self.backend))
+        self._launching = True
+        self._state_changed()
+
+    def _on_process_restarted(self, process, downtime):
+        start = time.perf_counter()
+        try:
+            if self.window_manager is None:
+                self.setup_window()
+            else:
+                self.window_manager.rebind()
+            if self._hidden_before_restart:
+                self.executor.submit(WindowAction.HIDE)
+                self.executor.drain(5.0)
+        except WindowNotFoundError as e:
+            print(f"Window '{self.name}' not found after restart: {e}")
+        finally:
+            self._launching = False
+            self._state_changed()
+
+        self.last_recovery_seconds = downtime + time.perf_counter() - start
+        if metrics.enabled:
+            metrics.observe("window.recovery", self.last_recovery_seconds)
+        print(f"Restarted '{self.name}' (PID {process.pid}) in {self.last_recovery_seconds * 1000:.0f} ms")
+
+    def stop(self):
+        self.executor.shutdown()
+        self._release_resources()
+        if self.sampler is not None:
+            self.sampler.unwatch(self)
+
+        try:
+            self.process_manager.terminate()
+        except Exception as e:
+            print(f"Error terminating process: {e}")
+
+
+class WindowToTray(ManagedWindow):
+
+    def __init__(self, window_title: Optional[str] = None,
+                 window_identifier: Optional[WindowIdentifier] = None,
+                 tray_name: str = "Min2Tray", tray_title: str = "Application",
+                 backend: Optional[str] = None, hotkey_backend: Optional[str] = None,
+                 control_socket: Optional[str] = None, freeze_after: Optional[float] = None,
+                 throttle: Optional[ThrottlePolicy] = None, scope: Optional[str] = None,
+                 restart: Optional[RestartPolicy] = None, capture: Optional[OutputCapture] = None,
+                 sample_interval: Optional[float] = None):
+        if window_identifier:
+            identifier = window_identifier
+        elif window_title:
+            identifier = WindowIdentifier(title=window_title)
+        else:
+            raise ValueError("Either window_title or window_identifier must be provided")
+
+        super().__init__(identifier, tray_title, backend, on_state_change=self._update_tray_state,
+                         freeze_after=freeze_after, throttle=throttle, scope=scope, restart=restart,
+                         capture=capture)
+        self.tray_icon = TrayIcon(tray_name, tray_title)
+        self.tray_title = tray_title
+        self.hotkey_manager = HotkeyManager(hotkey_backend)
+        self.control_socket = control_socket
+        self.control_server: Optional[ControlServer] = None
+        self.sample_interval = sample_interval
+        self._shutdown = ShutdownEvent()
+        self._stopping = False
+
+        self.tray_icon.add_menu_item("Toggle Window", self._toggle_window, default=True)
+        if capture is not None:
+            self.tray_icon.add_submenu("Recent Output", self.output_entries)
+
+    @property
+    def windows(self) -> Dict[str, ManagedWindow]:
+        return {self.name: self}
+
+    def stats(self) -> dict:
+        return {
+            **self.window_stats(),
+            "hotkeys": list(self.hotkey_manager.hotkeys),
+            "metrics": metrics.snapshot() if metrics.enabled else None,
+        }
+
+    def register_hotkey(self, key_combination: str):
+        self.hotkey_manager.register(key_combination, self._toggle_window)
+
+    def _update_tray_state(self, window: ManagedWindow):
+        self.tray_icon.set_state(window.tray_state())
+        if window.process_manager.capture is not None:
+            self.tray_icon.update_menu()
+
+    def _update_tooltip(self, sample: ResourceSample):
+        self.tray_icon.set_title(f"{self.tray_title}\n{sample.summary()}")
 
     def start(self, icon_path: Optional[str] = None, start_hidden: bool = False):
         try:
             if start_hidden and self.window_manager:
                 self.window_manager.hide()
+            self._state_changed()
+            if self.sample_interval:
+                self.watch_resources(_shared_sampler(self.sample_interval), self._update_tooltip)
 
-            tray_thread = threading.Thread(target=self.tray_icon.start, args=(icon_path,))
-            tray_thread.daemon = True
-            tray_thread.start()
-
-            if self.process_manager.is_running():
-                self.process_manager.wait()
-            else:
-                try:
-                    while True:
-                        tray_thread.join(timeout=1.0)
-                        if not tray_thread.is_alive():
-                            break
-                except KeyboardInterrupt:
-                    print("\nReceived interrupt signal, stopping...")
-                    self.stop()
+            self.control_server = _start_control(self, self.control_socket)
+            _start_tray(self.tray_icon, icon_path, self)
+            _wait_for_shutdown(self)
 
         except Exception as e:
             print(f"Error during startup: {e}")
@@ -94,6 +325,13 @@ class WindowToTray:
             raise
 
     def stop(self):
+        self._stopping = True
+        self.executor.shutdown()
+        self._release_resources()
+        if self.sampler is not None:
+            self.sampler.unwatch(self)
+        _stop_control(self.control_server)
+
         try:
             self.tray_icon.stop()
         except Exception as e:
@@ -108,13 +346,370 @@ class WindowToTray:
             self.process_manager.terminate()
         except Exception as e:
             print(f"Error terminating process: {e}")
+        self._shutdown.set()
+
+
+class TrayHub:
+
+    def __init__(self, tray_name: str = "Min2Tray", tray_title: str = "Min2Tray",
+                 backend: Optional[str] = None, hotkey_backend: Optional[str] = None,
+                 control_socket: Optional[str] = None, menu_group_size: int = 20,
+                 sample_interval: Optional[float] = None):
+        self.backend = backend
+        self.windows: Dict[str, ManagedWindow] = {}
+        self.tray_icon = TrayIcon(tray_name, tray_title)
+        self.tray_title = tray_title
+        self.sampler = _shared_sampler(sample_interval) if sample_interval else None
+        self.menu_group_size = menu_group_size
+        self._window_entries: Dict[str, MenuEntry] = {}
+        self._group_entries: Dict[Tuple[str, ...], MenuEntry] = {}
+        self.hotkey_manager = HotkeyManager(hotkey_backend)
+        self._hotkeys: Dict[str, str] = {}
+        self._start_hidden: List[str] = []
+        self._pending: Dict[str, tuple] = {}
+        self._commands: Dict[str, tuple] = {}
+        self.control_socket = control_socket
+        self.control_server: Optional[ControlServer] = None
+        self._shutdown = ShutdownEvent()
+        self._stopping = False
+
+    def add_window(self, name: str, window_identifier: Optional[WindowIdentifier] = None,
+                   window_title: Optional[str] = None, command: Optional[Union[str, list]] = None,
+                   hotkey: Optional[str] = None, start_hidden: bool = False,
+                   wait_time: float = 10.0, launch: bool = True,
+                   freeze_after: Optional[float] = None, throttle: Optional[ThrottlePolicy] = None,
+                   scope: Optional[str] = None, restart: Optional[RestartPolicy] = None,
+                   capture: Optional[OutputCapture] = None) -> ManagedWindow:
+        if name in self.windows:
+            raise ValueError(f"A window named '{name}' is already managed")
+        if hotkey:
+            # The hub registers every window under one owner, so a shared hotkey would replace the first binding
+            owner = self.hotkey_owner(hotkey)
+            if owner is not None:
+                raise ValueError(f"Hotkey '{hotkey}' is already used by '{owner}'")
+        if not window_identifier:
+            if not window_title:
+                raise ValueError("Either window_title or window_identifier must be provided")
+            window_identifier = WindowIdentifier(title=window_title)
+
+        window = ManagedWindow(window_identifier, name, self.backend, on_state_change=self._update_tray_state,
+                               freeze_after=freeze_after, throttle=throttle, scope=scope, restart=restart,
+                               capture=capture, stop_on_exit=False)
+        self.windows[name] = window
+        if self.sampler is not None:
+            window.watch_resources(self.sampler, self._update_tooltip)
+
+        if command:
+            window.process_manager.add_hook(ProcessEvent.EXITED, functools.partial(self._on_window_exited, name))
+            window.process_manager.add_hook(ProcessEvent.ERROR, functools.partial(self._on_window_exited, name))
+            self._commands[name] = (command, wait_time)
+            self._pending[name] = (command, wait_time)
+
+        if hotkey:
+            self.hotkey_manager.register(hotkey, window.toggle_window)
+            self._hotkeys[name] = hotkey
+
+        if start_hidden:
+            self._start_hidden.append(name)
+
+        if launch and name in self._pending:
+            self.launch(name)
+        return window
+
+    def launch(self, name: str) -> bool:
+        pending = self._pending.pop(name, None)
+        if pending is None:
+            return False
+        command, wait_time = pending
+        window = self.windows[name]
+        window.run_command(command, wait_time)
+        return window.process_manager.is_running()
+
+    def relaunch(self, name: str) -> bool:
+        """Queue the command of a window whose app has exited and bind its hotkey again; ``launch`` starts it."""
+        window = self.windows[name]
+        command = self._commands.get(name)
+        if (command is None or name in self._pending or window.tray_state() == "busy"
+                or window.process_manager.is_running()):
+            return False
+        self._pending[name] = command
+        hotkey = self._hotkeys.get(name)
+        if hotkey and hotkey not in self.hotkey_manager.hotkeys:
+            self.hotkey_manager.register(hotkey, window.toggle_window)
+        return True
+
+    def hotkey_owner(self, hotkey: str) -> Optional[str]:
+        combination = normalize_combination(hotkey)
+        for name, other in self._hotkeys.items():
+            if normalize_combination(other) == combination:
+                return name
+        return None
+
+    def launch_pending(self, max_workers: Optional[int] = None):
+        """Launch every window added with ``launch=False`` at the same time rather than one after another."""
+        names = list(self._pending)
+        if not names:
+            return
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=max_workers or min(len(names), 16),
+                                thread_name_prefix="min2tray-launch") as pool:
+            futures = {name: pool.submit(self.launch, name) for name in names}
+            for name, future in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Failed to launch '{name}': {e}")
+
+    def start_control(self):
+        """Open the control socket early, so other instances can forward to this one while apps launch."""
+        if self.control_server is None:
+            self.control_server = _start_control(self, self.control_socket)
+
+    def setup_windows(self, timeout: float = 0):
+        pending = [window for window in self.windows.values() if window.window_manager is None]
+        WindowRegistry.get().bind_many([window.window_identifier for window in pending], self.backend)
+        for window in pending:
+            try:
+                window.setup_window(timeout=timeout)
+            except WindowNotFoundError:
+                print(f"Window '{window.name}' not found yet")
+
+    def toggle(self, name: str):
+        self.windows[name].toggle_window()
+
+    def show(self, name: str):
+        self.windows[name].show_window()
+
+    def hide(self, name: str):
+        self.windows[name].hide_window()
+
+    def show_all(self):
+        for name in self.windows:
+            self.show(name)
+
+    def hide_all(self):
+        for name in self.windows:
+            self.hide(name)
+
+    def hide_windows(self, names: List[str]):
+        WindowRegistry.get().hide_many(
+            self.windows[name].window_manager.manager for name in names if self.windows[name].window_manager
+        )
+        for name in names:
+            self.windows[name]._state_changed()
+
+    def tray_state(self) -> str:
+        states = {window.tray_state() for window in self.windows.values()}
+        for state in ("busy", "exited"):
+            if state in states:
+                return state
+        return "hidden" if states == {"hidden"} else "visible"
+
+    def _update_tray_state(self, window: Optional[ManagedWindow] = None):
+        self.tray_icon.set_state(self.tray_state())
+        if window is not None and window.process_manager.capture is not None:
+            self.tray_icon.update_menu()
+
+    def _update_tooltip(self, *_):
+        samples = [(name, window.resource_sample()) for name, window in list(self.windows.items())]
+        samples = sorted(((name, sample) for name, sample in samples if sample),
+                         key=lambda item: item[1].memory, reverse=True)
+        lines = [f"{name}: {sample.summary()}" for name, sample in samples[:TOOLTIP_APPS]]
+        self.tray_icon.set_title("\n".join([self.tray_title, *lines]))
+
+    def _on_window_exited(self, name: str, *_):
+        # The hotkey stays reserved for the window, ``relaunch`` binds it again
+        hotkey = self._hotkeys.get(name)
+        if hotkey:
+            self.hotkey_manager.unregister(hotkey)
+        self.tray_icon.update_menu()
+
+    def open_window(self, name: str, window_title: Optional[str] = None,
+                    command: Optional[Union[str, list]] = None, hotkey: Optional[str] = None,
+                    start_hidden: bool = False) -> str:
+        if name in self.windows:
+            if not self.relaunch(name):
+                self.toggle(name)
+                return "toggled"
+            result = "relaunched"
+        else:
+            self.add_window(name, window_title=window_title or name, command=command, hotkey=hotkey,
+                            start_hidden=start_hidden, launch=False)
+            result = "added"
+        self.tray_icon.update_menu()
+        threading.Thread(target=self._open, args=(name,), name=f"min2tray-open-{name}", daemon=True).start()
+        return result
+
+    def _open(self, name: str):
+        self.launch(name)
+        self.setup_windows()
+        if name in self._start_hidden:
+            self.hide_windows([name])
+        self.tray_icon.update_menu()
+
+    def _window_entry(self, name: str) -> MenuEntry:
+        entry = self._window_entries.get(name)
+        if entry is None:
+            window = self.windows[name]
+            items = [
+                menu_action(label, _bind_action(method, name))
+                for label, method in (("Toggle", self.toggle), ("Show", self.show), ("Hide", self.hide))
+            ]
+            if window.process_manager.capture is not None:
+                items.append(MenuEntry("Recent Output", items=window.output_entries))
+            entry = MenuEntry(_window_label(name, window), items=items)
+            self._window_entries[name] = entry
+        return entry
+
+    def _window_menu(self) -> List[MenuEntry]:
+        names = list(self.windows)
+        if len(names) <= self.menu_group_size:
+            return [self._window_entry(name) for name in names]
+
+        names.sort(key=_natural_key)
+        groups = {}
+        for start in range(0, len(names), self.menu_group_size):
+            chunk = tuple(names[start:start + self.menu_group_size])
+            entry = self._group_entries.get(chunk)
+            if entry is None:
+                entry = MenuEntry(f"{chunk[0]} - {chunk[-1]}",
+                                  items=functools.partial(map, self._window_entry, chunk))
+            groups[chunk] = entry
+        self._group_entries = groups
+        return list(groups.values())
+
+    def _build_menu(self):
+        self.tray_icon.add_section(self._window_menu)
+        self.tray_icon.add_menu_item("Show All", self.show_all)
+        self.tray_icon.add_menu_item("Hide All", self.hide_all)
+
+    def stats(self) -> dict:
+        return {
+            "windows": {name: window.window_stats() for name, window in self.windows.items()},
+            "state": self.tray_state(),
+            "hotkeys": dict(self._hotkeys),
+            "metrics": metrics.snapshot() if metrics.enabled else None,
+        }
+
+    def start(self, icon_path: Optional[str] = None):
+        try:
+            self.start_control()
+            self.launch_pending()
+            self.setup_windows()
+            self.hide_windows(self._start_hidden)
+
+            self._build_menu()
+            _start_tray(self.tray_icon, icon_path, self)
+            _wait_for_shutdown(self)
+
+        except Exception as e:
+            print(f"Error during startup: {e}")
+            self.stop()
+            raise
+
+    def stop(self):
+        self._stopping = True
+        _stop_control(self.control_server)
+
+        try:
+            self.tray_icon.stop()
+        except Exception as e:
+            print(f"Error stopping tray icon: {e}")
+
+        try:
+            self.hotkey_manager.stop()
+        except Exception as e:
+            print(f"Error stopping hotkey manager: {e}")
+
+        for window in self.windows.values():
+            window.stop()
+        self._shutdown.set()
+
+
+def _start_tray(tray_icon: TrayIcon, icon_path: Optional[str], owner):
+    def run():
+        try:
+            tray_icon.start(icon_path)
+        finally:
+            if not owner._stopping:
+                owner._shutdown.set("tray closed")
+
+    threading.Thread(target=run, name="min2tray-tray", daemon=True).start()
+
+
+def _wait_for_shutdown(owner):
+    """Sleep until the owner stopped itself, its tray closed or SIGINT/SIGTERM arrived; then stop it."""
+    reason = owner._shutdown.wait()
+    if reason == "stopped":
+        return
+    if reason.startswith("SIG"):
+        print(f"\nReceived {reason}, stopping...")
+    owner.stop()
+
+
+def _shared_sampler(interval: float) -> ResourceSampler:
+    sampler = ResourceSampler.get()
+    sampler.interval = interval
+    return sampler
+
+
+def _start_control(target, path: Optional[str]) -> Optional[ControlServer]:
+    if not path:
+        return None
+    server = ControlServer(target, path)
+    try:
+        server.start()
+    except ControlError as e:
+        print(f"Warning: Control socket disabled: {e}")
+        return None
+    return server
+
+
+def _stop_control(server: Optional[ControlServer]):
+    if server:
+        try:
+            server.stop()
+        except Exception as e:
+            print(f"Error stopping control socket: {e}")
+
+
+def _bind_action(method, name: str):
+    def action():
+        method(name)
+    return action
+
+
+def _natural_key(name: str) -> list:
+    return [int(part) if part.isdigit() else part.lower() for part in re.split(r"(\d+)", name)]
+
+
+def _menu_label(line: str, width: int = 80) -> str:
+    line = line.expandtabs(4).strip() or " "
+    return line if len(line) <= width else line[:width - 3] + "..."
+
+
+def _window_label(name: str, window: ManagedWindow):
+    def label(item):
+        if window.process_manager.process is not None and not window.process_manager.is_running():
+            return f"{name} (exited)"
+        return name
+    return label
 
 
 def minimize_to_tray(window_title: str, command: Optional[Union[str, list]] = None,
                     icon_path: Optional[str] = None, hotkey: Optional[str] = None,
                     start_hidden: bool = False, tray_name: str = "Min2Tray",
-                    tray_title: str = "Application"):
-    app = WindowToTray(window_title=window_title, tray_name=tray_name, tray_title=tray_title)
+                    tray_title: str = "Application", backend: Optional[str] = None,
+                    hotkey_backend: Optional[str] = None, control_socket: Optional[str] = None,
+                    freeze_after: Optional[float] = None,
+                    throttle: Optional[ThrottlePolicy] = None, scope: Optional[str] = None,
+                    restart: Optional[RestartPolicy] = None, capture: Optional[OutputCapture] = None,
+                    sample_interval: Optional[float] = None):
+    app = WindowToTray(window_title=window_title, tray_name=tray_name, tray_title=tray_title,
+                       backend=backend, hotkey_backend=hotkey_backend, control_socket=control_socket,
+                       freeze_after=freeze_after, throttle=throttle, scope=scope, restart=restart,
+                       capture=capture, sample_interval=sample_interval)
 
     if command:
         app.run_command(command)
@@ -133,8 +728,19 @@ def minimize_to_tray_flexible(window_identifier: WindowIdentifier,
                              hotkey: Optional[str] = None,
                              start_hidden: bool = False,
                              tray_name: str = "Min2Tray",
-                             tray_title: str = "Application"):
-    app = WindowToTray(window_identifier=window_identifier, tray_name=tray_name, tray_title=tray_title)
+                             tray_title: str = "Application",
+                             backend: Optional[str] = None,
+                             hotkey_backend: Optional[str] = None,
+                             control_socket: Optional[str] = None,
+                             freeze_after: Optional[float] = None,
+                             throttle: Optional[ThrottlePolicy] = None, scope: Optional[str] = None,
+                             restart: Optional[RestartPolicy] = None,
+                             capture: Optional[OutputCapture] = None,
+                             sample_interval: Optional[float] = None):
+    app = WindowToTray(window_identifier=window_identifier, tray_name=tray_name, tray_title=tray_title,
+                       backend=backend, hotkey_backend=hotkey_backend, control_socket=control_socket,
+                       freeze_after=freeze_after, throttle=throttle, scope=scope, restart=restart,
+                       capture=capture, sample_interval=sample_interval)
 
     if command:
         app.run_command(command)
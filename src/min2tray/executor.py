@@ -0,0 +1,106 @@
+import threading
+import time
+from collections import deque
+from enum import Enum
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .utils import metrics
+
+
+class WindowAction(Enum):
+    TOGGLE = "toggle"
+    SHOW = "show"
+    HIDE = "hide"
+
+
+class WindowActionExecutor:
+
+    def __init__(self, perform: Callable[[WindowAction], None], name: str = "window",
+                 idle_timeout: float = 5.0, history: int = 256):
+        self._perform = perform
+        self.name = name
+        self.idle_timeout = idle_timeout
+        self._pending: Deque[Tuple[WindowAction, float]] = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._busy = False
+        self._closed = False
+        self.latencies: Deque[Tuple[str, float]] = deque(maxlen=history)
+        self.completed = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def submit(self, action: WindowAction) -> None:
+        now = time.perf_counter()
+        with self._condition:
+            if self._closed:
+                return
+
+            if action is WindowAction.TOGGLE and self._pending and self._pending[-1][0] is WindowAction.TOGGLE:
+                self._pending.pop()
+                self.coalesced += 2
+                if metrics.enabled:
+                    metrics.incr("action.coalesced", 2)
+            elif action is not WindowAction.TOGGLE:
+                self.coalesced += len(self._pending)
+                self._pending.clear()
+                self._pending.append((action, now))
+            else:
+                self._pending.append((action, now))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=f"min2tray-actions-{self.name}",
+                                                daemon=True)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._pending:
+                    self._busy = False
+                    self._condition.notify_all()
+                    self._condition.wait(self.idle_timeout)
+                    if not self._pending:
+                        self._thread = None
+                        return
+                action, enqueued = self._pending.popleft()
+                self._busy = True
+
+            try:
+                self._perform(action)
+            except Exception as e:
+                self.failed += 1
+                print(f"Window action '{action.value}' failed: {e}")
+
+            latency = time.perf_counter() - enqueued
+            self.latencies.append((action.value, latency))
+            self.completed += 1
+            if metrics.enabled:
+                metrics.observe(f"action.{action.value}", latency)
+
+    def drain(self, timeout: Optional[float] = None) -> bool:
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._pending and not self._busy, timeout)
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            self._pending.clear()
+            self._condition.notify_all()
+
+    def stats(self) -> Dict[str, object]:
+        samples: List[float] = sorted(latency for _, latency in list(self.latencies))
+        result: Dict[str, object] = {
+            "completed": self.completed,
+            "coalesced": self.coalesced,
+            "failed": self.failed,
+            "pending": len(self._pending),
+        }
+        if samples:
+            result.update({
+                "latency_p50_ms": samples[len(samples) // 2] * 1000,
+                "latency_p95_ms": samples[max(int(len(samples) * 0.95) - 1, 0)] * 1000,
+                "latency_max_ms": samples[-1] * 1000,
+            })
+        return result
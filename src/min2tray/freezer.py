@@ -0,0 +1,194 @@
+"""
+Suspend the process tree of a hidden application
+
+After a grace period a hidden app is frozen, through the cgroup v2 freezer
+when it runs in a scope of its own and by suspending every process of its
+tree (SIGSTOP/SIGCONT on POSIX) otherwise. It is thawed before its window is
+shown again. The CPU time saved is estimated from the rate the app used while
+hidden but not yet frozen.
+"""
+
+import threading
+import time
+from typing import List, Optional
+
+from .utils import metrics
+from .utils.cgroup import own_scope, write_value
+
+FREEZE_METHODS = ("cgroup", "signal")
+
+
+class ProcessFreezer:
+
+    def __init__(self, grace: float = 10.0, method: Optional[str] = None):
+        if method is not None and method not in FREEZE_METHODS:
+            raise ValueError(f"Unknown freeze method '{method}', expected one of {FREEZE_METHODS}")
+        self.grace = grace
+        self.method = method
+        self.freezes = 0
+        self.frozen_seconds = 0.0
+        self.cpu_saved_seconds = 0.0
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._pid: Optional[int] = None
+        self._hidden_at: Optional[tuple] = None
+        self._frozen: Optional[_FrozenTree] = None
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen is not None
+
+    def schedule(self, pid: Optional[int]):
+        """Freeze ``pid`` and its descendants once the grace period passes, unless thawed first."""
+        if pid is None:
+            return
+        with self._lock:
+            if self._frozen is not None or (self._timer is not None and self._pid == pid):
+                return
+            self._cancel()
+            self._pid = pid
+            self._hidden_at = (time.monotonic(), _tree_cpu_seconds(pid))
+            self._timer = threading.Timer(self.grace, self._freeze, args=(pid,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def thaw(self) -> bool:
+        with self._lock:
+            self._cancel()
+            frozen, self._frozen = self._frozen, None
+        if frozen is None:
+            return False
+
+        frozen.thaw()
+        duration = time.monotonic() - frozen.since
+        self.frozen_seconds += duration
+        self.cpu_saved_seconds += frozen.cpu_rate * duration
+        if metrics.enabled:
+            metrics.observe("freeze.duration", duration)
+        return True
+
+    def stats(self) -> dict:
+        frozen = self._frozen
+        current = time.monotonic() - frozen.since if frozen else 0.0
+        return {
+            "frozen": frozen is not None,
+            "method": frozen.method if frozen else None,
+            "freezes": self.freezes,
+            "frozen_seconds": self.frozen_seconds + current,
+            "cpu_saved_seconds": self.cpu_saved_seconds + (frozen.cpu_rate * current if frozen else 0.0),
+        }
+
+    def _cancel(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _freeze(self, pid: int):
+        with self._lock:
+            if self._timer is None or self._pid != pid:
+                return
+            self._timer = None
+            hidden_since, hidden_cpu = self._hidden_at
+            now = time.monotonic()
+            cpu_rate = max(_tree_cpu_seconds(pid) - hidden_cpu, 0.0) / max(now - hidden_since, 1e-6)
+
+            frozen = None
+            if self.method in (None, "cgroup"):
+                frozen = _CgroupFreeze.freeze(pid)
+            if frozen is None and self.method in (None, "signal"):
+                frozen = _SignalFreeze.freeze(pid)
+            if frozen is None:
+                return
+            frozen.since = now
+            frozen.cpu_rate = cpu_rate
+            self._frozen = frozen
+            self.freezes += 1
+        if metrics.enabled:
+            metrics.incr(f"freeze.{frozen.method}")
+
+
+class _FrozenTree:
+
+    method = ""
+
+    def __init__(self):
+        self.since = 0.0
+        self.cpu_rate = 0.0
+
+    def thaw(self):
+        raise NotImplementedError
+
+
+class _CgroupFreeze(_FrozenTree):
+
+    method = "cgroup"
+
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+
+    @classmethod
+    def freeze(cls, pid: int) -> Optional["_CgroupFreeze"]:
+        path = own_scope(pid)
+        if path is None or not write_value(path, "cgroup.freeze", "1"):
+            return None
+        return cls(path)
+
+    def thaw(self):
+        write_value(self.path, "cgroup.freeze", "0")
+
+
+class _SignalFreeze(_FrozenTree):
+
+    method = "signal"
+
+    def __init__(self, processes: list):
+        super().__init__()
+        self.processes = processes
+
+    @classmethod
+    def freeze(cls, pid: int) -> Optional["_SignalFreeze"]:
+        try:
+            import psutil
+
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return None
+
+        suspended = []
+        for process in processes:
+            try:
+                process.suspend()
+                suspended.append(process)
+            except Exception:
+                pass
+        return cls(suspended) if suspended else None
+
+    def thaw(self):
+        for process in reversed(self.processes):
+            try:
+                if process.is_running():
+                    process.resume()
+            except Exception:
+                pass
+
+
+def _tree_cpu_seconds(pid: int) -> float:
+    try:
+        import psutil
+
+        root = psutil.Process(pid)
+        processes: List = [root] + root.children(recursive=True)
+    except Exception:
+        return 0.0
+
+    total = 0.0
+    for process in processes:
+        try:
+            times = process.cpu_times()
+            total += times.user + times.system
+        except Exception:
+            pass
+    return total
+
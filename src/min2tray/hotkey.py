@@ -1,46 +1,265 @@
-from typing import Callable
+import functools
+import os
+import threading
+from typing import Callable, Dict, FrozenSet, Optional, Tuple
 
-from pynput import keyboard
+from .utils import HotkeyRegistrationError, PLATFORM, timed
 
-from .utils import HotkeyRegistrationError
+HOTKEY_BACKENDS = ("pynput", "xgrab", "memory")
 
 
-class HotkeyManager:
+class PynputHotkeyBackend:
 
     def __init__(self):
+        from pynput import keyboard
+
+        self._keyboard = keyboard
+        self._canonical = keyboard.Listener().canonical
+        self._modifiers = frozenset({
+            keyboard.Key.ctrl, keyboard.Key.alt, keyboard.Key.shift, keyboard.Key.cmd, keyboard.Key.alt_gr
+        })
         self.listener = None
-        self.hotkeys = {}
+        self._bindings: Dict[Tuple[FrozenSet, object], Callable] = {}
+        self._combos: Dict[str, Tuple[FrozenSet, object]] = {}
+        self._held_modifiers = set()
+        self._held_keys = set()
 
-    def register(self, key_combination: str, callback: Callable):
-        try:
-            hotkey = keyboard.HotKey(keyboard.HotKey.parse(key_combination), callback)
-            self.hotkeys[key_combination] = hotkey
+    def _parse(self, key_combination: str) -> Tuple[FrozenSet, object]:
+        keys = [self._canonical(key) for key in self._keyboard.HotKey.parse(key_combination)]
+        modifiers = frozenset(key for key in keys if key in self._modifiers)
+        others = [key for key in keys if key not in self._modifiers]
+        if len(others) != 1:
+            raise ValueError(f"Expected exactly one non-modifier key in '{key_combination}'")
+        return modifiers, others[0]
 
-            if self.listener:
-                self.listener.stop()
+    def bind(self, key_combination: str, callback: Callable):
+        binding = self._parse(key_combination)
+        self._bindings[binding] = callback
+        self._combos[key_combination] = binding
+        self._ensure_listener()
 
-            temp_listener = keyboard.Listener(on_press=lambda k: None, on_release=lambda k: None)
+    def bind_many(self, bindings: Dict[str, Callable]):
+        parsed = {key_combination: self._parse(key_combination) for key_combination in bindings}
+        for key_combination, binding in parsed.items():
+            self._bindings[binding] = bindings[key_combination]
+            self._combos[key_combination] = binding
+        self._ensure_listener()
 
-            def for_canonical(f):
-                return lambda k: f(temp_listener.canonical(k))
+    def unbind(self, key_combination: str) -> bool:
+        binding = self._combos.pop(key_combination, None)
+        if binding is None:
+            return False
+        if binding not in self._combos.values():
+            self._bindings.pop(binding, None)
+        return True
 
-            self.listener = keyboard.Listener(
-                on_press=for_canonical(self._on_press),
-                on_release=for_canonical(self._on_release)
-            )
+    def _ensure_listener(self):
+        if self.listener is None:
+            self.listener = self._keyboard.Listener(on_press=self._on_press, on_release=self._on_release)
             self.listener.start()
 
-        except Exception as e:
-            raise HotkeyRegistrationError(f"Failed to register hotkey '{key_combination}': {e}")
-
     def _on_press(self, key):
-        for hotkey in self.hotkeys.values():
-            hotkey.press(key)
+        key = self._canonical(key)
+        if key in self._modifiers:
+            self._held_modifiers.add(key)
+            return
+        if key in self._held_keys:
+            return
+        self._held_keys.add(key)
+
+        callback = self._bindings.get((frozenset(self._held_modifiers), key))
+        if callback:
+            callback()
 
     def _on_release(self, key):
-        for hotkey in self.hotkeys.values():
-            hotkey.release(key)
+        key = self._canonical(key)
+        self._held_modifiers.discard(key)
+        self._held_keys.discard(key)
 
     def stop(self):
         if self.listener:
             self.listener.stop()
+            self.listener = None
+        self._bindings.clear()
+        self._combos.clear()
+
+
+def normalize_combination(key_combination: str) -> str:
+    parts = [part.lower() if part.startswith("<") else part for part in key_combination.split("+")]
+    modifiers = sorted(part for part in parts[:-1])
+    return "+".join(modifiers + parts[-1:])
+
+
+class MemoryHotkeyBackend:
+
+    def __init__(self):
+        self._bindings: Dict[str, Callable] = {}
+
+    def bind(self, key_combination: str, callback: Callable):
+        self._bindings[normalize_combination(key_combination)] = callback
+
+    def bind_many(self, bindings: Dict[str, Callable]):
+        for key_combination, callback in bindings.items():
+            self.bind(key_combination, callback)
+
+    def unbind(self, key_combination: str) -> bool:
+        return self._bindings.pop(normalize_combination(key_combination), None) is not None
+
+    def press(self, key_combination: str) -> bool:
+        callback = self._bindings.get(normalize_combination(key_combination))
+        if callback:
+            callback()
+        return callback is not None
+
+    def stop(self):
+        self._bindings.clear()
+
+
+def default_hotkey_backend() -> str:
+    backend = os.environ.get("MIN2TRAY_HOTKEY_BACKEND")
+    if backend:
+        return backend
+    if PLATFORM == "linux":
+        from .window_manager.x11 import X11Connection
+        if X11Connection.available():
+            return "xgrab"
+    return "pynput"
+
+
+def create_hotkey_backend(backend: Optional[str] = None):
+    backend = backend or default_hotkey_backend()
+    if backend == "pynput":
+        return PynputHotkeyBackend()
+    elif backend == "xgrab":
+        from .hotkey_x11 import X11GrabHotkeyBackend
+        return X11GrabHotkeyBackend()
+    elif backend == "memory":
+        return MemoryHotkeyBackend()
+    raise ValueError(f"Unknown hotkey backend '{backend}', expected one of {HOTKEY_BACKENDS}")
+
+
+class HotkeyHub:
+
+    _hubs: Dict[str, "HotkeyHub"] = {}
+    _hubs_lock = threading.Lock()
+
+    def __init__(self, backend: str):
+        self.backend_name = backend
+        self.backend = None
+        self._lock = threading.RLock()
+        self._owners: Dict[str, Dict[object, Callable]] = {}
+
+    @classmethod
+    def get(cls, backend: Optional[str] = None) -> "HotkeyHub":
+        backend = backend or default_hotkey_backend()
+        with cls._hubs_lock:
+            hub = cls._hubs.get(backend)
+            if hub is None:
+                hub = cls._hubs[backend] = cls(backend)
+            return hub
+
+    def bind(self, owner: object, key_combination: str, callback: Callable):
+        self.bind_many(owner, {key_combination: callback})
+
+    def bind_many(self, owner: object, bindings: Dict[str, Callable]):
+        with self._lock:
+            new_bindings = {}
+            for key_combination, callback in bindings.items():
+                combination = normalize_combination(key_combination)
+                if combination not in self._owners and combination not in new_bindings:
+                    new_bindings[combination] = functools.partial(self._dispatch, combination)
+
+            if new_bindings:
+                if self.backend is None:
+                    self.backend = create_hotkey_backend(self.backend_name)
+                    print(f"Using the {self.backend_name} hotkey backend "
+                          f"(change with --hotkey-backend or MIN2TRAY_HOTKEY_BACKEND)")
+                try:
+                    self.backend.bind_many(new_bindings)
+                except Exception:
+                    for combination in new_bindings:
+                        self.backend.unbind(combination)
+                    self._stop_if_idle()
+                    raise
+
+            for key_combination, callback in bindings.items():
+                self._owners.setdefault(normalize_combination(key_combination), {})[owner] = callback
+
+    def unbind(self, owner: object, key_combination: str) -> bool:
+        combination = normalize_combination(key_combination)
+        with self._lock:
+            owners = self._owners.get(combination)
+            if not owners or owners.pop(owner, None) is None:
+                return False
+            if not owners:
+                del self._owners[combination]
+                if self.backend:
+                    self.backend.unbind(combination)
+            self._stop_if_idle()
+            return True
+
+    def unbind_owner(self, owner: object):
+        with self._lock:
+            for combination in [c for c, owners in self._owners.items() if owner in owners]:
+                self.unbind(owner, combination)
+
+    def bindings(self) -> Dict[str, int]:
+        with self._lock:
+            return {combination: len(owners) for combination, owners in self._owners.items()}
+
+    def _stop_if_idle(self):
+        if not self._owners and self.backend:
+            self.backend.stop()
+            self.backend = None
+
+    @timed("hotkey.dispatch")
+    def _dispatch(self, combination: str):
+        for callback in list(self._owners.get(combination, {}).values()):
+            try:
+                callback()
+            except Exception as e:
+                print(f"Hotkey callback error for '{combination}': {e}")
+
+
+class HotkeyManager:
+
+    def __init__(self, backend: Optional[str] = None):
+        self.backend_name = backend
+        self.hub: Optional[HotkeyHub] = None
+        self.hotkeys = {}
+
+    def _get_hub(self) -> HotkeyHub:
+        if self.hub is None:
+            self.hub = HotkeyHub.get(self.backend_name)
+        return self.hub
+
+    def register(self, key_combination: str, callback: Callable):
+        try:
+            self._get_hub().bind(self, key_combination, callback)
+            self.hotkeys[key_combination] = callback
+
+        except HotkeyRegistrationError:
+            raise
+        except Exception as e:
+            raise HotkeyRegistrationError(f"Failed to register hotkey '{key_combination}': {e}")
+
+    def register_many(self, bindings: Dict[str, Callable]):
+        try:
+            self._get_hub().bind_many(self, bindings)
+            self.hotkeys.update(bindings)
+
+        except HotkeyRegistrationError:
+            raise
+        except Exception as e:
+            raise HotkeyRegistrationError(f"Failed to register hotkeys {list(bindings)}: {e}")
+
+    def unregister(self, key_combination: str) -> bool:
+        if self.hub is None or key_combination not in self.hotkeys:
+            return False
+        del self.hotkeys[key_combination]
+        return self.hub.unbind(self, key_combination)
+
+    def stop(self):
+        if self.hub:
+            self.hub.unbind_owner(self)
+        self.hotkeys.clear()
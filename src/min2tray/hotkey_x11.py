@@ -0,0 +1,210 @@
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+from .utils import HotkeyRegistrationError
+from .window_manager.x11 import X11Connection
+
+MODIFIERS = {
+    "ctrl": "ControlMask",
+    "ctrl_l": "ControlMask",
+    "ctrl_r": "ControlMask",
+    "shift": "ShiftMask",
+    "shift_l": "ShiftMask",
+    "shift_r": "ShiftMask",
+    "alt": "Mod1Mask",
+    "alt_l": "Mod1Mask",
+    "alt_r": "Mod1Mask",
+    "alt_gr": "Mod5Mask",
+    "cmd": "Mod4Mask",
+    "cmd_l": "Mod4Mask",
+    "cmd_r": "Mod4Mask",
+    "super": "Mod4Mask",
+}
+
+KEY_NAMES = {
+    "space": "space",
+    "enter": "Return",
+    "esc": "Escape",
+    "tab": "Tab",
+    "backspace": "BackSpace",
+    "delete": "Delete",
+    "insert": "Insert",
+    "home": "Home",
+    "end": "End",
+    "page_up": "Prior",
+    "page_down": "Next",
+    "up": "Up",
+    "down": "Down",
+    "left": "Left",
+    "right": "Right",
+    "print_screen": "Print",
+    "pause": "Pause",
+    "menu": "Menu",
+    "scroll_lock": "Scroll_Lock",
+    "media_play_pause": "XF86AudioPlay",
+    "media_next": "XF86AudioNext",
+    "media_previous": "XF86AudioPrev",
+    "media_volume_up": "XF86AudioRaiseVolume",
+    "media_volume_down": "XF86AudioLowerVolume",
+    "media_volume_mute": "XF86AudioMute",
+}
+
+
+def parse_hotkey(key_combination: str) -> Tuple[Tuple[str, ...], int]:
+    from Xlib import XK
+
+    modifiers = []
+    keysym = None
+
+    for part in key_combination.split("+"):
+        if not part:
+            raise ValueError(f"Empty key in '{key_combination}'")
+
+        if part.startswith("<") and part.endswith(">") and len(part) > 2:
+            name = part[1:-1].lower()
+            if name in MODIFIERS:
+                modifiers.append(MODIFIERS[name])
+                continue
+            if name.isdigit():
+                value = int(name)
+            elif name.startswith("f") and name[1:].isdigit():
+                value = XK.string_to_keysym(name.upper())
+            else:
+                value = XK.string_to_keysym(KEY_NAMES.get(name, name))
+        elif len(part) == 1:
+            code = ord(part.lower())
+            value = code if code < 0x100 else 0x01000000 | code
+        else:
+            raise ValueError(f"Invalid key '{part}' in '{key_combination}'")
+
+        if not value:
+            raise ValueError(f"Unknown key '{part}' in '{key_combination}'")
+        if keysym is not None:
+            raise ValueError(f"More than one non-modifier key in '{key_combination}'")
+        keysym = value
+
+    if keysym is None:
+        raise ValueError(f"No key in '{key_combination}'")
+
+    return tuple(sorted(set(modifiers))), keysym
+
+
+class X11GrabHotkeyBackend:
+
+    def __init__(self, connection: Optional[X11Connection] = None):
+        from Xlib import X
+
+        self._X = X
+        self.connection = connection or X11Connection.get()
+        self._lock = threading.Lock()
+        self._bindings: Dict[Tuple[int, int], Callable] = {}
+        self._combos: Dict[str, Tuple[int, int]] = {}
+        self._listening = False
+        self._lock_variants = self._compute_lock_variants()
+
+    def _compute_lock_variants(self) -> Tuple[int, ...]:
+        from Xlib import XK
+
+        X = self._X
+        numlock_mask = 0
+        numlock_code = self.connection.display.keysym_to_keycode(XK.string_to_keysym("Num_Lock"))
+        if numlock_code:
+            masks = (X.ShiftMask, X.LockMask, X.ControlMask, X.Mod1Mask,
+                     X.Mod2Mask, X.Mod3Mask, X.Mod4Mask, X.Mod5Mask)
+            for index, keycodes in enumerate(self.connection.display.get_modifier_mapping()):
+                if numlock_code in keycodes:
+                    numlock_mask = masks[index]
+                    break
+
+        variants = {0, X.LockMask, numlock_mask, X.LockMask | numlock_mask}
+        return tuple(sorted(variants))
+
+    @property
+    def ignored_mask(self) -> int:
+        return self._lock_variants[-1]
+
+    def _resolve(self, key_combination: str) -> Tuple[int, int]:
+        modifiers, keysym = parse_hotkey(key_combination)
+        keycode = self.connection.display.keysym_to_keycode(keysym)
+        if not keycode:
+            raise ValueError(f"No keycode for '{key_combination}' in the current keymap")
+
+        mask = 0
+        for name in modifiers:
+            mask |= getattr(self._X, name)
+        return keycode, mask
+
+    def bind(self, key_combination: str, callback: Callable):
+        keycode, mask = self._resolve(key_combination)
+
+        with self._lock:
+            if (keycode, mask) not in self._bindings:
+                self._grab(keycode, mask, key_combination)
+            self._bindings[(keycode, mask)] = callback
+            self._combos[key_combination] = (keycode, mask)
+
+            if not self._listening:
+                self.connection.add_listener(self._on_event)
+                self._listening = True
+
+    def bind_many(self, bindings: Dict[str, Callable]):
+        bound = []
+        try:
+            for key_combination, callback in bindings.items():
+                if key_combination not in self._combos:
+                    bound.append(key_combination)
+                self.bind(key_combination, callback)
+        except Exception:
+            # Release what this call grabbed so a failed batch leaves no stray grabs behind
+            for key_combination in bound:
+                self.unbind(key_combination)
+            raise
+
+    def unbind(self, key_combination: str) -> bool:
+        with self._lock:
+            binding = self._combos.pop(key_combination, None)
+            if binding is None:
+                return False
+            if binding not in self._combos.values():
+                self._bindings.pop(binding, None)
+                self._ungrab(*binding)
+            return True
+
+    def stop(self):
+        with self._lock:
+            for keycode, mask in list(self._bindings):
+                self._ungrab(keycode, mask)
+            self._bindings.clear()
+            self._combos.clear()
+            if self._listening:
+                self.connection.remove_listener(self._on_event)
+                self._listening = False
+
+    def _grab(self, keycode: int, mask: int, key_combination: str):
+        from Xlib import error
+
+        X = self._X
+        catcher = error.CatchError(error.BadAccess)
+        with self.connection.lock:
+            for variant in self._lock_variants:
+                self.connection.root.grab_key(keycode, mask | variant, True, X.GrabModeAsync, X.GrabModeAsync,
+                                              onerror=catcher)
+            self.connection.display.sync()
+
+        if catcher.get_error():
+            self._ungrab(keycode, mask)
+            raise HotkeyRegistrationError(f"'{key_combination}' is already grabbed by another client")
+
+    def _ungrab(self, keycode: int, mask: int):
+        with self.connection.lock:
+            for variant in self._lock_variants:
+                self.connection.root.ungrab_key(keycode, mask | variant)
+            self.connection.display.flush()
+
+    def _on_event(self, event):
+        if event.type != self._X.KeyPress:
+            return
+
+        callback = self._bindings.get((event.detail, event.state & ~self.ignored_mask & 0xFF))
+        if callback:
+            callback()
@@ -0,0 +1,227 @@
+"""
+Decoded, pre-scaled tray icon images
+
+Icon files are decoded once and rendered at the size the active pystray
+backend draws, so the backend never rescales a full-resolution image. Entries
+are keyed by path, modification time, file size and rendered size, kept in a
+bounded LRU, and written as PNGs to ``$XDG_CACHE_HOME/min2tray/icons`` (or
+``$MIN2TRAY_ICON_CACHE``, empty to disable) so later launches skip decoding
+large source images.
+
+State frames (visible, hidden, exited, busy) are composited once per icon and
+size, so a state change only swaps which image the tray shows.
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Dict, Hashable, Optional, Tuple
+
+from .utils import IconLoadError, metrics
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+DEFAULT_ICON_SIZE = 64
+TRAY_STATES = ("visible", "hidden", "exited", "busy")
+
+# Pixel size of the image handed to each pystray backend; pystray takes a single image, so only this one is rendered
+BACKEND_ICON_SIZES = {
+    "_win32": 32,
+    "_darwin": 22,
+    "_xorg": 24,
+    "_appindicator": 48,
+    "_gtk": 48,
+}
+
+
+def backend_icon_size(icon_class: type) -> int:
+    return BACKEND_ICON_SIZES.get(icon_class.__module__.rpartition(".")[2], DEFAULT_ICON_SIZE)
+
+
+def default_cache_dir() -> Optional[str]:
+    path = os.environ.get("MIN2TRAY_ICON_CACHE")
+    if path is not None:
+        return path or None
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "min2tray", "icons")
+
+
+class IconCache:
+
+    def __init__(self, max_entries: int = 64, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._entries: "OrderedDict[Hashable, object]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, path: str, size: int = DEFAULT_ICON_SIZE) -> "Image.Image":
+        """Return the icon at ``path`` rendered at ``size``x``size``.
+
+        The image is shared with every later hit, so copy it before drawing on it.
+        """
+        path, stamp = _source_key(path)
+        image = self._lookup((path, stamp, size))
+        if image is not None:
+            return image
+
+        image = self._read_disk(path, stamp, size)
+        if image is not None:
+            self._store((path, stamp, size), image)
+            return image
+
+        if metrics.enabled:
+            metrics.incr("icon.cache.miss")
+        from PIL import Image
+
+        try:
+            with Image.open(path) as source:
+                source = source.convert("RGBA")
+        except Exception as e:
+            raise IconLoadError(f"Failed to load icon from {path}: {e}")
+
+        image = _render(source, size)
+        self._store((path, stamp, size), image)
+        self._write_disk(path, stamp, size, image)
+        return image
+
+    def default_image(self, width: int = DEFAULT_ICON_SIZE, height: int = DEFAULT_ICON_SIZE,
+                      color1: str = "black", color2: str = "white") -> "Image.Image":
+        key = ("default", width, height, color1, color2)
+        image = self._lookup(key)
+        if image is None:
+            from PIL import Image, ImageDraw
+
+            image = Image.new("RGB", (width, height), color1)
+            dc = ImageDraw.Draw(image)
+            dc.rectangle((width // 2, 0, width, height // 2), fill=color2)
+            dc.rectangle((0, height // 2, width // 2, height), fill=color2)
+            self._store(key, image)
+        return image
+
+    def state_frames(self, path: Optional[str] = None, size: int = DEFAULT_ICON_SIZE) -> Dict[str, "Image.Image"]:
+        """Return the icon at ``path`` (or the default icon) composited for each of ``TRAY_STATES``."""
+        if path:
+            key = ("frames", *_source_key(path), size)
+        else:
+            key = ("frames", None, None, size)
+        frames = self._lookup(key)
+        if frames is None:
+            base = self.get(path, size) if path else self.default_image(size, size)
+            frames = render_state_frames(base)
+            self._store(key, frames)
+        return frames
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _lookup(self, key: Hashable):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is not None and metrics.enabled:
+            metrics.incr("icon.cache.hit")
+        return entry
+
+    def _store(self, key: Hashable, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_name(self, path: str, stamp: Tuple[int, int], size: int) -> Tuple[str, str]:
+        prefix = hashlib.sha1(path.encode("utf-8", "surrogateescape")).hexdigest()[:20]
+        version = hashlib.sha1(repr(stamp).encode()).hexdigest()[:8]
+        return prefix, f"{prefix}-{version}-{size}.png"
+
+    def _read_disk(self, path: str, stamp: Tuple[int, int], size: int) -> "Optional[Image.Image]":
+        if not self.cache_dir:
+            return None
+        _, name = self._disk_name(path, stamp, size)
+        cached = os.path.join(self.cache_dir, name)
+        if not os.path.exists(cached):
+            return None
+
+        from PIL import Image
+
+        try:
+            with Image.open(cached) as image:
+                image.load()
+        except Exception:
+            return None
+        if metrics.enabled:
+            metrics.incr("icon.cache.disk")
+        return image
+
+    def _write_disk(self, path: str, stamp: Tuple[int, int], size: int, image: "Image.Image"):
+        if not self.cache_dir:
+            return
+        prefix, name = self._disk_name(path, stamp, size)
+        current = name[:len(prefix) + 9]
+        try:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            for existing in os.listdir(self.cache_dir):
+                if existing.startswith(prefix) and not existing.startswith(current):
+                    os.unlink(os.path.join(self.cache_dir, existing))
+            temporary = os.path.join(self.cache_dir, f".{name}.{os.getpid()}.{threading.get_ident()}")
+            image.save(temporary, format="PNG")
+            os.replace(temporary, os.path.join(self.cache_dir, name))
+        except OSError:
+            pass
+
+
+def render_state_frames(base: "Image.Image") -> Dict[str, "Image.Image"]:
+    from PIL import ImageDraw, ImageOps
+
+    visible = base.convert("RGBA")
+    alpha = visible.getchannel("A")
+
+    hidden = visible.copy()
+    hidden.putalpha(alpha.point(lambda value: value * 45 // 100))
+
+    exited = ImageOps.grayscale(visible).convert("RGBA")
+    exited.putalpha(alpha.point(lambda value: value * 70 // 100))
+
+    busy = visible.copy()
+
+    size = min(visible.size)
+    radius = max(size * 22 // 100, 2)
+    box = (visible.width - 2 * radius - 1, visible.height - 2 * radius - 1, visible.width - 1, visible.height - 1)
+    outline = max(size // 32, 1)
+    for frame, color in ((exited, (220, 40, 40, 255)), (busy, (245, 170, 20, 255))):
+        ImageDraw.Draw(frame).ellipse(box, fill=color, outline=(255, 255, 255, 255), width=outline)
+
+    return {"visible": visible, "hidden": hidden, "exited": exited, "busy": busy}
+
+
+def _source_key(path: str) -> Tuple[str, Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        raise IconLoadError(f"Failed to load icon from {path}: {e}")
+    return os.path.realpath(path), (stat.st_mtime_ns, stat.st_size)
+
+
+def _render(source: "Image.Image", size: int) -> "Image.Image":
+    if source.size == (size, size):
+        return source.copy()
+
+    from PIL import Image
+
+    scaled = source.copy()
+    scaled.thumbnail((size, size), Image.LANCZOS)
+    if scaled.size == (size, size):
+        return scaled
+    canvas = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+    canvas.paste(scaled, ((size - scaled.width) // 2, (size - scaled.height) // 2))
+    return canvas
+
+
+icon_cache = IconCache(cache_dir=default_cache_dir())
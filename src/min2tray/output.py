@@ -0,0 +1,127 @@
+"""
+Bounded capture of a managed application's stdout and stderr
+
+The pipes are read without blocking by the reaper thread, split into lines
+and kept in a ring buffer of at most ``max_bytes`` that drops its oldest
+lines, so a chatty app can neither grow min2tray's memory nor stall on a full
+pipe. The raw output can also be appended to a log file that is rotated once
+it exceeds ``log_max_bytes``.
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Deque, Dict, List, Optional, Tuple
+
+
+class OutputCapture:
+
+    def __init__(self, max_bytes: int = 64 * 1024, log_file: Optional[str] = None,
+                 log_max_bytes: int = 1024 * 1024, log_backups: int = 3, max_line: int = 4096):
+        self.max_bytes = max_bytes
+        self.max_line = max_line
+        self.log_file = os.path.expanduser(log_file) if log_file else None
+        self.size = 0
+        self.total_bytes = 0
+        self.dropped_lines = 0
+        self._lines: Deque[Tuple[str, str]] = deque()
+        self._partial: Dict[str, bytearray] = {}
+        self._lock = threading.Lock()
+        self._log = _RotatingLog(self.log_file, log_max_bytes, log_backups) if self.log_file else None
+
+    def feed(self, stream: str, data: bytes):
+        """Add ``data`` read from ``stream`` ("stdout" or "stderr"); an empty ``data`` marks its end."""
+        if self._log is not None and data:
+            self._log.write(data)
+        with self._lock:
+            self.total_bytes += len(data)
+            partial = self._partial.setdefault(stream, bytearray())
+            if not data:
+                if partial:
+                    self._append(stream, bytes(partial))
+                    partial.clear()
+                return
+
+            partial += data
+            if b"\n" in data:
+                lines = partial.split(b"\n")
+                partial[:] = lines.pop()
+                for line in lines:
+                    self._append(stream, line)
+            while len(partial) > self.max_line:
+                self._append(stream, bytes(partial[:self.max_line]))
+                del partial[:self.max_line]
+
+    def tail(self, lines: int = 20, stream: Optional[str] = None) -> List[str]:
+        with self._lock:
+            entries = [text for source, text in self._lines if stream is None or source == stream]
+        return entries[-lines:] if lines else []
+
+    def clear(self):
+        with self._lock:
+            self._lines.clear()
+            self._partial.clear()
+            self.size = 0
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+
+    def stats(self, lines: int = 20) -> dict:
+        return {
+            "tail": self.tail(lines),
+            "buffered_bytes": self.size,
+            "total_bytes": self.total_bytes,
+            "dropped_lines": self.dropped_lines,
+            "log_file": self.log_file,
+        }
+
+    def _append(self, stream: str, raw: bytes):
+        text = raw.rstrip(b"\r").decode("utf-8", "replace")
+        self._lines.append((stream, text))
+        self.size += len(text) + 1
+        while self.size > self.max_bytes and self._lines:
+            _, dropped = self._lines.popleft()
+            self.size -= len(dropped) + 1
+            self.dropped_lines += 1
+
+
+class _RotatingLog:
+
+    def __init__(self, path: str, max_bytes: int, backups: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._file = None
+        self._failed = False
+
+    def write(self, data: bytes):
+        if self._failed:
+            return
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                self._file = open(self.path, "ab")
+            if self._file.tell() + len(data) > self.max_bytes and self._file.tell() > 0:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: cannot write output log {self.path}: {e}")
+            self._failed = True
+            self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def _rotate(self):
+        self.close()
+        if self.backups > 0:
+            for index in range(self.backups - 1, 0, -1):
+                source = f"{self.path}.{index}"
+                if os.path.exists(source):
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "wb")
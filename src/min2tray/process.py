@@ -1,119 +1,345 @@
+import functools
+import os
+import shlex
 import subprocess
 import threading
 import time
-from typing import Union, Optional, Callable, Dict, List
+from typing import Union, Optional, Callable, Dict, List, Tuple
 from enum import Enum
 
+from .output import OutputCapture
+from .reaper import ProcessReaper
+from .utils import metrics, timed
+from .utils.cgroup import SCOPES, create_scope, remove_scope, systemd_scope_command, write_value
+
 
 class ProcessEvent(Enum):
     STARTED = "started"
     EXITED = "exited"
     ERROR = "error"
     TIMEOUT = "timeout"
+    RESTARTING = "restarting"
+    RESTARTED = "restarted"
+
+
+RESTART_POLICIES = ("never", "on-failure", "always")
+
+
+class RestartPolicy:
+
+    def __init__(self, policy: str = "on-failure", backoff: float = 0.5, max_backoff: float = 30.0,
+                 reset_after: float = 30.0, max_restarts: int = 5, window: float = 60.0):
+        if policy not in RESTART_POLICIES:
+            raise ValueError(f"Unknown restart policy '{policy}', expected one of {RESTART_POLICIES}")
+        self.policy = policy
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.reset_after = reset_after
+        self.max_restarts = max_restarts
+        self.window = window
+
+    def should_restart(self, return_code: Optional[int]) -> bool:
+        if self.policy == "always":
+            return True
+        return self.policy == "on-failure" and return_code != 0
+
+    def delay(self, failures: int) -> float:
+        """Backoff before the next restart after ``failures`` consecutive short-lived runs."""
+        return min(self.backoff * 2 ** failures, self.max_backoff)
+
+    def __repr__(self):
+        return (f"RestartPolicy(policy={self.policy}, backoff={self.backoff}, max_backoff={self.max_backoff}, "
+                f"max_restarts={self.max_restarts}, window={self.window})")
+
 
 
 class ProcessManager:
 
-    def __init__(self):
+    def __init__(self, scope: Optional[str] = None, name: str = "app", reaper: Optional[ProcessReaper] = None,
+                 restart: Optional[RestartPolicy] = None, capture: Optional[OutputCapture] = None):
+        if scope is not None and scope not in SCOPES:
+            raise ValueError(f"Unknown scope '{scope}', expected one of {SCOPES}")
+        self.scope = scope
+        self.name = name
+        self.reaper = reaper or ProcessReaper.get()
         self.process: Optional[subprocess.Popen] = None
-        self._monitor_thread: Optional[threading.Thread] = None
-        self._hooks: Dict[ProcessEvent, List[Callable]] = {
+        self.processes: List[subprocess.Popen] = []
+        self._cgroups: Dict[subprocess.Popen, str] = {}
+        self._hooks: Dict[ProcessEvent, List[Tuple[Callable, bool]]] = {
             event: [] for event in ProcessEvent
         }
-        self._is_monitoring = False
+        self._condition = threading.Condition()
+        self.restart = restart or RestartPolicy("never")
+        self.capture = capture
+        if capture is not None and os.name != "posix":
+            print("Warning: output capture needs POSIX pipes, the command keeps min2tray's stdout and stderr")
+            self.capture = None
+        self.restarts = 0
+        self.last_restart_seconds: Optional[float] = None
+        self.crash_looped = False
+        self._launches: Dict[subprocess.Popen, Tuple[tuple, float]] = {}
+        self._pending_restarts: Dict[subprocess.Popen, threading.Timer] = {}
+        self._restart_times: List[float] = []
+        self._failures = 0
+        self._stopping = False
 
-    def add_hook(self, event: ProcessEvent, callback: Callable) -> None:
-        self._hooks[event].append(callback)
+    def add_hook(self, event: ProcessEvent, callback: Callable, with_process: bool = False) -> None:
+        """Register ``callback`` for ``event``; with ``with_process`` the Popen is passed as an extra last argument."""
+        self._hooks[event].append((callback, with_process))
 
     def remove_hook(self, event: ProcessEvent, callback: Callable) -> bool:
-        try:
-            self._hooks[event].remove(callback)
-            return True
-        except ValueError:
-            return False
+        for hook in self._hooks[event]:
+            if hook[0] == callback:
+                self._hooks[event].remove(hook)
+                return True
+        return False
 
-    def _trigger_hooks(self, event: ProcessEvent, *args, **kwargs) -> None:
-        for callback in self._hooks[event]:
+    def _trigger_hooks(self, event: ProcessEvent, *args, process: Optional[subprocess.Popen] = None) -> None:
+        for callback, with_process in list(self._hooks[event]):
             try:
-                callback(*args, **kwargs)
+                if with_process:
+                    callback(*args, process)
+                else:
+                    callback(*args)
             except Exception as e:
                 print(f"Hook callback error for {event.value}: {e}")
 
-    def run_command(self, command: Union[str, list], wait_time: float = 1.0) -> bool:
+    def run_command(self, command: Union[str, list], wait_time: float = 1.0,
+                    ready_check: Optional[Callable[[subprocess.Popen, float], bool]] = None) -> bool:
+        """Start ``command`` next to any process already running; ``process`` refers to the latest one."""
+        self._stopping = False
+        self.crash_looped = False
+        return self._launch((command, wait_time, ready_check))
+
+    def _launch(self, launch: tuple, crashed_at: Optional[float] = None) -> bool:
+        command, wait_time, ready_check = launch
         try:
-            self.process = subprocess.Popen(command)
-            time.sleep(wait_time)
+            start = time.perf_counter()
+            process = self._spawn(command)
+            self.process = process
+            self._capture_output(process)
+            self._launches[process] = (launch, time.monotonic())
+            if metrics.enabled:
+                metrics.observe("process.spawn", time.perf_counter() - start)
+            if ready_check is None:
+                time.sleep(wait_time)
+            elif not ready_check(process, wait_time) and process.poll() is None:
+                print(f"Warning: Process not ready after {wait_time}s")
+            if metrics.enabled:
+                metrics.observe("process.ready", time.perf_counter() - start)
 
-            if self.process.poll() is None:
-                self._trigger_hooks(ProcessEvent.STARTED, self.process)
-                self._start_monitoring()
+            if process.poll() is None:
+                self._trigger_hooks(ProcessEvent.STARTED, process, process=process)
+                if crashed_at is not None:
+                    self.restarts += 1
+                    self.last_restart_seconds = time.monotonic() - crashed_at
+                    if metrics.enabled:
+                        metrics.observe("process.restart", self.last_restart_seconds)
+                    self._trigger_hooks(ProcessEvent.RESTARTED, process, self.last_restart_seconds,
+                                        process=process)
+                self._start_monitoring(process)
                 return True
             else:
-                self._trigger_hooks(ProcessEvent.EXITED, self.process.returncode)
+                # Reported from the reaper, after it has drained the pipes, like any other exit
+                self._start_monitoring(process)
                 return False
 
         except Exception as e:
             self._trigger_hooks(ProcessEvent.ERROR, e)
             return False
 
-    def _start_monitoring(self) -> None:
-        if self._is_monitoring:
-            return
+    def _spawn(self, command: Union[str, list]) -> subprocess.Popen:
+        stdio = self._stdio()
+        # Split once, so a command string runs the same way with or without a scope; Windows takes the
+        # command line as it is and parses it itself
+        if not isinstance(command, str):
+            argv = list(command)
+        else:
+            argv = shlex.split(command) if os.name == "posix" else command
+        if self.scope is None or os.name != "posix":
+            return subprocess.Popen(argv, **stdio)
 
-        def monitor():
-            self._is_monitoring = True
-            try:
-                if self.process:
-                    return_code = self.process.wait()
-                    self._trigger_hooks(ProcessEvent.EXITED, return_code)
-            except Exception as e:
-                self._trigger_hooks(ProcessEvent.ERROR, e)
-            finally:
-                self._is_monitoring = False
+        if self.scope == "systemd":
+            wrapped = systemd_scope_command(argv, self.name)
+            if wrapped is not None:
+                return subprocess.Popen(wrapped, **stdio)
+            print("Warning: systemd-run not found, starting the command without a scope")
+            return subprocess.Popen(argv, **stdio)
+
+        cgroup = create_scope(self.name)
+        if cgroup is None:
+            print("Warning: cannot create a cgroup next to min2tray's, starting the command without one")
+            return subprocess.Popen(argv, **stdio)
+
+        try:
+            process = subprocess.Popen(argv, **stdio)
+        except Exception:
+            remove_scope(cgroup)
+            raise
+        # Joined from the parent, as a preexec_fn is not safe with other threads running; anything the
+        # command forks after this write inherits the cgroup
+        if not write_value(cgroup, "cgroup.procs", str(process.pid)):
+            print("Warning: cannot move the command into its cgroup, leaving it without one")
+            remove_scope(cgroup)
+            return process
+        self._cgroups[process] = cgroup
+        return process
+
+    def _stdio(self) -> dict:
+        if self.capture is None:
+            return {}
+        return {"stdout": subprocess.PIPE, "stderr": subprocess.PIPE}
+
+    def _capture_output(self, process: subprocess.Popen) -> None:
+        for name in ("stdout", "stderr"):
+            stream = getattr(process, name)
+            if stream is not None:
+                self.reaper.watch_stream(process, stream, functools.partial(self.capture.feed, name))
 
-        self._monitor_thread = threading.Thread(target=monitor, daemon=True)
-        self._monitor_thread.start()
+    @property
+    def cgroup(self) -> Optional[str]:
+        return self._cgroups.get(self.process) if self.process else None
+
+    def _release_cgroup(self, process: subprocess.Popen) -> None:
+        cgroup = self._cgroups.pop(process, None)
+        if cgroup is not None:
+            remove_scope(cgroup)
+
+    def _start_monitoring(self, process: subprocess.Popen) -> None:
+        with self._condition:
+            self.processes.append(process)
+        self.reaper.watch(process, self._on_exit)
+
+    def _on_exit(self, process: subprocess.Popen) -> None:
+        # Called on the reaper thread shared by every child; the hooks may block (stopping a window waits for
+        # the rest of its processes), so they run on their own thread. ``wait`` keeps waiting until they finish
+        threading.Thread(target=self._handle_exit, args=(process,), name=f"min2tray-exit-{self.name}",
+                         daemon=True).start()
+
+    def _handle_exit(self, process: subprocess.Popen) -> None:
+        self._release_cgroup(process)
+        launch, started = self._launches.pop(process, (None, 0.0))
+        delay = self._restart_delay(process, started) if launch is not None else None
+        try:
+            if delay is None:
+                self._trigger_hooks(ProcessEvent.EXITED, process.returncode, process=process)
+            else:
+                print(f"Process exited with return code {process.returncode}, restarting in {delay:.1f}s")
+                self._trigger_hooks(ProcessEvent.RESTARTING, process.returncode, delay, process=process)
+        finally:
+            with self._condition:
+                if delay is not None and not self._stopping:
+                    timer = threading.Timer(delay, self._restart, args=(process, launch, time.monotonic()))
+                    timer.daemon = True
+                    self._pending_restarts[process] = timer
+                    timer.start()
+                if process in self.processes:
+                    self.processes.remove(process)
+                if self.capture is not None and not self.processes and not self._pending_restarts:
+                    # The reaper drained the pipes before reporting the exit; the log reopens on a later run
+                    self.capture.close()
+                self._condition.notify_all()
+
+    def _restart_delay(self, process: subprocess.Popen, started: float) -> Optional[float]:
+        if self._stopping or not self.restart.should_restart(process.returncode):
+            return None
+        now = time.monotonic()
+        if now - started >= self.restart.reset_after:
+            self._failures = 0
+        self._restart_times = [at for at in self._restart_times if now - at < self.restart.window]
+        if len(self._restart_times) >= self.restart.max_restarts:
+            print(f"Process restarted {len(self._restart_times)} times within {self.restart.window:.0f}s, "
+                  f"giving up")
+            self.crash_looped = True
+            if metrics.enabled:
+                metrics.incr("process.crash_loop")
+            return None
+        self._restart_times.append(now)
+        delay = self.restart.delay(self._failures)
+        self._failures += 1
+        return delay
+
+    def _restart(self, previous: subprocess.Popen, launch: tuple, crashed_at: float) -> None:
+        try:
+            if not self._stopping:
+                self._launch(launch, crashed_at)
+        finally:
+            with self._condition:
+                self._pending_restarts.pop(previous, None)
+                self._condition.notify_all()
+
+    def stats(self) -> dict:
+        return {
+            "pid": self.pid,
+            "running": self.is_running(),
+            "return_code": self.return_code,
+            "restart": self.restart.policy,
+            "restarts": self.restarts,
+            "last_restart_ms": self.last_restart_seconds * 1000 if self.last_restart_seconds is not None else None,
+            "restart_pending": bool(self._pending_restarts),
+            "crash_looped": self.crash_looped,
+            "output": self.capture.stats() if self.capture else None,
+        }
 
+    @timed("process.terminate")
     def terminate(self, timeout: float = 5.0) -> bool:
-        if not self.process:
-            return False
+        with self._condition:
+            self._stopping = True
+            for timer in self._pending_restarts.values():
+                timer.cancel()
+            self._pending_restarts.clear()
+            self._condition.notify_all()
+
+        targets = [process for process in list(self.processes) if process.poll() is None]
+        if not targets and self.process is not None and self.process.poll() is None:
+            targets = [self.process]
+        if not targets:
+            return self.process is not None
 
         try:
-            self.process.terminate()
+            for process in targets:
+                process.terminate()
 
-            try:
-                self.process.wait(timeout=timeout)
-                return True
-            except subprocess.TimeoutExpired:
-                self.process.kill()
-                self.process.wait()
+            deadline = time.monotonic() + timeout
+            killed = False
+            for process in targets:
+                try:
+                    process.wait(timeout=max(deadline - time.monotonic(), 0))
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    process.wait()
+                    killed = True
+            if killed:
                 self._trigger_hooks(ProcessEvent.TIMEOUT)
-                return True
+            return True
 
         except Exception as e:
             self._trigger_hooks(ProcessEvent.ERROR, e)
             return False
 
     def wait(self, timeout: Optional[float] = None) -> Optional[int]:
-        if self._monitor_thread and self._monitor_thread.is_alive():
-            try:
-                self._monitor_thread.join(timeout=timeout)
-                if self._monitor_thread.is_alive():
-                    print(f"Warning: Monitor thread still alive after {timeout}s timeout")
-            except Exception as e:
-                print(f"Error waiting for monitor thread: {e}")
+        """Wait until every process has exited for good (no restart pending) and its hooks have run."""
+        with self._condition:
+            if not self._condition.wait_for(lambda: not self.processes and not self._pending_restarts, timeout):
+                print(f"Warning: Processes still running after {timeout}s timeout")
 
         if self.process:
             return self.process.returncode
         return None
 
     def is_running(self) -> bool:
-        return self.process is not None and self.process.poll() is None
+        if self.process is not None and self.process.poll() is None:
+            return True
+        return any(process.poll() is None for process in list(self.processes))
 
     @property
     def pid(self) -> Optional[int]:
         return self.process.pid if self.process else None
 
+    @property
+    def pids(self) -> List[int]:
+        return [process.pid for process in list(self.processes) if process.poll() is None]
+
     @property
     def return_code(self) -> Optional[int]:
         return self.process.returncode if self.process else None
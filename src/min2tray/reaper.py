@@ -0,0 +1,200 @@
+"""
+One thread watching every child process min2tray launches
+
+Each child is watched through a pidfd (``os.pidfd_open``, Linux 5.3+) that
+becomes readable when it exits, so any number of children cost one thread
+blocked in a selector and no wakeups while they run. Where pidfds are not
+available, a SIGCHLD handler wakes the loop to poll the remaining children
+(or, when the handler cannot be installed, they are polled once a second).
+
+The same selector reads the output pipes of children whose output is
+captured, so a pipe is drained as soon as it has data and a second time,
+to its end, before the exit of its process is reported.
+"""
+
+import os
+import selectors
+import signal
+import socket
+import subprocess
+import threading
+from typing import IO, Callable, Dict, List, Optional, Tuple
+
+ExitCallback = Callable[[subprocess.Popen], None]
+StreamCallback = Callable[[bytes], None]
+
+FALLBACK_POLL_INTERVAL = 1.0
+READ_SIZE = 65536
+
+
+class ProcessReaper:
+
+    _instance: Optional["ProcessReaper"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, None)
+        self._pidfds: Dict[subprocess.Popen, int] = {}
+        self._polled: Dict[subprocess.Popen, ExitCallback] = {}
+        self._streams: Dict[subprocess.Popen, List[Tuple[IO[bytes], StreamCallback]]] = {}
+        self._sigchld_installed = False
+        self._thread: Optional[threading.Thread] = None
+        self.reaped = 0
+
+    @classmethod
+    def get(cls) -> "ProcessReaper":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @property
+    def watched(self) -> int:
+        return len(self._pidfds) + len(self._polled)
+
+    def watch(self, process: subprocess.Popen, callback: ExitCallback):
+        """Call ``callback(process)`` from the reaper thread once ``process`` has exited and been reaped."""
+        # An already reaped pid may belong to another process by now, so only poll for it
+        pidfd = _pidfd_open(process.pid) if process.returncode is None else None
+        with self._lock:
+            if process.returncode is not None:
+                self._polled[process] = callback
+            elif pidfd is not None:
+                self._pidfds[process] = pidfd
+                self._selector.register(pidfd, selectors.EVENT_READ, (process, callback))
+            else:
+                self._polled[process] = callback
+                self._install_sigchld()
+            self._ensure_thread()
+        self._wake()
+
+    def watch_stream(self, process: subprocess.Popen, stream: IO[bytes], callback: StreamCallback):
+        """Call ``callback(data)`` from the reaper thread whenever the pipe ``stream`` of ``process`` has data,
+        and ``callback(b"")`` once it is closed."""
+        os.set_blocking(stream.fileno(), False)
+        with self._lock:
+            self._streams.setdefault(process, []).append((stream, callback))
+            self._selector.register(stream, selectors.EVENT_READ, (process, stream, callback))
+            self._ensure_thread()
+        self._wake()
+
+    def unwatch(self, process: subprocess.Popen) -> bool:
+        with self._lock:
+            if self._polled.pop(process, None) is not None:
+                return True
+            pidfd = self._pidfds.pop(process, None)
+            if pidfd is None:
+                return False
+            self._selector.unregister(pidfd)
+        os.close(pidfd)
+        return True
+
+    def _ensure_thread(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="min2tray-reaper", daemon=True)
+            self._thread.start()
+
+    def _wake(self):
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _install_sigchld(self):
+        if self._sigchld_installed or not hasattr(signal, "SIGCHLD"):
+            return
+        if threading.current_thread() is not threading.main_thread():
+            return
+        previous = signal.getsignal(signal.SIGCHLD)
+
+        def on_sigchld(signum, frame):
+            self._wake()
+            if callable(previous):
+                previous(signum, frame)
+
+        signal.signal(signal.SIGCHLD, on_sigchld)
+        self._sigchld_installed = True
+
+    def _run(self):
+        while True:
+            timeout = None if not self._polled or self._sigchld_installed else FALLBACK_POLL_INTERVAL
+            for key, _ in self._selector.select(timeout):
+                if key.fileobj is self._wake_r:
+                    try:
+                        while self._wake_r.recv(4096):
+                            pass
+                    except (BlockingIOError, InterruptedError):
+                        pass
+                elif len(key.data) == 3:
+                    self._read(*key.data)
+                else:
+                    process, callback = key.data
+                    if self.unwatch(process):
+                        self._reap(process, callback)
+
+            if self._polled:
+                with self._lock:
+                    exited = [(process, callback) for process, callback in self._polled.items()
+                              if process.poll() is not None]
+                    for process, _ in exited:
+                        del self._polled[process]
+                for process, callback in exited:
+                    self._reap(process, callback)
+
+    def _read(self, process: subprocess.Popen, stream: IO[bytes], callback: StreamCallback,
+              drain: bool = False):
+        while not stream.closed:
+            try:
+                data = os.read(stream.fileno(), READ_SIZE)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                data = b""
+
+            try:
+                callback(data)
+            except Exception as e:
+                print(f"Process output callback error: {e}")
+            if not data:
+                self._close_stream(process, stream)
+                return
+            if not drain:
+                return
+
+    def _close_stream(self, process: subprocess.Popen, stream: IO[bytes]):
+        with self._lock:
+            self._selector.unregister(stream)
+            streams = self._streams.get(process, [])
+            streams[:] = [entry for entry in streams if entry[0] is not stream]
+            if not streams:
+                self._streams.pop(process, None)
+        stream.close()
+
+    def _reap(self, process: subprocess.Popen, callback: ExitCallback):
+        for stream, stream_callback in list(self._streams.get(process, ())):
+            self._read(process, stream, stream_callback, drain=True)
+        try:
+            process.wait()
+        except Exception:
+            pass
+        self.reaped += 1
+        try:
+            callback(process)
+        except Exception as e:
+            print(f"Process exit callback error: {e}")
+
+
+def _pidfd_open(pid: int) -> Optional[int]:
+    pidfd_open = getattr(os, "pidfd_open", None)
+    if pidfd_open is None:
+        return None
+    try:
+        return pidfd_open(pid)
+    except OSError:
+        return None
@@ -0,0 +1,235 @@
+"""
+CPU, memory and thread usage of the managed applications' process trees
+
+A single shared thread samples every watched app at a low frequency. Each
+tick walks only the watched trees, following the kernel's child lists
+(``/proc/<pid>/task/<tid>/children``), and reads CPU times, RSS and thread
+count of the processes in them, so the cost grows with the processes the apps
+own rather than with everything running. Kernels without child lists (and
+other platforms) fall back to one ``psutil.process_iter`` sweep per tick for
+the parent of every process. PSS is only read when asked for, as it makes
+the kernel walk every mapping of the process. The thread exits when nothing
+is watched.
+"""
+
+import os
+import threading
+import time
+from typing import Callable, Dict, Hashable, List, Optional
+
+from .utils import metrics
+
+SampleCallback = Callable[["ResourceSample"], None]
+
+
+class ResourceSample:
+
+    __slots__ = ("pid", "cpu_percent", "rss", "pss", "threads", "processes", "taken_at")
+
+    def __init__(self, pid: int, cpu_percent: float, rss: int, pss: Optional[int], threads: int,
+                 processes: int, taken_at: float):
+        self.pid = pid
+        self.cpu_percent = cpu_percent
+        self.rss = rss
+        self.pss = pss
+        self.threads = threads
+        self.processes = processes
+        self.taken_at = taken_at
+
+    @property
+    def memory(self) -> int:
+        return self.pss if self.pss is not None else self.rss
+
+    def summary(self) -> str:
+        return f"{self.cpu_percent:.0f}% CPU, {format_bytes(self.memory)}, {self.threads} threads"
+
+    def as_dict(self) -> dict:
+        return {
+            "pid": self.pid,
+            "cpu_percent": round(self.cpu_percent, 1),
+            "rss": self.rss,
+            "pss": self.pss,
+            "threads": self.threads,
+            "processes": self.processes,
+            "age_seconds": round(time.monotonic() - self.taken_at, 1),
+        }
+
+    def __repr__(self):
+        return f"ResourceSample(pid={self.pid}, {self.summary()})"
+
+
+class _Watch:
+
+    __slots__ = ("pid_getter", "callback", "sample", "cpu_seconds", "sampled_at")
+
+    def __init__(self, pid_getter: Callable[[], Optional[int]], callback: Optional[SampleCallback]):
+        self.pid_getter = pid_getter
+        self.callback = callback
+        self.sample: Optional[ResourceSample] = None
+        self.cpu_seconds: Optional[float] = None
+        self.sampled_at = 0.0
+
+
+class ResourceSampler:
+
+    _instance: Optional["ResourceSampler"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, interval: float = 5.0, pss: bool = False):
+        self.interval = interval
+        self.pss = pss
+        self.ticks = 0
+        self._proc_children: Optional[bool] = None
+        self._watches: Dict[Hashable, _Watch] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> "ResourceSampler":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def watch(self, key: Hashable, pid_getter: Callable[[], Optional[int]],
+              callback: Optional[SampleCallback] = None):
+        """Sample the process tree rooted at ``pid_getter()`` every tick, passing each sample to ``callback``."""
+        with self._lock:
+            self._watches[key] = _Watch(pid_getter, callback)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="min2tray-sampler", daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def unwatch(self, key: Hashable) -> bool:
+        with self._lock:
+            removed = self._watches.pop(key, None) is not None
+        self._wakeup.set()
+        return removed
+
+    def sample(self, key: Hashable) -> Optional[ResourceSample]:
+        watch = self._watches.get(key)
+        return watch.sample if watch else None
+
+    def tick(self) -> Dict[Hashable, ResourceSample]:
+        """Take one sample of every watched tree now."""
+        start = time.perf_counter()
+        with self._lock:
+            watches = list(self._watches.items())
+        roots = {key: watch.pid_getter() for key, watch in watches}
+        if not any(roots.values()):
+            return {}
+
+        import psutil
+
+        if self._proc_children is None:
+            self._proc_children = os.path.exists(f"/proc/self/task/{os.getpid()}/children")
+        parents: Optional[Dict[int, List[int]]] = None
+        if not self._proc_children:
+            parents = {}
+            for process in psutil.process_iter(["ppid"]):
+                parents.setdefault(process.info["ppid"], []).append(process.pid)
+
+        now = time.monotonic()
+        samples = {}
+        for key, watch in watches:
+            pid = roots[key]
+            if pid is None:
+                watch.sample = None
+                continue
+            try:
+                tree = [psutil.Process(pid)]
+            except psutil.Error:
+                watch.sample = None
+                continue
+            pids = [pid]
+            for parent in pids:
+                for child in _proc_children(parent) if parents is None else parents.get(parent, ()):
+                    try:
+                        tree.append(psutil.Process(child))
+                    except psutil.Error:
+                        continue
+                    pids.append(child)
+            sample = self._measure(watch, pid, tree, now)
+            if sample is not None:
+                samples[key] = sample
+
+        self.ticks += 1
+        if metrics.enabled:
+            metrics.observe("sampler.tick", time.perf_counter() - start)
+        for key, sample in samples.items():
+            watch = self._watches.get(key)
+            if watch is not None and watch.callback is not None:
+                try:
+                    watch.callback(sample)
+                except Exception as e:
+                    print(f"Resource sample callback error: {e}")
+        return samples
+
+    def _measure(self, watch: _Watch, pid: int, tree: list, now: float) -> Optional[ResourceSample]:
+        import psutil
+
+        cpu_seconds = 0.0
+        rss = threads = count = 0
+        pss: Optional[int] = 0 if self.pss else None
+        for process in tree:
+            try:
+                with process.oneshot():
+                    times = process.cpu_times()
+                    rss += process.memory_info().rss
+                    threads += process.num_threads()
+                    if pss is not None:
+                        try:
+                            pss += process.memory_full_info().pss
+                        except (psutil.AccessDenied, AttributeError):
+                            pss = None
+            except psutil.Error:
+                continue
+            cpu_seconds += times.user + times.system
+            count += 1
+        if count == 0:
+            watch.sample = None
+            return None
+
+        cpu_percent = 0.0
+        if watch.cpu_seconds is not None and now > watch.sampled_at:
+            cpu_percent = max(cpu_seconds - watch.cpu_seconds, 0.0) / (now - watch.sampled_at) * 100
+        watch.cpu_seconds = cpu_seconds
+        watch.sampled_at = now
+        watch.sample = ResourceSample(pid, cpu_percent, rss, pss, threads, count, now)
+        return watch.sample
+
+    def _run(self):
+        while True:
+            self._wakeup.clear()
+            try:
+                self.tick()
+            except Exception as e:
+                print(f"Resource sampling failed: {e}")
+            self._wakeup.wait(self.interval)
+            with self._lock:
+                if not self._watches:
+                    self._thread = None
+                    return
+
+
+def _proc_children(pid: int) -> List[int]:
+    """Direct children of ``pid``, which the kernel lists per thread that forked them."""
+    children = []
+    try:
+        for tid in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{tid}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GB"
@@ -0,0 +1,160 @@
+"""
+Lower the resource share of a hidden application that must keep running
+
+While hidden, an app in a cgroup v2 scope of its own gets a reduced
+``cpu.weight`` and ``io.weight`` and optionally a lower ``memory.high``
+(followed by ``memory.reclaim`` to push cold pages out). Apps sharing
+min2tray's cgroup fall back to ``nice``/``ionice`` on their process tree.
+The previous values are restored as soon as the window is shown.
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple, Union
+
+from .utils import ConfigError, metrics
+from .utils.cgroup import own_scope, read_value, write_value
+
+_SIZE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)i?b?\s*$", re.IGNORECASE)
+
+
+def parse_size(value: Union[int, str]) -> int:
+    if isinstance(value, int):
+        return value
+    match = _SIZE.match(value)
+    if match is None:
+        raise ConfigError(f"Invalid size '{value}', expected e.g. 512M or 2G")
+    return int(float(match.group(1)) * 1024 ** " kmgt".index(match.group(2).lower() or " "))
+
+
+class ThrottlePolicy:
+
+    def __init__(self, cpu_weight: int = 10, io_weight: int = 10, nice: int = 10, ionice_idle: bool = True,
+                 memory_high: Optional[Union[int, str]] = None, reclaim: bool = True):
+        self.cpu_weight = cpu_weight
+        self.io_weight = io_weight
+        self.nice = nice
+        self.ionice_idle = ionice_idle
+        self.memory_high = parse_size(memory_high) if memory_high is not None else None
+        self.reclaim = reclaim
+
+    def __repr__(self):
+        return (f"ThrottlePolicy(cpu_weight={self.cpu_weight}, io_weight={self.io_weight}, nice={self.nice}, "
+                f"memory_high={self.memory_high})")
+
+
+class ProcessThrottle:
+
+    def __init__(self, policy: Optional[ThrottlePolicy] = None):
+        self.policy = policy or ThrottlePolicy()
+        self.throttles = 0
+        self._cgroup: Optional[str] = None
+        self._saved_files: List[Tuple[str, str]] = []
+        self._saved_processes: List[tuple] = []
+
+    @property
+    def throttled(self) -> bool:
+        return bool(self._saved_files or self._saved_processes)
+
+    def apply(self, pid: Optional[int]) -> bool:
+        if pid is None or self.throttled:
+            return False
+        directory = own_scope(pid)
+        if directory is not None:
+            self._throttle_cgroup(directory)
+        if not self._saved_files:
+            self._throttle_tree(pid)
+        if not self.throttled:
+            return False
+
+        self.throttles += 1
+        if metrics.enabled:
+            metrics.incr("throttle.cgroup" if self._saved_files else "throttle.process")
+        return True
+
+    def restore(self) -> bool:
+        if not self.throttled:
+            return False
+        for name, value in reversed(self._saved_files):
+            write_value(self._cgroup, name, value)
+        for process, nice, ionice in self._saved_processes:
+            try:
+                if not process.is_running():
+                    continue
+                if ionice is not None:
+                    process.ionice(*ionice)
+                if nice is not None:
+                    process.nice(nice)
+            except Exception as e:
+                print(f"Failed to restore priority of process {process.pid}: {e}")
+        self._saved_files = []
+        self._saved_processes = []
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "throttled": self.throttled,
+            "method": ("cgroup" if self._saved_files else "process") if self.throttled else None,
+            "throttles": self.throttles,
+            "cgroup": self._cgroup if self._saved_files else None,
+        }
+
+    def _throttle_cgroup(self, directory: str):
+        self._cgroup = directory
+        settings: Dict[str, str] = {
+            "cpu.weight": str(self.policy.cpu_weight),
+            "io.weight": f"default {self.policy.io_weight}",
+        }
+        if self.policy.memory_high is not None:
+            settings["memory.high"] = str(self.policy.memory_high)
+
+        for name, value in settings.items():
+            previous = read_value(directory, name)
+            if previous is None:
+                continue
+            if name == "io.weight":
+                previous = previous.splitlines()[0]
+            if write_value(directory, name, value):
+                self._saved_files.append((name, previous))
+
+        if self.policy.memory_high is not None and self.policy.reclaim:
+            current = read_value(directory, "memory.current")
+            if current and int(current) > self.policy.memory_high:
+                write_value(directory, "memory.reclaim", str(int(current) - self.policy.memory_high))
+
+    def _throttle_tree(self, pid: int):
+        try:
+            import psutil
+
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+        except Exception:
+            return
+
+        for process in processes:
+            try:
+                nice = process.nice()
+                ionice = None
+                idle = getattr(psutil, "IOPRIO_CLASS_IDLE", None)
+                if self.policy.ionice_idle and idle is not None:
+                    ionice = tuple(process.ionice())
+                    process.ionice(idle)
+                if _can_raise_priority(nice):
+                    process.nice(max(nice, self.policy.nice))
+                else:
+                    nice = None
+                self._saved_processes.append((process, nice, ionice))
+            except Exception:
+                pass
+
+
+def _can_raise_priority(nice: int) -> bool:
+    """Whether a process lowered from ``nice`` can be put back, which unprivileged users need RLIMIT_NICE for."""
+    if not hasattr(os, "geteuid"):
+        return False
+    if os.geteuid() == 0:
+        return True
+    import resource
+
+    limit = resource.getrlimit(resource.RLIMIT_NICE)[0]
+    return limit == resource.RLIM_INFINITY or 20 - limit <= nice
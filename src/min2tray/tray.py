@@ -1,43 +1,178 @@
+import inspect
 import os
-from typing import Optional, Callable
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 
-import pystray
-from PIL import Image, ImageDraw
+from .icon_cache import DEFAULT_ICON_SIZE, TRAY_STATES, backend_icon_size, icon_cache
+from .utils import metrics
 
-from .utils import IconLoadError
+if TYPE_CHECKING:
+    from PIL import Image
+
+
+class MenuEntry:
+
+    __slots__ = ("text", "action", "default", "items", "_built")
+
+    def __init__(self, text: Union[str, Callable], action: Optional[Callable] = None, default: bool = False,
+                 items: Optional[Union[List["MenuEntry"], Callable[[], Iterable["MenuEntry"]]]] = None):
+        self.text = text
+        self.action = action
+        self.default = default
+        self.items = items
+        self._built = None
+
+    def build(self, pystray):
+        """Return the pystray item for this entry, built on first use and reused afterwards.
+
+        A callable ``items`` makes a submenu whose entries are generated each time the backend renders it, and
+        an entry without action or items is shown disabled, as a label.
+        """
+        if self._built is None:
+            if self.items is None:
+                self._built = pystray.MenuItem(self.text, self.action, default=self.default,
+                                               enabled=self.action is not None)
+            elif callable(self.items):
+                items = self.items
+                self._built = pystray.MenuItem(self.text, pystray.Menu(
+                    lambda: (item.build(pystray) for item in items())))
+            else:
+                self._built = pystray.MenuItem(self.text, pystray.Menu(*(item.build(pystray) for item in self.items)))
+        return self._built
+
+    def invalidate(self):
+        self._built = None
+
+
+class MenuSection:
+
+    __slots__ = ("provider",)
+    text = None
+
+    def __init__(self, provider: Callable[[], Iterable[MenuEntry]]):
+        self.provider = provider
 
 
 class TrayIcon:
 
-    def __init__(self, name: str = "Min2Tray", title: str = "Application"):
+    def __init__(self, name: str = "Min2Tray", title: str = "Application", coalesce_delay: float = 0.05):
         self.name = name
         self.title = title
         self.icon = None
+        self.state = "visible"
+        self.coalesce_delay = coalesce_delay
         self._menu_items = []
         self._running = False
+        self._frames: Dict[str, "Image.Image"] = {}
+        self._shown_state: Optional[str] = None
+        self._state_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self._changes: Set[str] = set()
 
-    def create_default_image(self, width: int = 64, height: int = 64,
-                           color1: str = "black", color2: str = "white") -> Image.Image:
-        image = Image.new("RGB", (width, height), color1)
-        dc = ImageDraw.Draw(image)
-        dc.rectangle((width // 2, 0, width, height // 2), fill=color2)
-        dc.rectangle((0, height // 2, width // 2, height), fill=color2)
-        return image
+    def create_default_image(self, width: int = DEFAULT_ICON_SIZE, height: int = DEFAULT_ICON_SIZE,
+                           color1: str = "black", color2: str = "white") -> "Image.Image":
+        return icon_cache.default_image(width, height, color1, color2).copy()
 
-    def load_icon(self, icon_path: Optional[str] = None) -> Image.Image:
+    def load_icon(self, icon_path: Optional[str] = None, size: int = DEFAULT_ICON_SIZE) -> "Image.Image":
         if icon_path and os.path.exists(icon_path):
-            try:
-                return Image.open(icon_path)
-            except Exception as e:
-                raise IconLoadError(f"Failed to load icon from {icon_path}: {e}")
+            return icon_cache.get(icon_path, size).copy()
         else:
-            return self.create_default_image()
+            return icon_cache.default_image(size, size).copy()
 
     def add_menu_item(self, text: str, action: Callable, default: bool = False):
-        self._menu_items.append(pystray.MenuItem(text, action, default=default))
+        self._menu_items.append(menu_action(text, action, default))
+        self.update_menu()
+
+    def add_submenu(self, text: Union[str, Callable],
+                    items: Union[List[Tuple[str, Callable]], Callable[[], Iterable[MenuEntry]]],
+                    index: Optional[int] = None):
+        if not callable(items):
+            items = [menu_action(label, action) for label, action in items]
+        item = MenuEntry(text, items=items)
+        if index is None:
+            self._menu_items.append(item)
+        else:
+            self._menu_items.insert(index, item)
+        self.update_menu()
+
+    def add_section(self, provider: Callable[[], Iterable[MenuEntry]], index: Optional[int] = None):
+        """Insert entries generated by ``provider`` each time the menu is rendered."""
+        section = MenuSection(provider)
+        if index is None:
+            self._menu_items.append(section)
+        else:
+            self._menu_items.insert(index, section)
+        self.update_menu()
+
+    def menu_items(self, pystray) -> Iterator:
+        for item in self._menu_items:
+            if isinstance(item, MenuSection):
+                for entry in item.provider():
+                    yield entry.build(pystray)
+            else:
+                yield item.build(pystray)
+
+    def update_menu(self):
+        with self._state_lock:
+            self._schedule("menu")
+
+    def set_state(self, state: str):
+        if state not in TRAY_STATES:
+            raise ValueError(f"Unknown tray state '{state}', expected one of {TRAY_STATES}")
+        with self._state_lock:
+            self.state = state
+            self._schedule("state")
+
+    def set_title(self, title: str):
+        """Change the tooltip, skipping updates that would not change its text."""
+        with self._state_lock:
+            if title == self.title:
+                return
+            self.title = title
+            self._schedule("title")
+
+    def _schedule(self, change: str):
+        self._changes.add(change)
+        if self.icon is None or self._flush_timer is not None:
+            return
+        self._flush_timer = threading.Timer(self.coalesce_delay, self._flush)
+        self._flush_timer.daemon = True
+        self._flush_timer.start()
+
+    def _flush(self):
+        with self._state_lock:
+            self._flush_timer = None
+            changes, self._changes = self._changes, set()
+            state = self.state if self.state != self._shown_state else None
+            title = self.title
+            if self.icon is None:
+                return
+            if state is not None:
+                self._shown_state = state
+
+        if state is not None:
+            self.icon.icon = self._frames[state]
+            if metrics.enabled:
+                metrics.incr("tray.icon_update")
+        if "title" in changes:
+            self.icon.title = title
+        if "menu" in changes:
+            self.icon.update_menu()
+            if metrics.enabled:
+                metrics.incr("tray.menu_update")
 
     def start(self, icon_path: Optional[str] = None):
-        icon_image = self.load_icon(icon_path)
+        import pystray
+
+        size = backend_icon_size(pystray.Icon)
+        if icon_path and not os.path.exists(icon_path):
+            icon_path = None
+        self._frames = icon_cache.state_frames(icon_path, size)
+        with self._state_lock:
+            self._changes.clear()
+            self._shown_state = self.state
+            icon_image = self._frames[self.state]
 
         if not any(item.text == "Exit" for item in self._menu_items):
             self.add_menu_item("Exit", self.stop)
@@ -46,13 +181,45 @@ class TrayIcon:
             self.name,
             icon=icon_image,
             title=self.title,
-            menu=pystray.Menu(*self._menu_items)
+            menu=pystray.Menu(lambda: self.menu_items(pystray))
         )
+        with self._state_lock:
+            self._schedule("state")
 
         self._running = True
         self.icon.run()
 
     def stop(self):
+        with self._state_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
         if self.icon:
             self._running = False
             self.icon.stop()
+
+
+def menu_action(text: Union[str, Callable], action: Callable, default: bool = False) -> MenuEntry:
+    return MenuEntry(text, _instrumented(action), default)
+
+
+def _instrumented(action: Callable) -> Callable:
+    argcount = action.__code__.co_argcount - (1 if inspect.ismethod(action) else 0)
+
+    def invoke(icon, item):
+        if argcount == 0:
+            return action()
+        elif argcount == 1:
+            return action(icon)
+        return action(icon, item)
+
+    def callback(icon, item):
+        if not metrics.enabled:
+            return invoke(icon, item)
+        start = time.perf_counter()
+        try:
+            return invoke(icon, item)
+        finally:
+            metrics.observe("tray.callback", time.perf_counter() - start)
+
+    return callback
@@ -3,7 +3,9 @@ Utility modules for Min2Tray library
 """
 
 from .platform import PLATFORM, get_platform, is_windows, is_linux, is_macos
-from .exceptions import TrayError, WindowNotFoundError, IconLoadError, HotkeyRegistrationError
+from .exceptions import TrayError, WindowNotFoundError, IconLoadError, HotkeyRegistrationError, ConfigError, ControlError
+from .process_tree import process_tree_pids
+from .metrics import metrics, timed, Histogram, MetricsDumper
 
 __all__ = [
     "PLATFORM",
@@ -14,5 +16,12 @@ __all__ = [
     "TrayError",
     "WindowNotFoundError",
     "IconLoadError", 
-    "HotkeyRegistrationError"
+    "HotkeyRegistrationError",
+    "ConfigError",
+    "ControlError",
+    "process_tree_pids",
+    "metrics",
+    "timed",
+    "Histogram",
+    "MetricsDumper"
 ]
@@ -0,0 +1,110 @@
+"""
+cgroup v2 helpers for the processes min2tray launches
+"""
+
+import functools
+import os
+import shutil
+import itertools
+from typing import List, Optional
+
+from .process_tree import process_tree_pids
+
+SCOPES = ("systemd", "cgroup")
+
+_scope_ids = itertools.count(1)
+
+
+@functools.lru_cache(maxsize=None)
+def cgroup2_root() -> Optional[str]:
+    """Return the cgroup v2 mount point (``/sys/fs/cgroup``, or ``/sys/fs/cgroup/unified`` on hybrid setups)."""
+    try:
+        with open("/proc/self/mounts") as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == "cgroup2":
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+def cgroup_path(pid: int) -> Optional[str]:
+    try:
+        with open(f"/proc/{pid}/cgroup") as f:
+            for line in f:
+                if line.startswith("0::"):
+                    return line[3:].strip()
+    except OSError:
+        pass
+    return None
+
+
+def own_scope(pid: int) -> Optional[str]:
+    """Return the cgroup v2 directory of ``pid`` if it only holds that process tree and not min2tray itself."""
+    root = cgroup2_root()
+    path = cgroup_path(pid)
+    if root is None or path is None or path == cgroup_path(os.getpid()):
+        return None
+    directory = os.path.join(root, path.lstrip("/"))
+
+    try:
+        with open(os.path.join(directory, "cgroup.procs")) as f:
+            members = {int(line) for line in f if line.strip()}
+    except (OSError, ValueError):
+        return None
+    if not members or not members.issubset(process_tree_pids(pid)):
+        return None
+    return directory
+
+
+def create_scope(name: str) -> Optional[str]:
+    """Create a cgroup next to min2tray's own one, returning its directory or None without permission."""
+    root = cgroup2_root()
+    path = cgroup_path(os.getpid())
+    if root is None or path is None:
+        return None
+    parent = os.path.dirname(os.path.join(root, path.lstrip("/")))
+    directory = os.path.join(parent, f"min2tray-{_unit_name(name)}-{os.getpid()}-{next(_scope_ids)}.scope")
+    try:
+        os.mkdir(directory)
+    except OSError:
+        return None
+    return directory
+
+
+def remove_scope(directory: str):
+    try:
+        os.rmdir(directory)
+    except OSError:
+        pass
+
+
+def systemd_scope_command(command: List[str], name: str) -> Optional[List[str]]:
+    """Wrap ``command`` so it runs in a transient systemd user scope, or return None without systemd-run."""
+    systemd_run = shutil.which("systemd-run")
+    if systemd_run is None:
+        return None
+    unit = f"min2tray-{_unit_name(name)}-{os.getpid()}-{next(_scope_ids)}"
+    return [systemd_run, "--user", "--scope", "--quiet", "--collect", f"--unit={unit}", "--", *command]
+
+
+def read_value(directory: str, name: str) -> Optional[str]:
+    try:
+        with open(os.path.join(directory, name)) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def write_value(directory: str, name: str, value: str) -> bool:
+    try:
+        with open(os.path.join(directory, name), "w") as f:
+            f.write(value)
+        return True
+    except OSError:
+        return False
+
+
+def _unit_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c in "-_" else "_" for c in name)[:64] or "app"
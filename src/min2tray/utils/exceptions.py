@@ -21,3 +21,13 @@ class IconLoadError(TrayError):
 class HotkeyRegistrationError(TrayError):
     """Raised when hotkey registration fails"""
     pass
+
+
+class ConfigError(TrayError):
+    """Raised when a configuration manifest is invalid"""
+    pass
+
+
+class ControlError(TrayError):
+    """Raised when the control socket cannot be served or a request fails"""
+    pass
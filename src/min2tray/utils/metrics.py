@@ -0,0 +1,184 @@
+"""
+Low-overhead counters and latency histograms
+"""
+
+import bisect
+import functools
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+
+class Histogram:
+
+    __slots__ = ("buckets", "counts", "count", "total", "maximum")
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.buckets[index] if index < len(self.buckets) else self.maximum
+        return self.maximum
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "max": self.maximum,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([str(bound) for bound in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class Metrics:
+
+    def __init__(self):
+        self.enabled = os.environ.get("MIN2TRAY_METRICS", "") not in ("", "0")
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._histograms: Dict[str, Histogram] = {}
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def incr(self, name: str, value: int = 1):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.observe(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {
+                "counters": dict(self._counters),
+                "histograms": {name: histogram.snapshot() for name, histogram in self._histograms.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name, value in sorted(self._counters.items()):
+                metric = _metric_name(name) + "_total"
+                lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric} {value}")
+
+            for name, histogram in sorted(self._histograms.items()):
+                metric = _metric_name(name) + "_seconds"
+                lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{metric}_bucket{{le="{bound}"}} {cumulative}')
+                lines.append(f'{metric}_bucket{{le="+Inf"}} {histogram.count}')
+                lines.append(f"{metric}_sum {histogram.total}")
+                lines.append(f"{metric}_count {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
+
+
+def timed(name: str) -> Callable:
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                metrics.observe(name, time.perf_counter() - start)
+        return wrapper
+    return decorator
+
+
+class MetricsDumper:
+
+    FORMATS = ("jsonl", "prometheus")
+
+    def __init__(self, path: str, interval: float = 60.0, format: str = "jsonl",
+                 extra: Optional[Callable[[], Dict[str, object]]] = None):
+        if format not in self.FORMATS:
+            raise ValueError(f"Unknown metrics format '{format}', expected one of {self.FORMATS}")
+        self.path = path
+        self.interval = interval
+        self.format = format
+        self.extra = extra
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        metrics.enable()
+        self._thread = threading.Thread(target=self._run, name="min2tray-metrics", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopped.set()
+        self.dump()
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.dump()
+
+    def dump(self):
+        try:
+            if self.format == "prometheus":
+                temporary = f"{self.path}.tmp"
+                with open(temporary, "w") as f:
+                    f.write(metrics.to_prometheus())
+                os.replace(temporary, self.path)
+            else:
+                record = {"time": time.time(), **metrics.snapshot()}
+                if self.extra:
+                    record["extra"] = self.extra()
+                with open(self.path, "a") as f:
+                    f.write(json.dumps(record) + "\n")
+        except Exception as e:
+            print(f"Failed to dump metrics to {self.path}: {e}")
+
+
+def _metric_name(name: str) -> str:
+    return "min2tray_" + "".join(c if c.isalnum() else "_" for c in name)
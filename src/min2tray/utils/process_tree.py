@@ -0,0 +1,16 @@
+"""
+Process tree helpers built on psutil
+"""
+
+from typing import List
+
+
+def process_tree_pids(pid: int) -> List[int]:
+    """返回进程及其所有子进程的PID"""
+    try:
+        import psutil
+
+        root = psutil.Process(pid)
+        return [pid] + [child.pid for child in root.children(recursive=True)]
+    except Exception:
+        return [pid]
@@ -0,0 +1,73 @@
+"""
+Block the main thread until min2tray should stop, without periodic wakeups
+
+The main thread sleeps in ``select`` on one end of a socket pair. The other
+end is written by ``set()`` (the tray closed, the app exited for good) and,
+through ``signal.set_wakeup_fd``, by SIGINT and SIGTERM, so the process
+stays asleep until one of those happens.
+"""
+
+import select
+import signal
+import socket
+import threading
+from typing import Dict, Optional
+
+SHUTDOWN_SIGNALS = tuple(getattr(signal, name) for name in ("SIGINT", "SIGTERM") if hasattr(signal, name))
+
+
+class ShutdownEvent:
+
+    def __init__(self):
+        self._reader, self._writer = socket.socketpair()
+        self._reader.setblocking(False)
+        self._writer.setblocking(False)
+        self.reason: Optional[str] = None
+
+    def set(self, reason: str = "stopped"):
+        if self.reason is None:
+            self.reason = reason
+        try:
+            self._writer.send(b"\0")
+        except OSError:
+            pass
+
+    def is_set(self) -> bool:
+        return self.reason is not None
+
+    def wait(self) -> str:
+        """Sleep until ``set()`` is called or, from the main thread, SIGINT/SIGTERM arrives; return the reason."""
+        previous = self._install_signals()
+        try:
+            while self.reason is None:
+                select.select([self._reader], [], [])
+                try:
+                    while self._reader.recv(4096):
+                        pass
+                except (BlockingIOError, InterruptedError):
+                    pass
+        finally:
+            self._restore_signals(previous)
+        return self.reason
+
+    def close(self):
+        self._reader.close()
+        self._writer.close()
+
+    def _install_signals(self) -> Optional[Dict[int, object]]:
+        if threading.current_thread() is not threading.main_thread():
+            return None
+
+        def on_signal(signum, frame):
+            self.set(signal.Signals(signum).name)
+
+        previous = {signum: signal.signal(signum, on_signal) for signum in SHUTDOWN_SIGNALS}
+        previous[-1] = signal.set_wakeup_fd(self._writer.fileno(), warn_on_full_buffer=False)
+        return previous
+
+    def _restore_signals(self, previous: Optional[Dict[int, object]]):
+        if previous is None:
+            return
+        signal.set_wakeup_fd(previous.pop(-1))
+        for signum, handler in previous.items():
+            signal.signal(signum, handler if handler is not None else signal.SIG_DFL)
@@ -1,53 +1,77 @@
-from .window_manager import WindowIdentifier, create_window_manager
+from typing import Optional
+
+from .window_manager import WindowIdentifier, WindowRegistry
 from .utils import WindowNotFoundError
 
 
 class WindowManager:
 
-    def __init__(self, window_title: str):
+    def __init__(self, window_title: str, backend: Optional[str] = None):
         self.identifier = WindowIdentifier(title=window_title)
-        self.manager = create_window_manager(self.identifier)
+        self.registry = WindowRegistry.get()
+        self.manager = self.registry.acquire(self.identifier, backend)
         self.window_title = window_title
-        self.is_visible = True
         self._find_window()
 
     def _find_window(self):
-        if not self.manager.find_window():
+        if not self.registry.bind(self.manager):
             raise WindowNotFoundError(f"Window with title '{self.window_title}' not found")
 
+    def _ensure_window(self):
+        if not self.registry.ensure(self.manager):
+            raise WindowNotFoundError(f"Window with title '{self.window_title}' is gone")
+
+    @property
+    def is_visible(self) -> bool:
+        return self.manager.is_visible
+
     def hide(self):
+        self._ensure_window()
         self.manager.hide()
-        self.is_visible = self.manager.is_visible
 
     def show(self):
+        self._ensure_window()
         self.manager.show()
-        self.is_visible = self.manager.is_visible
 
     def toggle(self):
+        self._ensure_window()
         self.manager.toggle()
-        self.is_visible = self.manager.is_visible
 
 
 class FlexibleWindowManager:
 
-    def __init__(self, identifier: WindowIdentifier):
+    def __init__(self, identifier: WindowIdentifier, backend: Optional[str] = None, timeout: float = 0):
         self.identifier = identifier
-        self.manager = create_window_manager(identifier)
-        self.is_visible = True
-        self._find_window()
+        self.registry = WindowRegistry.get()
+        self.manager = self.registry.acquire(identifier, backend)
+        self._find_window(timeout)
 
-    def _find_window(self):
-        if not self.manager.find_window():
+    def _find_window(self, timeout: float = 0):
+        if not self.registry.bind(self.manager, timeout):
             raise WindowNotFoundError(f"Window not found with identifier: {self.identifier}")
 
+    def _ensure_window(self):
+        if not self.registry.ensure(self.manager):
+            raise WindowNotFoundError(f"Window is gone for identifier: {self.identifier}")
+
+    def rebind(self, timeout: float = 0):
+        """Bind to the window of a restarted application, which starts out mapped."""
+        self._find_window(timeout)
+        self.manager.is_visible = True
+        self.manager.refresh_visibility()
+
+    @property
+    def is_visible(self) -> bool:
+        return self.manager.is_visible
+
     def hide(self):
+        self._ensure_window()
         self.manager.hide()
-        self.is_visible = self.manager.is_visible
 
     def show(self):
+        self._ensure_window()
         self.manager.show()
-        self.is_visible = self.manager.is_visible
 
     def toggle(self):
+        self._ensure_window()
         self.manager.toggle()
-        self.is_visible = self.manager.is_visible
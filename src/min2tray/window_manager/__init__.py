@@ -1,15 +1,54 @@
+import importlib
+from typing import TYPE_CHECKING
+
 from .window_base import BaseWindowManager, BaseWindowIdentifier
-from .window_windows import WindowsWindowManager, WindowsIdentifier
-from .window_linux import LinuxWindowManager, LinuxIdentifier
-from .window_macos import MacOSWindowManager, MacOSIdentifier
 from .window_factory import (
     WindowIdentifier,
     create_window_manager,
     by_title,
     by_process_id,
     by_window_id,
-    by_handle
+    by_handle,
+    by_wm_class,
+    by_predicate
 )
+from .matcher import WindowInfo, WindowSnapshot, Predicate, Match, AllOf, AnyOf
+from .registry import WindowRegistry
+
+_LAZY_ATTRIBUTES = {
+    "WindowsWindowManager": ".window_windows",
+    "WindowsIdentifier": ".window_windows",
+    "LinuxWindowManager": ".window_linux",
+    "LinuxIdentifier": ".window_linux",
+    "MacOSWindowManager": ".window_macos",
+    "MacOSIdentifier": ".window_macos",
+    "XlibWindowManager": ".window_xlib",
+    "X11Connection": ".x11",
+    "MemoryWindowManager": ".window_memory",
+    "MemoryDesktop": ".window_memory",
+}
+
+if TYPE_CHECKING:
+    from .window_windows import WindowsWindowManager, WindowsIdentifier
+    from .window_linux import LinuxWindowManager, LinuxIdentifier
+    from .window_macos import MacOSWindowManager, MacOSIdentifier
+    from .window_xlib import XlibWindowManager
+    from .x11 import X11Connection
+    from .window_memory import MemoryWindowManager, MemoryDesktop
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 __all__ = [
     "BaseWindowManager",
@@ -20,10 +59,23 @@ __all__ = [
     "LinuxIdentifier",
     "MacOSWindowManager",
     "MacOSIdentifier",
+    "XlibWindowManager",
+    "X11Connection",
+    "MemoryWindowManager",
+    "MemoryDesktop",
     "WindowIdentifier",
     "create_window_manager",
     "by_title",
     "by_process_id",
     "by_window_id",
-    "by_handle"
+    "by_handle",
+    "by_wm_class",
+    "by_predicate",
+    "WindowInfo",
+    "WindowSnapshot",
+    "Predicate",
+    "Match",
+    "AllOf",
+    "AnyOf",
+    "WindowRegistry"
 ]
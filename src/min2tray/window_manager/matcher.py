@@ -0,0 +1,280 @@
+import fnmatch
+import re
+from typing import Dict, Iterable, List, Optional, Sequence
+
+MATCH_MODES = ("exact", "substring", "regex", "glob")
+FIELDS = ("name", "wm_class", "wm_instance", "pid", "window_id")
+
+
+class WindowInfo:
+
+    __slots__ = ("window_id", "name", "wm_instance", "wm_class", "pid", "order")
+
+    def __init__(self, window_id: int, name: Optional[str] = None, wm_instance: Optional[str] = None,
+                 wm_class: Optional[str] = None, pid: Optional[int] = None, order: int = 0):
+        self.window_id = window_id
+        self.name = name
+        self.wm_instance = wm_instance
+        self.wm_class = wm_class
+        self.pid = pid
+        self.order = order
+
+    def __repr__(self):
+        return (f"WindowInfo(window_id={self.window_id}, name={self.name!r}, "
+                f"wm_class={self.wm_class!r}, pid={self.pid})")
+
+
+class Predicate:
+
+    def __call__(self, info: WindowInfo) -> bool:
+        raise NotImplementedError
+
+    def candidates(self, snapshot: "WindowSnapshot") -> Optional[List[WindowInfo]]:
+        return None
+
+    def key(self) -> tuple:
+        raise NotImplementedError
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        return AllOf(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        return AnyOf(self, other)
+
+
+class Match(Predicate):
+
+    def __init__(self, field: str, pattern, mode: str = "exact", ignore_case: bool = False):
+        if field not in FIELDS:
+            raise ValueError(f"Unknown window field '{field}', expected one of {FIELDS}")
+        if mode not in MATCH_MODES:
+            raise ValueError(f"Unknown match mode '{mode}', expected one of {MATCH_MODES}")
+
+        self.field = field
+        self.pattern = pattern
+        self.mode = mode
+        self.ignore_case = ignore_case
+
+        if field in ("pid", "window_id"):
+            self._test = self._numeric
+        elif mode == "regex":
+            try:
+                self._regex = re.compile(pattern, re.IGNORECASE if ignore_case else 0)
+            except re.error as e:
+                raise ValueError(f"Invalid regex {pattern!r} for window {field}: {e}") from None
+            self._test = lambda value: self._regex.search(value) is not None
+        elif mode == "glob":
+            glob = pattern.lower() if ignore_case else pattern
+            self._test = lambda value: fnmatch.fnmatchcase(value.lower() if ignore_case else value, glob)
+        elif mode == "substring":
+            needle = pattern.lower() if ignore_case else pattern
+            self._test = lambda value: needle in (value.lower() if ignore_case else value)
+        else:
+            expected = pattern.lower() if ignore_case else pattern
+            self._test = lambda value: (value.lower() if ignore_case else value) == expected
+
+    def _numeric(self, value) -> bool:
+        if isinstance(self.pattern, (set, frozenset, list, tuple)):
+            return value in self.pattern
+        return value == self.pattern
+
+    def __call__(self, info: WindowInfo) -> bool:
+        value = getattr(info, self.field)
+        return value is not None and self._test(value)
+
+    def candidates(self, snapshot: "WindowSnapshot") -> Optional[List[WindowInfo]]:
+        if self.field == "pid":
+            pids = self.pattern if isinstance(self.pattern, (set, frozenset, list, tuple)) else (self.pattern,)
+            return sorted((info for pid in pids for info in snapshot.by_pid.get(pid, ())), key=lambda info: info.order)
+        if self.field == "window_id":
+            info = snapshot.by_id.get(self.pattern)
+            return [info] if info else []
+        if self.mode == "exact" and self.field == "wm_class":
+            return list(snapshot.by_class.get(self.pattern.lower(), ()))
+        if self.mode == "exact" and self.field == "name" and not self.ignore_case:
+            return list(snapshot.by_name.get(self.pattern, ()))
+        return None
+
+    def key(self) -> tuple:
+        pattern = tuple(sorted(self.pattern)) if isinstance(self.pattern, (set, frozenset, list, tuple)) \
+            else self.pattern
+        return ("match", self.field, pattern, self.mode, self.ignore_case)
+
+    def __repr__(self):
+        return f"Match({self.field!r}, {self.pattern!r}, mode={self.mode!r})"
+
+
+class AllOf(Predicate):
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+
+    def __call__(self, info: WindowInfo) -> bool:
+        return all(predicate(info) for predicate in self.predicates)
+
+    def candidates(self, snapshot: "WindowSnapshot") -> Optional[List[WindowInfo]]:
+        narrowest = None
+        for predicate in self.predicates:
+            found = predicate.candidates(snapshot)
+            if found is not None and (narrowest is None or len(found) < len(narrowest)):
+                narrowest = found
+        return narrowest
+
+    def key(self) -> tuple:
+        return ("all",) + tuple(predicate.key() for predicate in self.predicates)
+
+    def __repr__(self):
+        return f"AllOf{self.predicates!r}"
+
+
+class AnyOf(Predicate):
+
+    def __init__(self, *predicates: Predicate):
+        self.predicates = predicates
+
+    def __call__(self, info: WindowInfo) -> bool:
+        return any(predicate(info) for predicate in self.predicates)
+
+    def candidates(self, snapshot: "WindowSnapshot") -> Optional[List[WindowInfo]]:
+        merged: Dict[int, WindowInfo] = {}
+        for predicate in self.predicates:
+            found = predicate.candidates(snapshot)
+            if found is None:
+                return None
+            merged.update((info.window_id, info) for info in found)
+        return sorted(merged.values(), key=lambda info: info.order)
+
+    def key(self) -> tuple:
+        return ("any",) + tuple(predicate.key() for predicate in self.predicates)
+
+    def __repr__(self):
+        return f"AnyOf{self.predicates!r}"
+
+
+class WindowSnapshot:
+
+    def __init__(self, windows: Sequence[WindowInfo]):
+        self.windows = list(windows)
+        self.by_id: Dict[int, WindowInfo] = {}
+        self.by_pid: Dict[int, List[WindowInfo]] = {}
+        self.by_name: Dict[str, List[WindowInfo]] = {}
+        self.by_class: Dict[str, List[WindowInfo]] = {}
+
+        for info in self.windows:
+            self.by_id[info.window_id] = info
+            if info.pid is not None:
+                self.by_pid.setdefault(info.pid, []).append(info)
+            if info.name is not None:
+                self.by_name.setdefault(info.name, []).append(info)
+            if info.wm_class is not None:
+                self.by_class.setdefault(info.wm_class.lower(), []).append(info)
+
+    @classmethod
+    def capture(cls, connection, window_ids: Optional[List[int]] = None) -> "WindowSnapshot":
+        from Xlib import X, error
+        from Xlib.protocol import request
+
+        atoms = [connection.atom(name) for name in ("_NET_WM_NAME", "WM_NAME", "WM_CLASS", "_NET_WM_PID")]
+
+        with connection.lock:
+            if window_ids is None:
+                window_ids = connection.client_list() or connection.top_level_windows()
+            pending = [
+                [
+                    request.GetProperty(
+                        display=connection.display.display, defer=True, delete=False,
+                        window=window_id, property=atom, type=X.AnyPropertyType,
+                        long_offset=0, long_length=1024
+                    )
+                    for atom in atoms
+                ]
+                for window_id in window_ids
+            ]
+
+            windows = []
+            for order, (window_id, requests) in enumerate(zip(window_ids, pending)):
+                values = []
+                for pending_request in requests:
+                    try:
+                        pending_request.reply()
+                        values.append(pending_request.value[1] if pending_request.property_type else None)
+                    except error.XError:
+                        values.append(None)
+
+                net_name, wm_name, wm_class, pid = values
+                instance, class_name = _split_wm_class(wm_class)
+                windows.append(WindowInfo(
+                    window_id,
+                    name=_decode(net_name if net_name is not None else wm_name),
+                    wm_instance=instance,
+                    wm_class=class_name,
+                    pid=int(pid[0]) if pid is not None and len(pid) else None,
+                    order=order
+                ))
+
+        return cls(windows)
+
+    def find(self, predicate: Predicate) -> List[WindowInfo]:
+        candidates = predicate.candidates(self)
+        if candidates is None:
+            candidates = self.windows
+        return [info for info in candidates if predicate(info)]
+
+    def resolve(self, identifier, pids: Optional[Iterable[int]] = None) -> Optional[WindowInfo]:
+        owned = Match("pid", frozenset(pids)) if pids is not None else None
+        for predicate, title in identifier_predicates(identifier):
+            matches = self.find(predicate if owned is None else AllOf(predicate, owned))
+            if matches:
+                return _best(matches, title)
+        return None
+
+    def resolve_many(self, identifiers: Iterable) -> List[Optional[WindowInfo]]:
+        return [self.resolve(identifier) for identifier in identifiers]
+
+
+def identifier_predicates(identifier) -> List[tuple]:
+    match = getattr(identifier, "match", None)
+    if match is not None:
+        return [(match, None)]
+
+    wm_class = getattr(identifier, "wm_class", None)
+    class_match = [Match("wm_class", wm_class, "exact", ignore_case=True)] if wm_class else []
+    title = identifier.title
+    title_mode = getattr(identifier, "title_match", "regex")
+
+    predicates = []
+    if title:
+        predicates.append((AllOf(Match("name", title, title_mode, ignore_case=title_mode == "regex"),
+                               *class_match), title))
+    if identifier.process_id:
+        from ..utils import process_tree_pids
+        predicates.append((AllOf(Match("pid", frozenset(process_tree_pids(identifier.process_id))),
+                               *class_match), None))
+    if not predicates and class_match:
+        predicates.append((class_match[0], None))
+    return predicates
+
+
+def _best(matches: List[WindowInfo], title: Optional[str]) -> WindowInfo:
+    if title:
+        for info in matches:
+            if info.name == title:
+                return info
+    return matches[0]
+
+
+def _split_wm_class(value) -> tuple:
+    if not value:
+        return None, None
+    parts = _decode(value).split("\0")
+    instance = parts[0] or None
+    class_name = (parts[1] or None) if len(parts) > 1 else None
+    return instance, class_name
+
+
+def _decode(value) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bytes):
+        return value.decode("utf-8", "replace")
+    return str(value)
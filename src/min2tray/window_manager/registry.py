@@ -0,0 +1,147 @@
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from .matcher import WindowSnapshot
+from .window_base import BaseWindowManager
+from .window_factory import WindowIdentifier, create_window_manager
+from ..utils import metrics
+
+
+class WindowRegistry:
+
+    _instance: Optional["WindowRegistry"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._managers: Dict[tuple, BaseWindowManager] = {}
+        self._stale: Set[tuple] = set()
+        self._subscribed: Set[type] = set()
+        self.generations: Dict[tuple, int] = {}
+
+    @classmethod
+    def get(cls) -> "WindowRegistry":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @staticmethod
+    def _key(identifier: WindowIdentifier, backend: Optional[str]) -> tuple:
+        return identifier.key() + (backend,)
+
+    def acquire(self, identifier: WindowIdentifier, backend: Optional[str] = None) -> BaseWindowManager:
+        key = self._key(identifier, backend)
+        with self._lock:
+            manager = self._managers.get(key)
+            if manager is None:
+                manager = create_window_manager(identifier, backend)
+                manager.registry_key = key
+                self._managers[key] = manager
+                self.generations[key] = 0
+            return manager
+
+    def bind(self, manager: BaseWindowManager, timeout: float = 0,
+             cancelled: Optional[Callable[[], bool]] = None, owner: Optional[int] = None,
+             wakeup: Optional[threading.Event] = None) -> bool:
+        key = manager.registry_key
+        with self._lock:
+            if key not in self._stale and manager.is_window_valid():
+                return True
+
+        found = manager.wait_for_window(timeout, cancelled, owner, wakeup) if timeout \
+            else manager.find_window_for(owner)
+        if found:
+            self._bound(manager)
+        return found
+
+    def bind_many(self, identifiers: Iterable[WindowIdentifier],
+                  backend: Optional[str] = None) -> List[Optional[BaseWindowManager]]:
+        managers = [self.acquire(identifier, backend) for identifier in identifiers]
+        with self._lock:
+            unbound = [manager for manager in managers
+                       if manager.registry_key in self._stale or not manager.is_window_valid()]
+            self._find_all(unbound)
+            return [manager if manager.is_window_valid() else None for manager in managers]
+
+    def ensure(self, manager: BaseWindowManager) -> bool:
+        with self._lock:
+            if manager.registry_key not in self._stale and manager.is_window_valid():
+                if metrics.enabled:
+                    metrics.incr("registry.hit")
+                return True
+            if metrics.enabled:
+                metrics.incr("registry.miss")
+            return self._rebind(manager)
+
+    def hide_many(self, managers: Iterable[BaseWindowManager]):
+        batches: Dict[type, List[BaseWindowManager]] = {}
+        for manager in managers:
+            if manager.is_visible and manager.is_window_valid():
+                batches.setdefault(type(manager), []).append(manager)
+
+        for manager_type, batch in batches.items():
+            manager_type.hide_batch(batch)
+
+    def invalidate(self, manager: BaseWindowManager):
+        if metrics.enabled:
+            metrics.incr("registry.invalidate")
+        with self._lock:
+            manager._platform_handle = None
+            self._stale.add(manager.registry_key)
+
+    def forget(self, identifier: WindowIdentifier, backend: Optional[str] = None):
+        key = self._key(identifier, backend)
+        with self._lock:
+            self._managers.pop(key, None)
+            self._stale.discard(key)
+            self.generations.pop(key, None)
+
+    def _bound(self, manager: BaseWindowManager):
+        with self._lock:
+            key = manager.registry_key
+            self._stale.discard(key)
+            self.generations[key] = self.generations.get(key, 0) + 1
+
+            manager_type = type(manager)
+            if manager_type not in self._subscribed and manager.subscribe(self._on_change):
+                self._subscribed.add(manager_type)
+            manager.watch_handle()
+
+    def _find_all(self, managers: List[BaseWindowManager]):
+        snapshots: Dict[object, Optional[WindowSnapshot]] = {}
+        for manager in managers:
+            source = manager.snapshot_source()
+            if source is None:
+                found = manager.find_window()
+            else:
+                if source not in snapshots:
+                    snapshots[source] = manager.capture_snapshot()
+                found = manager.find_in_snapshot(snapshots[source])
+
+            if found:
+                manager.refresh_visibility()
+                self._bound(manager)
+                if metrics.enabled:
+                    metrics.incr("registry.rebind")
+            else:
+                manager._platform_handle = None
+
+    def _rebind(self, manager: BaseWindowManager) -> bool:
+        if not manager.find_window():
+            manager._platform_handle = None
+            self._stale.add(manager.registry_key)
+            return False
+        manager.refresh_visibility()
+        self._bound(manager)
+        return True
+
+    def _on_change(self, kind: str, window_id: Optional[int]):
+        with self._lock:
+            if kind == "destroyed":
+                for manager in self._managers.values():
+                    if manager._platform_handle is not None and int(manager._platform_handle) == window_id:
+                        self.invalidate(manager)
+            elif kind == "clients" and self._stale:
+                self._find_all([self._managers[key] for key in list(self._stale) if key in self._managers])
@@ -1,5 +1,7 @@
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Callable, Collection, Hashable, List, Optional
 
 
 class BaseWindowIdentifier(ABC):
@@ -18,6 +20,7 @@ class BaseWindowManager(ABC):
     def __init__(self, identifier: BaseWindowIdentifier):
         self.identifier = identifier
         self.is_visible = True
+        self.registry_key: Optional[tuple] = None
         self._platform_handle = None
 
     @abstractmethod
@@ -32,6 +35,61 @@ class BaseWindowManager(ABC):
     def show(self):
         pass
 
+    def is_window_valid(self) -> bool:
+        return self._platform_handle is not None
+
+    def watch_handle(self):
+        pass
+
+    def refresh_visibility(self):
+        pass
+
+    def subscribe(self, callback: Callable[[str, Optional[int]], None]) -> bool:
+        return False
+
+    def snapshot_source(self) -> Optional[Hashable]:
+        return None
+
+    def capture_snapshot(self):
+        return None
+
+    def find_in_snapshot(self, snapshot) -> bool:
+        return self.find_window()
+
+    def find_owned_window(self, pids: Collection[int]) -> bool:
+        """Like ``find_window`` but only accept a window owned by one of ``pids``, where the backend can tell."""
+        return self.find_window()
+
+    def find_window_for(self, owner: Optional[int]) -> bool:
+        if owner is None:
+            return self.find_window()
+        from ..utils import process_tree_pids
+        return self.find_owned_window(frozenset(process_tree_pids(owner)))
+
+    @classmethod
+    def hide_batch(cls, managers: List["BaseWindowManager"]):
+        for manager in managers:
+            manager.hide()
+
+    def wait_for_window(self, timeout: float, cancelled: Optional[Callable[[], bool]] = None,
+                        owner: Optional[int] = None, wakeup: Optional[threading.Event] = None) -> bool:
+        """Wait up to ``timeout`` for the window; the caller sets ``wakeup`` to have ``cancelled`` checked early."""
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            if wakeup is not None:
+                wakeup.clear()
+            if self.find_window_for(owner):
+                return True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or (cancelled and cancelled()):
+                return False
+            if wakeup is not None:
+                wakeup.wait(min(delay, remaining))
+            else:
+                time.sleep(min(delay, remaining))
+            delay = min(delay * 2, 0.5)
+
     def toggle(self):
         if self.is_visible:
             self.hide()
@@ -1,9 +1,10 @@
 from .window_base import BaseWindowManager, BaseWindowIdentifier
-from .window_windows import WindowsWindowManager, WindowsIdentifier
-from .window_linux import LinuxWindowManager, LinuxIdentifier
-from .window_macos import MacOSWindowManager, MacOSIdentifier
+from .matcher import Match, Predicate
 from ..utils import PLATFORM
-from typing import Optional, Union
+import os
+from typing import Optional
+
+LINUX_BACKENDS = ("xlib", "xdotool")
 
 
 def by_title(title: str) -> 'WindowIdentifier':
@@ -22,34 +23,61 @@ def by_handle(handle: int) -> 'WindowIdentifier':
     return WindowIdentifier(handle=handle)
 
 
+def by_wm_class(wm_class: str) -> 'WindowIdentifier':
+    return WindowIdentifier(wm_class=wm_class)
+
+
+def by_predicate(match: Predicate) -> 'WindowIdentifier':
+    return WindowIdentifier(match=match)
+
+
 class WindowIdentifier:
 
     def __init__(self, title: Optional[str] = None,
                  window_id: Optional[int] = None,
                  process_id: Optional[int] = None,
-                 handle: Optional[int] = None):
+                 handle: Optional[int] = None,
+                 wm_class: Optional[str] = None,
+                 title_match: str = "regex",
+                 match: Optional[Predicate] = None):
         self.title = title
         self.window_id = window_id
         self.process_id = process_id
         self.handle = handle
+        self.wm_class = wm_class
+        self.title_match = title_match
+        self.match = match
+        if title and title_match == "regex":
+            Match("name", title, "regex")
+
+    def key(self) -> tuple:
+        return (self.title, self.window_id, self.process_id, self.handle, self.wm_class, self.title_match,
+                self.match.key() if self.match is not None else None)
 
     def __repr__(self):
-        return f"WindowIdentifier(title={self.title}, window_id={self.window_id}, process_id={self.process_id}, handle={self.handle})"
+        return (f"WindowIdentifier(title={self.title}, window_id={self.window_id}, process_id={self.process_id}, "
+                f"handle={self.handle}, wm_class={self.wm_class}, match={self.match})")
 
     def to_platform_specific(self) -> BaseWindowIdentifier:
         if PLATFORM == "windows":
+            from .window_windows import WindowsIdentifier
             return WindowsIdentifier(
                 title=self.title,
                 process_id=self.process_id,
                 handle=self.handle
             )
         elif PLATFORM == "linux":
+            from .window_linux import LinuxIdentifier
             return LinuxIdentifier(
                 title=self.title,
                 process_id=self.process_id,
-                window_id=self.window_id
+                window_id=self.window_id,
+                wm_class=self.wm_class,
+                title_match=self.title_match,
+                match=self.match
             )
         elif PLATFORM == "darwin":
+            from .window_macos import MacOSIdentifier
             return MacOSIdentifier(
                 title=self.title,
                 process_id=self.process_id,
@@ -59,14 +87,36 @@ class WindowIdentifier:
             raise NotImplementedError(f"Platform {PLATFORM} is not supported")
 
 
-def create_window_manager(identifier: 'WindowIdentifier') -> BaseWindowManager:
+def default_linux_backend() -> str:
+    from .x11 import X11Connection
+
+    backend = os.environ.get("MIN2TRAY_LINUX_BACKEND")
+    if backend:
+        return backend
+    return "xlib" if X11Connection.available() else "xdotool"
+
+
+def create_window_manager(identifier: 'WindowIdentifier', backend: Optional[str] = None) -> BaseWindowManager:
+    if backend == "memory":
+        from .window_memory import MemoryWindowManager
+        return MemoryWindowManager(identifier)
+
     platform_identifier = identifier.to_platform_specific()
-    
+
     if PLATFORM == "windows":
+        from .window_windows import WindowsWindowManager
         return WindowsWindowManager(platform_identifier)
     elif PLATFORM == "linux":
-        return LinuxWindowManager(platform_identifier)
+        backend = backend or default_linux_backend()
+        if backend == "xlib":
+            from .window_xlib import XlibWindowManager
+            return XlibWindowManager(platform_identifier)
+        elif backend == "xdotool":
+            from .window_linux import LinuxWindowManager
+            return LinuxWindowManager(platform_identifier)
+        raise ValueError(f"Unknown Linux window backend '{backend}', expected one of {LINUX_BACKENDS}")
     elif PLATFORM == "darwin":
+        from .window_macos import MacOSWindowManager
         return MacOSWindowManager(platform_identifier)
     else:
         raise NotImplementedError(f"Platform {PLATFORM} is not supported")
@@ -75,16 +125,13 @@ def create_window_manager(identifier: 'WindowIdentifier') -> BaseWindowManager:
 __all__ = [
     "BaseWindowManager",
     "BaseWindowIdentifier",
-    "WindowsWindowManager",
-    "WindowsIdentifier",
-    "LinuxWindowManager",
-    "LinuxIdentifier",
-    "MacOSWindowManager",
-    "MacOSIdentifier",
     "WindowIdentifier",
     "create_window_manager",
+    "default_linux_backend",
     "by_title",
     "by_process_id",
     "by_window_id",
-    "by_handle"
+    "by_handle",
+    "by_wm_class",
+    "by_predicate"
 ]
@@ -1,20 +1,30 @@
 import subprocess
-from typing import Optional
+import threading
+import time
+from typing import Callable, Collection, List, Optional
 
+from .matcher import Predicate
 from .window_base import BaseWindowManager, BaseWindowIdentifier
-from ..utils import PLATFORM
+from ..utils import PLATFORM, process_tree_pids, timed
 
 
 class LinuxIdentifier(BaseWindowIdentifier):
 
     def __init__(self, title: Optional[str] = None,
                  process_id: Optional[int] = None,
-                 window_id: Optional[int] = None):
+                 window_id: Optional[int] = None,
+                 wm_class: Optional[str] = None,
+                 title_match: str = "regex",
+                 match: Optional[Predicate] = None):
         super().__init__(title, process_id)
         self.window_id = window_id
+        self.wm_class = wm_class
+        self.title_match = title_match
+        self.match = match
 
     def __repr__(self):
-        return f"LinuxIdentifier(title={self.title}, process_id={self.process_id}, window_id={self.window_id})"
+        return (f"LinuxIdentifier(title={self.title}, process_id={self.process_id}, window_id={self.window_id}, "
+                f"wm_class={self.wm_class}, match={self.match})")
 
 
 class LinuxWindowManager(BaseWindowManager):
@@ -22,6 +32,7 @@ class LinuxWindowManager(BaseWindowManager):
     def __init__(self, identifier: LinuxIdentifier):
         super().__init__(identifier)
 
+    @timed("window.find_window")
     def find_window(self) -> bool:
         if PLATFORM != "linux":
             return False
@@ -31,9 +42,16 @@ class LinuxWindowManager(BaseWindowManager):
                 self._platform_handle = str(self.identifier.window_id)
                 return True
 
+            if isinstance(self.identifier, LinuxIdentifier) and self.identifier.match is not None:
+                print("Warning: Predicate matching requires the xlib backend")
+                return False
+
             if self.identifier.title:
+                criteria = ["--name", self.identifier.title]
+                if isinstance(self.identifier, LinuxIdentifier) and self.identifier.wm_class:
+                    criteria = ["--all", *criteria, "--class", self.identifier.wm_class]
                 result = subprocess.run(
-                    ["xdotool", "search", "--name", self.identifier.title],
+                    ["xdotool", "search", *criteria],
                     capture_output=True, text=True
                 )
                 if result.returncode == 0 and result.stdout.strip():
@@ -41,8 +59,19 @@ class LinuxWindowManager(BaseWindowManager):
                     return True
 
             if self.identifier.process_id:
+                for pid in process_tree_pids(self.identifier.process_id):
+                    result = subprocess.run(
+                        ["xdotool", "search", "--pid", str(pid)],
+                        capture_output=True, text=True
+                    )
+                    if result.returncode == 0 and result.stdout.strip():
+                        self._platform_handle = result.stdout.strip().split('\n')[0]
+                        return True
+
+            if (isinstance(self.identifier, LinuxIdentifier) and self.identifier.wm_class
+                    and not self.identifier.title and not self.identifier.process_id):
                 result = subprocess.run(
-                    ["xdotool", "search", "--pid", str(self.identifier.process_id)],
+                    ["xdotool", "search", "--class", self.identifier.wm_class],
                     capture_output=True, text=True
                 )
                 if result.returncode == 0 and result.stdout.strip():
@@ -54,6 +83,82 @@ class LinuxWindowManager(BaseWindowManager):
         except Exception:
             return False
 
+    def find_owned_window(self, pids: Collection[int]) -> bool:
+        if PLATFORM != "linux":
+            return False
+        if isinstance(self.identifier, LinuxIdentifier) and (self.identifier.window_id or self.identifier.match):
+            return self.find_window()
+
+        criteria = self._search_criteria()
+        if not criteria and not self.identifier.process_id:
+            return False
+        for pid in pids:
+            try:
+                result = subprocess.run(
+                    ["xdotool", "search", "--all", "--pid", str(pid), *criteria],
+                    capture_output=True, text=True
+                )
+            except OSError:
+                return False
+            if result.returncode == 0 and result.stdout.strip():
+                self._platform_handle = result.stdout.strip().split('\n')[0]
+                return True
+        return False
+
+    def _search_criteria(self) -> List[str]:
+        criteria = ["--name", self.identifier.title] if self.identifier.title else []
+        if isinstance(self.identifier, LinuxIdentifier) and self.identifier.wm_class:
+            criteria += ["--class", self.identifier.wm_class]
+        return criteria
+
+    @timed("window.wait_for_window")
+    def wait_for_window(self, timeout: float, cancelled: Optional[Callable[[], bool]] = None,
+                        owner: Optional[int] = None, wakeup: Optional[threading.Event] = None) -> bool:
+        if PLATFORM != "linux":
+            return False
+
+        if owner is not None:
+            # The owner's process tree changes while it starts up, so poll instead of --sync on one pid
+            return super().wait_for_window(timeout, cancelled, owner, wakeup)
+
+        if self.find_window():
+            return True
+
+        if self.identifier.title or (isinstance(self.identifier, LinuxIdentifier) and self.identifier.wm_class):
+            criteria = self._search_criteria()
+        elif self.identifier.process_id:
+            return super().wait_for_window(timeout, cancelled, wakeup=wakeup)
+        else:
+            return False
+
+        try:
+            search = subprocess.Popen(
+                ["xdotool", "search", "--sync", "--all", *criteria],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+            )
+        except OSError:
+            return False
+
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    stdout, _ = search.communicate(timeout=min(0.25, max(deadline - time.monotonic(), 0)))
+                    break
+                except subprocess.TimeoutExpired:
+                    if time.monotonic() >= deadline or (cancelled and cancelled()):
+                        return False
+        finally:
+            if search.poll() is None:
+                search.kill()
+                search.wait()
+
+        if search.returncode == 0 and stdout.strip():
+            self._platform_handle = stdout.strip().split('\n')[0]
+            return True
+        return False
+
+    @timed("window.hide")
     def hide(self):
         if self._platform_handle and self.is_visible:
             try:
@@ -62,6 +167,7 @@ class LinuxWindowManager(BaseWindowManager):
             except subprocess.CalledProcessError:
                 pass
 
+    @timed("window.show")
     def show(self):
         if self._platform_handle and not self.is_visible:
             try:
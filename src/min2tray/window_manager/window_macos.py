@@ -2,7 +2,7 @@ import subprocess
 from typing import Optional
 
 from .window_base import BaseWindowManager, BaseWindowIdentifier
-from ..utils import PLATFORM
+from ..utils import PLATFORM, timed
 
 
 class MacOSIdentifier(BaseWindowIdentifier):
@@ -22,6 +22,7 @@ class MacOSWindowManager(BaseWindowManager):
     def __init__(self, identifier: MacOSIdentifier):
         super().__init__(identifier)
 
+    @timed("window.find_window")
     def find_window(self) -> bool:
         if PLATFORM != "darwin":
             return False
@@ -52,6 +53,7 @@ class MacOSWindowManager(BaseWindowManager):
         except Exception:
             return False
 
+    @timed("window.hide")
     def hide(self):
         if self._platform_handle and self.is_visible:
             try:
@@ -63,6 +65,7 @@ class MacOSWindowManager(BaseWindowManager):
             except subprocess.CalledProcessError:
                 pass
 
+    @timed("window.show")
     def show(self):
         if self._platform_handle and not self.is_visible:
             try:
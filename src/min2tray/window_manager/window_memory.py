@@ -0,0 +1,117 @@
+import itertools
+import threading
+from typing import Collection, Dict, Optional
+
+from .matcher import WindowInfo, WindowSnapshot
+from .window_base import BaseWindowManager, BaseWindowIdentifier
+
+
+class MemoryWindow:
+
+    __slots__ = ("window_id", "title", "pid", "wm_class", "mapped")
+
+    def __init__(self, window_id: int, title: str, pid: Optional[int] = None, wm_class: Optional[str] = None):
+        self.window_id = window_id
+        self.title = title
+        self.pid = pid
+        self.wm_class = wm_class
+        self.mapped = True
+
+
+class MemoryDesktop:
+
+    _default: Optional["MemoryDesktop"] = None
+
+    def __init__(self):
+        self.windows: Dict[int, MemoryWindow] = {}
+        self._ids = itertools.count(0x1000001)
+        self._lock = threading.Lock()
+        self._snapshot: Optional[WindowSnapshot] = None
+
+    @classmethod
+    def default(cls) -> "MemoryDesktop":
+        if cls._default is None:
+            cls._default = cls()
+        return cls._default
+
+    def add_window(self, title: str, pid: Optional[int] = None, wm_class: Optional[str] = None) -> int:
+        with self._lock:
+            window = MemoryWindow(next(self._ids), title, pid, wm_class)
+            self.windows[window.window_id] = window
+            self._snapshot = None
+            return window.window_id
+
+    def remove_window(self, window_id: int) -> bool:
+        with self._lock:
+            self._snapshot = None
+            return self.windows.pop(window_id, None) is not None
+
+    def clear(self):
+        with self._lock:
+            self.windows.clear()
+            self._snapshot = None
+
+    def snapshot(self) -> WindowSnapshot:
+        snapshot = self._snapshot
+        if snapshot is None:
+            with self._lock:
+                snapshot = self._snapshot = WindowSnapshot([
+                    WindowInfo(window.window_id, name=window.title, wm_class=window.wm_class, pid=window.pid,
+                               order=order)
+                    for order, window in enumerate(self.windows.values())
+                ])
+        return snapshot
+
+
+class MemoryWindowManager(BaseWindowManager):
+
+    def __init__(self, identifier: BaseWindowIdentifier, desktop: Optional[MemoryDesktop] = None):
+        super().__init__(identifier)
+        self.desktop = desktop or MemoryDesktop.default()
+
+    def snapshot_source(self) -> MemoryDesktop:
+        return self.desktop
+
+    def capture_snapshot(self) -> WindowSnapshot:
+        return self.desktop.snapshot()
+
+    def find_in_snapshot(self, snapshot: WindowSnapshot) -> bool:
+        return self.find_window(snapshot)
+
+    def find_window(self, snapshot: Optional[WindowSnapshot] = None,
+                    pids: Optional[Collection[int]] = None) -> bool:
+        window_id = getattr(self.identifier, "window_id", None) or getattr(self.identifier, "handle", None)
+        if window_id:
+            if window_id in self.desktop.windows:
+                self._platform_handle = window_id
+                return True
+            return False
+
+        info = (snapshot or self.desktop.snapshot()).resolve(self.identifier, pids)
+        if info is not None:
+            self._platform_handle = info.window_id
+            return True
+        return False
+
+    def find_owned_window(self, pids: Collection[int]) -> bool:
+        return self.find_window(pids=pids)
+
+    def is_window_valid(self) -> bool:
+        return self._platform_handle in self.desktop.windows
+
+    def refresh_visibility(self):
+        window = self.desktop.windows.get(self._platform_handle)
+        if window is not None:
+            self.is_visible = window.mapped
+
+    def hide(self):
+        window = self.desktop.windows.get(self._platform_handle)
+        if window is not None and self.is_visible:
+            window.mapped = False
+            self.is_visible = False
+
+    def show(self):
+        window = self.desktop.windows.get(self._platform_handle)
+        if window is not None and not self.is_visible:
+            window.mapped = True
+            self.is_visible = True
@@ -1,6 +1,6 @@
 from typing import Optional
 from .window_base import BaseWindowManager, BaseWindowIdentifier
-from ..utils import PLATFORM
+from ..utils import PLATFORM, timed
 
 
 class WindowsIdentifier(BaseWindowIdentifier):
@@ -20,6 +20,7 @@ class WindowsWindowManager(BaseWindowManager):
     def __init__(self, identifier: WindowsIdentifier):
         super().__init__(identifier)
 
+    @timed("window.find_window")
     def find_window(self) -> bool:
         if PLATFORM != "windows":
             return False
@@ -61,6 +62,16 @@ class WindowsWindowManager(BaseWindowManager):
         except Exception:
             return False
 
+    def is_window_valid(self) -> bool:
+        if not self._platform_handle:
+            return False
+        try:
+            import win32gui
+            return bool(win32gui.IsWindow(self._platform_handle))
+        except ImportError:
+            return True
+
+    @timed("window.hide")
     def hide(self):
         if self._platform_handle and self.is_visible:
             try:
@@ -71,6 +82,7 @@ class WindowsWindowManager(BaseWindowManager):
             except ImportError:
                 print("Warning: Windows-specific libraries not available")
 
+    @timed("window.show")
     def show(self):
         if self._platform_handle and not self.is_visible:
             try:
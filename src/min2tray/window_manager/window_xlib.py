@@ -0,0 +1,143 @@
+import threading
+import time
+from typing import Callable, Collection, Dict, List, Optional
+
+from .matcher import WindowSnapshot
+from .window_base import BaseWindowManager
+from .window_linux import LinuxIdentifier
+from .x11 import X11Connection
+from ..utils import PLATFORM, timed
+
+
+class XlibWindowManager(BaseWindowManager):
+
+    def __init__(self, identifier: LinuxIdentifier, connection: Optional[X11Connection] = None):
+        super().__init__(identifier)
+        self._connection = connection
+
+    @property
+    def connection(self) -> X11Connection:
+        if self._connection is None:
+            self._connection = X11Connection.get()
+        return self._connection
+
+    @timed("window.find_window")
+    def find_window(self, snapshot: Optional[WindowSnapshot] = None,
+                    pids: Optional[Collection[int]] = None) -> bool:
+        if PLATFORM != "linux":
+            return False
+
+        try:
+            if isinstance(self.identifier, LinuxIdentifier) and self.identifier.window_id:
+                self._platform_handle = int(self.identifier.window_id)
+                return True
+
+            info = (snapshot or WindowSnapshot.capture(self.connection)).resolve(self.identifier, pids)
+            if info is None and snapshot is None:
+                info = WindowSnapshot.capture(self.connection, self.connection.top_level_windows()) \
+                    .resolve(self.identifier, pids)
+            if info is not None:
+                self._platform_handle = info.window_id
+                return True
+
+            return False
+
+        except Exception:
+            return False
+
+    def snapshot_source(self) -> X11Connection:
+        return self.connection
+
+    def capture_snapshot(self) -> WindowSnapshot:
+        return WindowSnapshot.capture(self.connection)
+
+    def find_in_snapshot(self, snapshot: WindowSnapshot) -> bool:
+        return self.find_window(snapshot)
+
+    def find_owned_window(self, pids: Collection[int]) -> bool:
+        return self.find_window(pids=pids)
+
+    @classmethod
+    def hide_batch(cls, managers: List["XlibWindowManager"]):
+        by_connection: Dict[X11Connection, List[XlibWindowManager]] = {}
+        for manager in managers:
+            by_connection.setdefault(manager.connection, []).append(manager)
+
+        for connection, batch in by_connection.items():
+            hidden = set(connection.unmap_many([int(manager._platform_handle) for manager in batch]))
+            for manager in batch:
+                if int(manager._platform_handle) in hidden:
+                    manager.is_visible = False
+
+    def watch_handle(self):
+        if self._platform_handle:
+            self.connection.watch_structure(self._platform_handle)
+
+    def subscribe(self, callback: Callable[[str, Optional[int]], None]) -> bool:
+        from Xlib import X
+
+        connection = self.connection
+        client_list = connection.atom("_NET_CLIENT_LIST")
+
+        def on_event(event):
+            if event.type == X.DestroyNotify:
+                callback("destroyed", event.window.id)
+            elif event.type == X.PropertyNotify and event.atom == client_list:
+                callback("clients", None)
+
+        connection.add_listener(on_event)
+        return True
+
+    def refresh_visibility(self):
+        mapped = self.connection.is_mapped(self._platform_handle) if self._platform_handle else None
+        if mapped is not None:
+            self.is_visible = mapped
+
+    @timed("window.wait_for_window")
+    def wait_for_window(self, timeout: float, cancelled: Optional[Callable[[], bool]] = None,
+                        owner: Optional[int] = None, wakeup: Optional[threading.Event] = None) -> bool:
+        if PLATFORM != "linux":
+            return False
+
+        from Xlib import X
+
+        connection = self.connection
+        client_list = connection.atom("_NET_CLIENT_LIST")
+        name_atoms = (connection.atom("_NET_WM_NAME"), connection.atom("WM_NAME"))
+        changed = wakeup or threading.Event()
+
+        def on_event(event):
+            if event.type in (X.CreateNotify, X.MapNotify):
+                connection.watch_properties(event.window.id)
+                changed.set()
+            elif event.type == X.PropertyNotify and (event.atom == client_list or event.atom in name_atoms):
+                changed.set()
+
+        connection.add_listener(on_event)
+        try:
+            deadline = time.monotonic() + timeout
+            while True:
+                changed.clear()
+                if self.find_window_for(owner):
+                    return True
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or (cancelled and cancelled()):
+                    return False
+                # Without a wakeup from the caller, cancellation can only be noticed by polling
+                changed.wait(min(remaining, 0.25) if cancelled and wakeup is None else remaining)
+        finally:
+            connection.remove_listener(on_event)
+
+    @timed("window.hide")
+    def hide(self):
+        if self._platform_handle and self.is_visible:
+            if self.connection.unmap(self._platform_handle):
+                self.is_visible = False
+
+    @timed("window.show")
+    def show(self):
+        if self._platform_handle and not self.is_visible:
+            if self.connection.map(self._platform_handle):
+                if not self.connection.activate(self._platform_handle):
+                    print(f"Warning: Failed to activate window {self._platform_handle}")
+                self.is_visible = True
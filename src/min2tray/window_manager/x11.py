@@ -0,0 +1,202 @@
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class X11Connection:
+
+    _instance: Optional["X11Connection"] = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, display_name: Optional[str] = None):
+        import Xlib.threaded  # noqa: F401  (must precede Display creation)
+        from Xlib import X, display, error
+
+        self._X = X
+        self._error = error
+        self.display = display.Display(display_name)
+        self.root = self.display.screen().root
+        self.lock = threading.RLock()
+        self._atoms: Dict[str, int] = {}
+        self._supported: Optional[set] = None
+        self._listeners: List[Callable] = []
+        self._window_masks: Dict[int, int] = {}
+        self._event_thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def get(cls) -> "X11Connection":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    @classmethod
+    def available(cls) -> bool:
+        if not os.environ.get("DISPLAY"):
+            return False
+        try:
+            cls.get()
+            return True
+        except Exception:
+            return False
+
+    def close(self):
+        with X11Connection._instance_lock:
+            if X11Connection._instance is self:
+                X11Connection._instance = None
+        try:
+            self.display.close()
+        except Exception:
+            pass
+
+    def atom(self, name: str) -> int:
+        value = self._atoms.get(name)
+        if value is None:
+            value = self.display.intern_atom(name)
+            self._atoms[name] = value
+        return value
+
+    def window(self, window_id: int):
+        return self.display.create_resource_object("window", int(window_id))
+
+    def supports(self, atom_name: str) -> bool:
+        if self._supported is None:
+            prop = self.root.get_full_property(self.atom("_NET_SUPPORTED"), self._X.AnyPropertyType)
+            self._supported = set(prop.value) if prop else set()
+        return self.atom(atom_name) in self._supported
+
+    def client_list(self) -> List[int]:
+        prop = self.root.get_full_property(self.atom("_NET_CLIENT_LIST"), self._X.AnyPropertyType)
+        return list(prop.value) if prop else []
+
+    def top_level_windows(self) -> List[int]:
+        windows = []
+        for child in self.root.query_tree().children:
+            windows.append(child.id)
+            try:
+                windows.extend(grandchild.id for grandchild in child.query_tree().children)
+            except self._error.XError:
+                continue
+        return windows
+
+    def window_name(self, window_id: int) -> Optional[str]:
+        window = self.window(window_id)
+        prop = window.get_full_property(self.atom("_NET_WM_NAME"), self.atom("UTF8_STRING"))
+        if prop is None:
+            prop = window.get_full_property(self.atom("WM_NAME"), self._X.AnyPropertyType)
+        if prop is None:
+            return None
+        value = prop.value
+        if isinstance(value, bytes):
+            return value.decode("utf-8", "replace")
+        return str(value)
+
+    def window_pid(self, window_id: int) -> Optional[int]:
+        prop = self.window(window_id).get_full_property(self.atom("_NET_WM_PID"), self._X.AnyPropertyType)
+        if prop and len(prop.value):
+            return int(prop.value[0])
+        return None
+
+    def map(self, window_id: int) -> bool:
+        return self._checked(lambda onerror: self.window(window_id).map(onerror=onerror))
+
+    def unmap(self, window_id: int) -> bool:
+        return self._checked(lambda onerror: self.window(window_id).unmap(onerror=onerror))
+
+    def unmap_many(self, window_ids: List[int]) -> List[int]:
+        catchers = {window_id: self._error.CatchError() for window_id in window_ids}
+        with self.lock:
+            for window_id, catcher in catchers.items():
+                self.window(window_id).unmap(onerror=catcher)
+            self.display.sync()
+        return [window_id for window_id, catcher in catchers.items() if catcher.get_error() is None]
+
+    def activate(self, window_id: int) -> bool:
+        from Xlib.protocol import event
+
+        if self.supports("_NET_ACTIVE_WINDOW"):
+            message = event.ClientMessage(
+                window=self.window(window_id),
+                client_type=self.atom("_NET_ACTIVE_WINDOW"),
+                data=(32, [2, self._X.CurrentTime, 0, 0, 0])
+            )
+            mask = self._X.SubstructureRedirectMask | self._X.SubstructureNotifyMask
+            return self._checked(lambda onerror: self.root.send_event(message, event_mask=mask, onerror=onerror))
+
+        def raise_and_focus(onerror):
+            window = self.window(window_id)
+            window.configure(stack_mode=self._X.Above, onerror=onerror)
+            window.set_input_focus(self._X.RevertToParent, self._X.CurrentTime, onerror=onerror)
+
+        return self._checked(raise_and_focus)
+
+    def is_mapped(self, window_id: int) -> Optional[bool]:
+        try:
+            attributes = self.window(window_id).get_attributes()
+        except self._error.XError:
+            return None
+        return attributes.map_state != self._X.IsUnmapped
+
+    def exists(self, window_id: int) -> bool:
+        return self.is_mapped(window_id) is not None
+
+    def select_events(self, window_id: int, mask: int):
+        with self.lock:
+            current = self._window_masks.get(window_id, 0)
+            if current & mask == mask:
+                return
+            self._window_masks[window_id] = current | mask
+            catcher = self._error.CatchError()
+            self.window(window_id).change_attributes(event_mask=current | mask, onerror=catcher)
+            self.display.flush()
+
+    def watch_properties(self, window_id: int):
+        self.select_events(window_id, self._X.PropertyChangeMask)
+
+    def watch_structure(self, window_id: int):
+        self.select_events(window_id, self._X.StructureNotifyMask)
+
+    def add_listener(self, callback: Callable) -> None:
+        with self.lock:
+            self._listeners.append(callback)
+            if self._event_thread is None:
+                self.root.change_attributes(
+                    event_mask=self._X.SubstructureNotifyMask | self._X.PropertyChangeMask
+                )
+                self.display.flush()
+                self._event_thread = threading.Thread(target=self._event_loop, name="min2tray-x11-events",
+                                                      daemon=True)
+                self._event_thread.start()
+
+    def remove_listener(self, callback: Callable) -> bool:
+        with self.lock:
+            try:
+                self._listeners.remove(callback)
+                return True
+            except ValueError:
+                return False
+
+    def _event_loop(self):
+        while True:
+            try:
+                event = self.display.next_event()
+            except Exception:
+                break
+
+            if event.type == self._X.DestroyNotify:
+                self._window_masks.pop(event.window.id, None)
+
+            for listener in list(self._listeners):
+                try:
+                    listener(event)
+                except Exception as e:
+                    print(f"X11 event listener error: {e}")
+
+    def _checked(self, operation) -> bool:
+        catcher = self._error.CatchError()
+        with self.lock:
+            operation(catcher)
+            self.display.sync()
+        return catcher.get_error() is None
+
@@ -0,0 +1,58 @@
+import pytest
+
+from min2tray.config import parse_manifest
+from min2tray.utils import ConfigError
+
+
+def manifest(**web):
+    return {"apps": {"db": {"title": "DB"}, "web": {"title": "Web", **web}}}
+
+
+def test_depends_on_accepts_a_single_name():
+    assert parse_manifest(manifest(depends_on="db")).apps["web"].depends_on == ["db"]
+
+
+def test_depends_on_accepts_a_list_of_names():
+    assert parse_manifest(manifest(depends_on=["db"])).apps["web"].depends_on == ["db"]
+
+
+@pytest.mark.parametrize("depends_on", [1, {"app": "db"}, ["db", 2], [["db"]]])
+def test_depends_on_rejects_anything_else(depends_on):
+    with pytest.raises(ConfigError, match=r"\[apps\.web\] depends_on"):
+        parse_manifest(manifest(depends_on=depends_on))
+
+
+def test_invalid_title_regex_names_the_app():
+    with pytest.raises(ConfigError, match=r"\[apps\.web\] Invalid regex"):
+        parse_manifest({"apps": {"web": {"title": "Web (beta"}}})
+
+
+def test_hotkey_shared_by_two_apps_is_rejected():
+    data = {"apps": {"db": {"title": "DB", "hotkey": "<ctrl>+<alt>+d"},
+                     "web": {"title": "Web", "hotkey": "<alt>+<ctrl>+d"}}}
+    with pytest.raises(ConfigError, match=r"\[apps\.web\] hotkey .* already used by 'db'"):
+        parse_manifest(data)
+
+
+@pytest.mark.parametrize("web, section", [
+    ({"wait": "soon"}, r"\[apps\.web\] wait must be a number"),
+    ({"freeze_after": [30]}, r"\[apps\.web\] freeze_after must be a number"),
+    ({"start_minimized": "no"}, r"\[apps\.web\] start_minimized must be true or false"),
+    ({"throttle": {"nice": "low"}}, r"\[apps\.web\.throttle\] nice must be an integer"),
+    ({"throttle": {"memory_high": "lots"}}, r"\[apps\.web\.throttle\] Invalid size"),
+    ({"restart": {"backoff": True}}, r"\[apps\.web\.restart\] backoff must be a number"),
+    ({"output": {"log_file": 1}}, r"\[apps\.web\.output\] log_file must be a string"),
+])
+def test_bad_value_types_name_the_table(web, section):
+    with pytest.raises(ConfigError, match=section):
+        parse_manifest(manifest(**web))
+
+
+def test_bad_sample_interval_names_the_tray_table():
+    with pytest.raises(ConfigError, match=r"\[tray\] sample_interval must be a number"):
+        parse_manifest({**manifest(), "tray": {"sample_interval": "5s"}})
+
+
+def test_numbers_may_be_integers_or_floats():
+    app = parse_manifest(manifest(wait=5, freeze_after=2.5, restart={"backoff": 1})).apps["web"]
+    assert (app.wait, app.freeze_after, app.restart.backoff) == (5, 2.5, 1)
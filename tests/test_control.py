@@ -0,0 +1,37 @@
+import json
+import socket
+import time
+
+from min2tray.control import ControlServer
+
+
+class Target:
+
+    def stats(self):
+        return {"padding": "x" * 100_000}
+
+
+def test_replies_are_flushed_after_the_client_stops_sending(tmp_path):
+    server = ControlServer(Target(), str(tmp_path / "control.sock"))
+    server.start()
+    try:
+        client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        client.connect(server.path)
+        client.sendall(b"stats\n" * 20)
+        client.shutdown(socket.SHUT_WR)
+        time.sleep(0.2)
+
+        data = bytearray()
+        client.settimeout(5)
+        while True:
+            chunk = client.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+        client.close()
+    finally:
+        server.stop()
+
+    replies = [json.loads(line) for line in data.splitlines()]
+    assert len(replies) == 20
+    assert all(reply["ok"] for reply in replies)
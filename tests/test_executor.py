@@ -0,0 +1,88 @@
+import threading
+
+from min2tray.executor import WindowAction, WindowActionExecutor
+
+
+class Recorder:
+    """Performs actions in order, holding the first one until ``release`` is set."""
+
+    def __init__(self):
+        self.performed = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, action):
+        self.started.set()
+        self.release.wait(5)
+        self.performed.append(action)
+
+
+def busy_executor():
+    recorder = Recorder()
+    executor = WindowActionExecutor(recorder, idle_timeout=0.1)
+    executor.submit(WindowAction.SHOW)
+    assert recorder.started.wait(5)
+    return executor, recorder
+
+
+def test_actions_run_in_order():
+    performed = []
+    executor = WindowActionExecutor(performed.append)
+    for action in (WindowAction.HIDE, WindowAction.TOGGLE):
+        executor.submit(action)
+    assert executor.drain(5)
+    assert performed == [WindowAction.HIDE, WindowAction.TOGGLE]
+    assert executor.stats()["completed"] == 2
+
+
+def test_toggle_cancels_a_pending_toggle():
+    executor, recorder = busy_executor()
+    executor.submit(WindowAction.TOGGLE)
+    executor.submit(WindowAction.TOGGLE)
+    executor.submit(WindowAction.TOGGLE)
+    recorder.release.set()
+
+    assert executor.drain(5)
+    assert recorder.performed == [WindowAction.SHOW, WindowAction.TOGGLE]
+    assert executor.coalesced == 2
+
+
+def test_show_or_hide_replaces_everything_pending():
+    executor, recorder = busy_executor()
+    executor.submit(WindowAction.TOGGLE)
+    executor.submit(WindowAction.SHOW)
+    executor.submit(WindowAction.HIDE)
+    recorder.release.set()
+
+    assert executor.drain(5)
+    assert recorder.performed == [WindowAction.SHOW, WindowAction.HIDE]
+    assert executor.coalesced == 2
+
+
+def test_failed_action_is_counted_and_the_next_one_runs():
+    performed = []
+
+    def perform(action):
+        if action is WindowAction.HIDE:
+            raise RuntimeError("gone")
+        performed.append(action)
+
+    executor = WindowActionExecutor(perform)
+    executor.submit(WindowAction.HIDE)
+    assert executor.drain(5)
+    executor.submit(WindowAction.SHOW)
+    assert executor.drain(5)
+    assert performed == [WindowAction.SHOW]
+    assert executor.stats()["failed"] == 1
+
+
+def test_shutdown_drops_pending_and_later_actions():
+    executor, recorder = busy_executor()
+    executor.submit(WindowAction.HIDE)
+    executor.shutdown()
+    executor.submit(WindowAction.TOGGLE)
+    recorder.release.set()
+
+    assert executor.drain(5)
+    assert recorder.performed == [WindowAction.SHOW]
+    assert executor.stats()["pending"] == 0
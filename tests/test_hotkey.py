@@ -0,0 +1,50 @@
+from min2tray.hotkey import HotkeyHub
+
+
+def test_owners_share_one_backend_binding():
+    hub = HotkeyHub("memory")
+    pressed = []
+    hub.bind_many("first", {"<ctrl>+<alt>+a": lambda: pressed.append("first"), "<ctrl>+b": lambda: None})
+    hub.bind("second", "<alt>+<ctrl>+a", lambda: pressed.append("second"))
+
+    assert hub.bindings() == {"<alt>+<ctrl>+a": 2, "<ctrl>+b": 1}
+    assert hub.backend.press("<ctrl>+<alt>+a")
+    assert pressed == ["first", "second"]
+
+
+def test_combination_stays_bound_until_its_last_owner_leaves():
+    hub = HotkeyHub("memory")
+    hub.bind("first", "<ctrl>+a", lambda: None)
+    hub.bind("second", "<ctrl>+a", lambda: None)
+    backend = hub.backend
+
+    assert hub.unbind("first", "<ctrl>+a")
+    assert not hub.unbind("first", "<ctrl>+a")
+    assert backend.press("<ctrl>+a")
+
+    assert hub.unbind("second", "<ctrl>+a")
+    assert not backend.press("<ctrl>+a")
+
+
+def test_backend_stops_when_the_last_owner_leaves():
+    hub = HotkeyHub("memory")
+    hub.bind_many("first", {"<ctrl>+a": lambda: None, "<ctrl>+b": lambda: None})
+    hub.bind("second", "<ctrl>+b", lambda: None)
+
+    hub.unbind_owner("first")
+    assert hub.bindings() == {"<ctrl>+b": 1}
+    assert hub.backend is not None
+
+    hub.unbind_owner("second")
+    assert hub.bindings() == {}
+    assert hub.backend is None
+
+
+def test_failing_callback_does_not_stop_the_others():
+    hub = HotkeyHub("memory")
+    pressed = []
+    hub.bind("first", "<ctrl>+a", lambda: 1 / 0)
+    hub.bind("second", "<ctrl>+a", lambda: pressed.append("second"))
+
+    hub.backend.press("<ctrl>+a")
+    assert pressed == ["second"]
@@ -0,0 +1,40 @@
+import threading
+
+import pytest
+
+from min2tray.core import TrayHub
+
+
+def test_hub_rejects_a_hotkey_already_used_by_another_window():
+    hub = TrayHub(backend="memory", hotkey_backend="memory")
+    hub.add_window("db", window_title="DB", hotkey="<ctrl>+<alt>+d")
+
+    with pytest.raises(ValueError, match="already used by 'db'"):
+        hub.add_window("web", window_title="Web", hotkey="<alt>+<ctrl>+d")
+
+    assert list(hub.windows) == ["db"]
+    hub.hotkey_manager.stop()
+
+
+def join_open_thread(name):
+    for thread in threading.enumerate():
+        if thread.name == f"min2tray-open-{name}":
+            thread.join(5)
+
+
+def test_open_relaunches_a_window_whose_app_exited():
+    hub = TrayHub(backend="memory", hotkey_backend="memory")
+    window = hub.add_window("app", window_title="App", command=["sh", "-c", "exit 0"], hotkey="<ctrl>+<alt>+a",
+                            wait_time=1)
+    window.process_manager.wait(5)
+    assert hub.hotkey_manager.hotkeys == {}
+
+    assert hub.open_window("app") == "relaunched"
+    assert list(hub.hotkey_manager.hotkeys) == ["<ctrl>+<alt>+a"]
+    join_open_thread("app")
+    window.process_manager.wait(5)
+
+    window.show_window()
+    assert window.executor.drain(5)
+    assert window.executor.stats()["completed"] == 1
+    hub.stop()
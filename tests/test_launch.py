@@ -0,0 +1,36 @@
+import threading
+import time
+
+from min2tray.core import ManagedWindow
+from min2tray.process import ProcessEvent, ProcessManager
+from min2tray.window_manager import WindowIdentifier
+
+
+def test_waiting_for_a_window_ends_when_the_process_exits():
+    window = ManagedWindow(WindowIdentifier(title="never-mapped"), "app", backend="memory")
+
+    start = time.monotonic()
+    window.run_command(["sh", "-c", "sleep 0.2; exit 1"], wait_time=5)
+
+    assert time.monotonic() - start < 1
+    window.process_manager.wait(5)
+
+
+def test_a_blocking_exit_hook_does_not_hold_up_other_exits():
+    release = threading.Event()
+    blocked = ProcessManager(name="blocked")
+    blocked.add_hook(ProcessEvent.EXITED, lambda return_code: release.wait(5))
+    other = ProcessManager(name="other")
+    try:
+        blocked.run_command(["sh", "-c", "sleep 0.1"], wait_time=0)
+        time.sleep(0.3)
+
+        start = time.monotonic()
+        other.run_command(["sh", "-c", "sleep 0.1"], wait_time=0)
+        other.wait(5)
+        assert time.monotonic() - start < 1
+        assert blocked.processes
+    finally:
+        release.set()
+    blocked.wait(5)
+    assert not blocked.processes
@@ -0,0 +1,60 @@
+import pytest
+
+from min2tray.window_manager import WindowIdentifier
+from min2tray.window_manager.matcher import AllOf, AnyOf, Match, WindowInfo, WindowSnapshot
+
+snapshot = WindowSnapshot([
+    WindowInfo(1, name="Mozilla Firefox", wm_class="firefox", pid=100, order=0),
+    WindowInfo(2, name="Terminal - vim", wm_class="Alacritty", pid=200, order=1),
+    WindowInfo(3, name="Private Browsing", wm_class="firefox", pid=101, order=2),
+])
+
+
+def ids(predicate):
+    return [info.window_id for info in snapshot.find(predicate)]
+
+
+@pytest.mark.parametrize("mode, pattern, expected", [
+    ("exact", "Mozilla Firefox", [1]),
+    ("substring", "vim", [2]),
+    ("glob", "*Browsing", [3]),
+    ("regex", "^(Mozilla|Private)", [1, 3]),
+])
+def test_match_modes(mode, pattern, expected):
+    assert ids(Match("name", pattern, mode)) == expected
+
+
+def test_match_ignore_case():
+    assert ids(Match("wm_class", "FIREFOX", "exact", ignore_case=True)) == [1, 3]
+    assert ids(Match("wm_class", "FIREFOX", "exact")) == []
+
+
+def test_match_pid_set():
+    assert ids(Match("pid", frozenset({100, 200}))) == [1, 2]
+
+
+def test_all_of_and_any_of():
+    firefox = Match("wm_class", "firefox")
+    assert ids(AllOf(firefox, Match("name", "Private", "substring"))) == [3]
+    assert ids(AnyOf(Match("pid", 200), Match("name", "Mozilla Firefox"))) == [1, 2]
+    assert ids(firefox & Match("pid", 200)) == []
+    assert ids(Match("pid", 200) | Match("pid", 101)) == [2, 3]
+
+
+def test_invalid_regex_is_an_error():
+    with pytest.raises(ValueError, match="Invalid regex"):
+        Match("name", "Firefox (Private", "regex")
+    with pytest.raises(ValueError, match="Invalid regex"):
+        WindowIdentifier(title="Firefox (Private")
+
+
+def test_non_regex_titles_are_not_compiled():
+    identifier = WindowIdentifier(title="Firefox (Private", title_match="exact")
+    assert snapshot.resolve(identifier) is None
+
+
+def test_unknown_field_or_mode_is_an_error():
+    with pytest.raises(ValueError):
+        Match("colour", "red")
+    with pytest.raises(ValueError):
+        Match("name", "x", "fuzzy")
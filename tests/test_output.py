@@ -0,0 +1,60 @@
+import pytest
+
+from min2tray import process as process_module
+from min2tray.output import OutputCapture
+from min2tray.process import ProcessManager, RestartPolicy
+
+
+def log_is_open(capture):
+    return capture._log._file is not None
+
+
+def test_log_is_closed_once_the_command_exits_for_good(tmp_path):
+    capture = OutputCapture(log_file=str(tmp_path / "app.log"))
+    manager = ProcessManager(capture=capture,
+                             restart=RestartPolicy("on-failure", backoff=0.05, max_restarts=2, window=10))
+
+    manager.run_command(["sh", "-c", "echo run; sleep 0.1; exit 3"], wait_time=0)
+    manager.wait(5)
+
+    assert manager.restarts == 2
+    assert not log_is_open(capture)
+    assert (tmp_path / "app.log").read_text() == "run\n" * 3
+
+
+def test_log_is_closed_after_terminate(tmp_path):
+    capture = OutputCapture(log_file=str(tmp_path / "app.log"))
+    manager = ProcessManager(capture=capture)
+
+    manager.run_command(["sh", "-c", "echo started; exec sleep 30"], wait_time=0.2)
+    assert log_is_open(capture)
+    manager.terminate()
+    manager.wait(5)
+
+    assert not log_is_open(capture)
+    assert capture.tail() == ["started"]
+
+
+def test_log_is_closed_when_the_command_exits_while_starting(tmp_path):
+    capture = OutputCapture(log_file=str(tmp_path / "app.log"))
+    manager = ProcessManager(capture=capture)
+
+    assert not manager.run_command(["sh", "-c", "echo early"], wait_time=0.2)
+    manager.wait(5)
+
+    assert not log_is_open(capture)
+    assert (tmp_path / "app.log").read_text() == "early\n"
+
+
+@pytest.mark.parametrize("scope", [None, "systemd", "cgroup"])
+def test_command_string_is_split_the_same_with_or_without_a_scope(monkeypatch, scope):
+    # Both scopes fall back to starting the command directly, as they do without systemd-run or cgroup v2
+    monkeypatch.setattr(process_module, "systemd_scope_command", lambda argv, name: None)
+    monkeypatch.setattr(process_module, "create_scope", lambda name: None)
+    capture = OutputCapture()
+    manager = ProcessManager(scope=scope, capture=capture)
+
+    manager.run_command("printf '%s|' 'two words' plain", wait_time=0)
+    manager.wait(5)
+
+    assert capture.tail() == ["two words|plain|"]
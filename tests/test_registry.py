@@ -0,0 +1,94 @@
+import itertools
+
+import pytest
+
+from min2tray.window_manager import MemoryDesktop, WindowIdentifier, WindowRegistry
+from min2tray.window_manager.window_memory import MemoryWindowManager
+
+titles = (f"registry-test-{index}" for index in itertools.count())
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """Give the memory backend destroy/client-list events, as the xlib backend has."""
+    callbacks = []
+
+    def subscribe(self, callback):
+        callbacks.append(callback)
+        return True
+
+    monkeypatch.setattr(MemoryWindowManager, "subscribe", subscribe)
+    return lambda kind, window_id=None: [callback(kind, window_id) for callback in callbacks]
+
+
+def bound_manager(registry, title):
+    manager = registry.acquire(WindowIdentifier(title=title), "memory")
+    assert registry.bind(manager)
+    return manager
+
+
+def count_lookups(manager):
+    calls = []
+    find_window = manager.find_window
+    manager.find_window = lambda *args, **kwargs: calls.append(1) or find_window(*args, **kwargs)
+    return calls
+
+
+def test_bound_window_is_served_from_the_cache(events):
+    registry = WindowRegistry()
+    title = next(titles)
+    MemoryDesktop.default().add_window(title)
+    manager = bound_manager(registry, title)
+    lookups = count_lookups(manager)
+
+    assert registry.ensure(manager)
+    assert registry.ensure(manager)
+    assert lookups == []
+
+
+def test_destroyed_window_invalidates_its_manager(events):
+    registry = WindowRegistry()
+    desktop = MemoryDesktop.default()
+    title = next(titles)
+    window_id = desktop.add_window(title)
+    manager = bound_manager(registry, title)
+
+    desktop.remove_window(window_id)
+    events("destroyed", window_id)
+
+    assert manager._platform_handle is None
+    assert not registry.ensure(manager)
+
+
+def test_stale_manager_rebinds_to_a_new_window(events):
+    registry = WindowRegistry()
+    desktop = MemoryDesktop.default()
+    title = next(titles)
+    old = desktop.add_window(title)
+    manager = bound_manager(registry, title)
+    generation = registry.generations[manager.registry_key]
+
+    desktop.remove_window(old)
+    events("destroyed", old)
+    new = desktop.add_window(title)
+    events("clients")
+
+    assert manager._platform_handle == new
+    assert registry.generations[manager.registry_key] == generation + 1
+    lookups = count_lookups(manager)
+    assert registry.ensure(manager)
+    assert lookups == []
+
+
+def test_ensure_rebinds_when_no_event_arrives(events):
+    registry = WindowRegistry()
+    desktop = MemoryDesktop.default()
+    title = next(titles)
+    old = desktop.add_window(title)
+    manager = bound_manager(registry, title)
+
+    desktop.remove_window(old)
+    new = desktop.add_window(title)
+
+    assert registry.ensure(manager)
+    assert manager._platform_handle == new
@@ -0,0 +1,48 @@
+import threading
+import time
+
+from min2tray.core import ManagedWindow
+from min2tray.process import RestartPolicy
+from min2tray.window_manager import MemoryDesktop, WindowIdentifier
+from min2tray.window_manager.window_base import BaseWindowManager
+from min2tray.window_manager.window_memory import MemoryWindowManager
+
+
+def fake_window_manager(window, desktop, title, stop):
+    """Map a window for each new process of ``window`` and drop the windows of processes that exited."""
+    windows = {}
+    while not stop.is_set():
+        process = window.process_manager.process
+        if process is not None and process.pid not in windows and process.poll() is None:
+            windows[process.pid] = desktop.add_window(title, pid=process.pid)
+        for pid, window_id in list(windows.items()):
+            if window_id is not None and (process is None or process.pid != pid or process.poll() is not None):
+                desktop.remove_window(window_id)
+                windows[pid] = None
+        time.sleep(0.01)
+
+
+def test_restart_rebinds_on_a_backend_without_destroy_events(monkeypatch):
+    # Like xdotool: no subscriptions, and a handle counts as valid for as long as it is set
+    monkeypatch.setattr(MemoryWindowManager, "is_window_valid", BaseWindowManager.is_window_valid)
+    desktop = MemoryDesktop.default()
+    title = "restart-without-events"
+    window = ManagedWindow(WindowIdentifier(title=title), "app", backend="memory",
+                           restart=RestartPolicy("on-failure", backoff=0.05, max_restarts=1, window=10))
+    stop = threading.Event()
+    threading.Thread(target=fake_window_manager, args=(window, desktop, title, stop), daemon=True).start()
+    try:
+        window.run_command(["sh", "-c", "sleep 0.3; exit 3"], wait_time=2)
+        window.setup_window()
+        first = window.window_manager.manager._platform_handle
+
+        deadline = time.monotonic() + 5
+        while window.last_recovery_seconds is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert window.last_recovery_seconds is not None
+        handle = window.window_manager.manager._platform_handle
+        assert handle != first
+        assert desktop.windows[handle].pid == window.process_manager.pid
+    finally:
+        stop.set()
+        window.stop()
@@ -0,0 +1,47 @@
+import os
+import subprocess
+
+import pytest
+
+from min2tray.sampler import ResourceSampler
+
+pytest.importorskip("psutil")
+
+HAS_CHILD_LISTS = os.path.exists(f"/proc/self/task/{os.getpid()}/children")
+
+
+@pytest.fixture
+def trees():
+    """Two apps, each a shell with two children of its own."""
+    apps = [subprocess.Popen(["sh", "-c", "sleep 30 & sleep 30 & wait"]) for _ in range(2)]
+    yield apps
+    for app in apps:
+        subprocess.run(["pkill", "-P", str(app.pid)])
+        app.kill()
+        app.wait()
+
+
+@pytest.mark.parametrize("child_lists", [
+    pytest.param(True, marks=pytest.mark.skipif(not HAS_CHILD_LISTS, reason="kernel without /proc child lists")),
+    False,
+])
+def test_each_window_gets_the_totals_of_its_own_tree(trees, child_lists):
+    sampler = ResourceSampler(interval=3600)
+    sampler._proc_children = child_lists
+    for app in trees:
+        sampler.watch(app.pid, lambda pid=app.pid: pid)
+
+    try:
+        for _ in range(50):
+            samples = sampler.tick()
+            if all(sample.processes == 3 for sample in samples.values()):
+                break
+        assert {key: sample.processes for key, sample in samples.items()} == {app.pid: 3 for app in trees}
+        for app in trees:
+            sample = samples[app.pid]
+            assert sample.pid == app.pid
+            assert sample.rss > 0 and sample.threads >= 3
+            assert sample.pss is None
+    finally:
+        for app in trees:
+            sampler.unwatch(app.pid)
@@ -0,0 +1,43 @@
+import threading
+import types
+
+from min2tray.tray import TrayIcon
+
+fake_pystray = types.SimpleNamespace(
+    MenuItem=lambda text, action=None, **kwargs: text,
+    Menu=lambda *items: items,
+)
+
+
+class FakeIcon:
+
+    def __init__(self):
+        self.menu_updates = threading.Event()
+
+    def update_menu(self):
+        self.menu_updates.set()
+
+
+def started(tray):
+    tray._shown_state = tray.state
+    tray.icon = FakeIcon()
+    return tray
+
+
+def test_items_added_after_start_refresh_the_menu():
+    tray = TrayIcon(coalesce_delay=0.01)
+    tray.add_menu_item("Exit", tray.stop)
+    started(tray)
+
+    tray.add_menu_item("Late", lambda: None)
+
+    assert tray.icon.menu_updates.wait(2)
+    assert list(tray.menu_items(fake_pystray)) == ["Exit", "Late"]
+
+
+def test_submenus_added_after_start_refresh_the_menu():
+    tray = started(TrayIcon(coalesce_delay=0.01))
+
+    tray.add_submenu("More", [("One", lambda: None)])
+
+    assert tray.icon.menu_updates.wait(2)